@@ -5,18 +5,29 @@ Provides comprehensive monitoring, tracking, and issue management
 """
 
 import os
+import gc
 import sys
 import json
 import time
+import atexit
 import psutil
 import subprocess
-from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request, redirect, url_for, session
+from datetime import date, datetime, timedelta
+from functools import wraps
+from flask import Flask, Response, render_template, jsonify, request, redirect, url_for, session
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 import logging
-from collections import defaultdict, Counter
 import threading
 import sqlite3
+import queue
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -51,61 +62,272 @@ CACHE_FILE = "stock_cache.json"
 SCANNER_PID_FILE = "background_scanner.pid"
 MAIN_APP_PORT = 5002  # Updated to match streamlined app
 ADMIN_PORT = 5003     # Changed to avoid conflict
+SYSTEM_SAMPLE_INTERVAL = 3  # seconds between background CPU/memory/disk samples
+SYSTEM_STATUS_TTL = 5       # seconds a get_system_status result is reused
+LOG_TAIL_CHUNK = 8192       # bytes read per backwards step when tailing a log
+
+# Requests that never hit the traffic tables (health checks and dashboard polling)
+UNTRACKED_PATHS = frozenset([
+    '/admin/health',
+    '/admin/api/status',
+    '/admin/api/traffic/realtime',
+])
+
+# Batched insert statements, kept constant so sqlite3's statement cache reuses them.
+# User agent and referrer strings are stored once in lookup tables (as app.py does)
+# and the events reference them by id.
+INTERN_USER_AGENT_SQL = 'INSERT OR IGNORE INTO user_agents (ua) VALUES (?)'
+INTERN_REFERRER_SQL = 'INSERT OR IGNORE INTO referrers (url) VALUES (?)'
+UPSERT_VISITOR_SQL = '''
+    INSERT INTO visitors (session_id, ip_address, ua_id, first_visit, last_visit)
+    VALUES (?, ?, (SELECT id FROM user_agents WHERE ua = ?), ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        last_visit = excluded.last_visit,
+        visit_count = visit_count + 1
+'''
+INSERT_PAGE_VIEW_SQL = '''
+    INSERT INTO page_views (session_id, page_url, timestamp, ip_address, ua_id, referrer_id)
+    VALUES (?, ?, ?, ?, (SELECT id FROM user_agents WHERE ua = ?), (SELECT id FROM referrers WHERE url = ?))
+'''
+INSERT_API_CALL_SQL = '''
+    INSERT INTO api_calls (session_id, endpoint, timestamp, ip_address, ua_id)
+    VALUES (?, ?, ?, ?, (SELECT id FROM user_agents WHERE ua = ?))
+'''
+
+# Roll completed days of raw events up into daily_stats (excluding local IPs).
+# Timestamps are unix epoch seconds, shared with app.py; :since/:until are too.
+ROLLUP_DAILY_STATS_SQL = '''
+    WITH pv AS (
+        SELECT DATE(timestamp, 'unixepoch', 'localtime') AS date, COUNT(*) AS views,
+               COUNT(DISTINCT session_id) AS sessions
+        FROM page_views
+        WHERE timestamp >= :since AND timestamp < :until
+        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+        GROUP BY 1
+    ),
+    ac AS (
+        SELECT DATE(timestamp, 'unixepoch', 'localtime') AS date, COUNT(*) AS calls
+        FROM api_calls
+        WHERE timestamp >= :since AND timestamp < :until
+        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+        GROUP BY 1
+    ),
+    v AS (
+        SELECT DATE(first_visit, 'unixepoch', 'localtime') AS date, COUNT(*) AS visitors
+        FROM visitors
+        WHERE first_visit >= :since AND first_visit < :until
+        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+        GROUP BY 1
+    ),
+    days AS (
+        SELECT date FROM pv UNION SELECT date FROM ac UNION SELECT date FROM v
+    )
+    INSERT INTO daily_stats (date, total_visitors, unique_visitors, total_page_views, total_api_calls)
+    SELECT days.date, COALESCE(v.visitors, 0), COALESCE(pv.sessions, 0),
+           COALESCE(pv.views, 0), COALESCE(ac.calls, 0)
+    FROM days
+    LEFT JOIN pv ON pv.date = days.date
+    LEFT JOIN ac ON ac.date = days.date
+    LEFT JOIN v ON v.date = days.date
+    WHERE true
+    ON CONFLICT(date) DO UPDATE SET
+        total_visitors = excluded.total_visitors,
+        unique_visitors = excluded.unique_visitors,
+        total_page_views = excluded.total_page_views,
+        total_api_calls = excluded.total_api_calls
+'''
+
+def _orjson_default(obj):
+    """Encode the odd types orjson doesn't handle natively the way jsonify would"""
+    if isinstance(obj, tuple):
+        return list(obj)
+    return str(obj)
+
+def ojsonify(obj):
+    """jsonify replacement for the /admin/api/* routes, encoded with orjson when available"""
+    if not ORJSON_AVAILABLE:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS),
+                    mimetype='application/json')
+
+# Cached traffic stats results: (method name, *args) -> (expires_at, value)
+_stats_cache = {}
+
+def ttl_cache(seconds, until_midnight=False):
+    """Cache a TrafficAnalytics stats method's result for a number of seconds"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__,) + args + tuple(sorted(kwargs.items()))
+            now = time.time()
+            cached = _stats_cache.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+            
+            value = func(self, *args, **kwargs)
+            if value:
+                expires_at = now + seconds
+                if until_midnight:
+                    # Never carry "today" counts across the day boundary
+                    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+                    expires_at = min(expires_at, datetime.combine(tomorrow, datetime.min.time()).timestamp())
+                _stats_cache[key] = (expires_at, value)
+            return value
+        return wrapper
+    return decorator
 
 # Traffic Analytics Database
 TRAFFIC_DB = "traffic_analytics.db"
+EXCLUDED_IPS = ('127.0.0.1', 'localhost', '::1', '192.168.1.88')  # localhost and local network
+SCHEMA_VERSION = 3  # PRAGMA user_version after init_database; kept in step with app.py
+# (table, column, type) written by both apps but missing from tables an older version created
+TRAFFIC_ADDED_COLUMNS = (
+    ('visitors', 'ua_id', 'INTEGER'),
+    ('page_views', 'ua_id', 'INTEGER'),
+    ('page_views', 'referrer_id', 'INTEGER'),
+    ('api_calls', 'session_id', 'TEXT'),
+    ('api_calls', 'ua_id', 'INTEGER'),
+)
+READER_POOL_SIZE = 5
+WRITE_RETRIES = 5
+WRITE_QUEUE_SIZE = 10000
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_WAIT = 0.1  # seconds to keep collecting events before committing
+WRITE_RETRY_DELAY = 0.05  # seconds, doubled after each locked attempt
+MAINTENANCE_INTERVAL = 60  # seconds the writer waits for events before running maintenance anyway
+ROLLUP_INTERVAL = 60  # seconds between daily_stats rollups (each redoes the newest stored day)
+RETENTION_DAYS = 30  # raw page_views/api_calls older than this are pruned (daily_stats keeps the totals)
+RETENTION_INTERVAL = 3600  # seconds between prune runs
+RECENT_VISITOR_LIMIT = 4096  # session ids remembered to skip repeat visitor writes
+RECENT_VISITOR_WINDOW = 30  # seconds a session id's visitor row is left alone after a write
+
+# Applied once to the writer connection at startup (journal_mode=WAL persists in the file)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+def _local_midnight(day):
+    """Unix time of the start of a local calendar day"""
+    return int(time.mktime(day.timetuple()))
 
 class TrafficAnalytics:
     def __init__(self):
         self.db_path = TRAFFIC_DB
-        self.init_database()
-        self.session_data = {}
         self.lock = threading.Lock()
+        
+        # Single serialized writer plus a small pool of reader connections
+        self._writer = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.init_database()
+        self._readers = queue.Queue()
+        for _ in range(READER_POOL_SIZE):
+            reader = sqlite3.connect(self.db_path, check_same_thread=False)
+            reader.execute("PRAGMA journal_mode=WAL")
+            self._readers.put(reader)
+        
+        # Tracking events are queued by the request thread and committed in batches
+        self._write_q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._last_rollup = None  # monotonic time of the last daily_stats rollup
+        self._last_prune = None  # monotonic time of the last retention prune
+        
+        # LRU of session_id -> monotonic time of its last visitor upsert
+        self._recent_visitors = OrderedDict()
+        self._recent_lock = threading.Lock()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+        atexit.register(self.flush)
+    
+    @contextmanager
+    def _read(self):
+        """Borrow a reader connection from the pool"""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    @contextmanager
+    def _write(self):
+        """Hold the write lock and yield the shared writer connection"""
+        with self.lock:
+            yield self._writer
+    
+    def _write_with_retry(self, operation):
+        """Run operation(cursor) on the writer, backing off while the database is locked"""
+        delay = WRITE_RETRY_DELAY
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with self._write() as conn:
+                    return operation(conn.cursor())
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or attempt == WRITE_RETRIES - 1:
+                    raise
+                logger.warning(f"Traffic database locked, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                delay *= 2
     
     def init_database(self):
         """Initialize the traffic analytics database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._writer.cursor()
             
-            # Create visitors table
+            # Let the retention job hand freed pages back to the filesystem. auto_vacuum
+            # only applies to a new file; an existing one needs a one-off VACUUM to switch.
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+            if cursor.fetchone()[0]:
+                cursor.execute("PRAGMA auto_vacuum")
+                if cursor.fetchone()[0] != 2:
+                    logger.info("Converting traffic database to incremental auto-vacuum")
+                    cursor.execute("VACUUM")
+            
+            # Event tables, laid out as app.py's TrafficAnalytics creates them
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS visitors (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     session_id TEXT UNIQUE,
                     ip_address TEXT,
-                    user_agent TEXT,
-                    first_visit TIMESTAMP,
-                    last_visit TIMESTAMP,
-                    visit_count INTEGER DEFAULT 1,
-                    total_duration INTEGER DEFAULT 0
+                    ua_id INTEGER,
+                    first_visit INTEGER,
+                    last_visit INTEGER,
+                    visit_count INTEGER DEFAULT 1
                 )
             ''')
-            
-            # Create page_views table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS page_views (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     session_id TEXT,
                     page_url TEXT,
-                    timestamp TIMESTAMP,
+                    timestamp INTEGER,
                     ip_address TEXT,
-                    user_agent TEXT,
-                    referrer TEXT,
-                    response_time REAL
+                    ua_id INTEGER,
+                    referrer_id INTEGER
                 )
             ''')
-            
-            # Create api_calls table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS api_calls (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT,
                     endpoint TEXT,
-                    method TEXT,
-                    timestamp TIMESTAMP,
+                    timestamp INTEGER,
                     ip_address TEXT,
-                    response_time REAL,
-                    status_code INTEGER
+                    ua_id INTEGER
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_agents (
+                    id INTEGER PRIMARY KEY,
+                    ua TEXT UNIQUE
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS referrers (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE
                 )
             ''')
             
@@ -122,58 +344,245 @@ class TrafficAnalytics:
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Local IPs left out of every stats query, synced from EXCLUDED_IPS
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS excluded_ips (
+                    ip TEXT PRIMARY KEY
+                )
+            ''')
+            cursor.execute('DELETE FROM excluded_ips')
+            cursor.executemany('INSERT INTO excluded_ips (ip) VALUES (?)', [(ip,) for ip in EXCLUDED_IPS])
+            
+            # The main app writes this file too, so run the same migrations as its
+            # TrafficAnalytics.init_database, whichever of the two opens the file first
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('PRAGMA user_version')
+                version = cursor.fetchone()[0]
+                
+                # Timestamps are unix epoch seconds; convert rows written as local-time
+                # datetime strings (user_version 0 -> 1)
+                if version < 1:
+                    for table, columns in (('visitors', ('first_visit', 'last_visit')),
+                                           ('page_views', ('timestamp',)),
+                                           ('api_calls', ('timestamp',))):
+                        for column in columns:
+                            cursor.execute(f'''
+                                UPDATE {table}
+                                SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                                WHERE typeof({column}) = 'text'
+                            ''')
+                
+                # Move inline user agent / referrer strings into the lookup tables (-> 2)
+                if version < 2:
+                    for table, text_column, id_column, lookup, lookup_column in (
+                        ('visitors', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                        ('page_views', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                        ('page_views', 'referrer', 'referrer_id', 'referrers', 'url'),
+                        ('api_calls', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                    ):
+                        cursor.execute(f'PRAGMA table_info({table})')
+                        columns = {row[1] for row in cursor.fetchall()}
+                        if text_column not in columns:
+                            continue
+                        if id_column not in columns:
+                            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {id_column} INTEGER')
+                        cursor.execute(f'''
+                            INSERT OR IGNORE INTO {lookup} ({lookup_column})
+                            SELECT DISTINCT {text_column} FROM {table} WHERE {text_column} IS NOT NULL
+                        ''')
+                        cursor.execute(f'''
+                            UPDATE {table}
+                            SET {id_column} = (SELECT id FROM {lookup} WHERE {lookup_column} = {text_column}),
+                                {text_column} = NULL
+                            WHERE {text_column} IS NOT NULL
+                        ''')
+                
+                # Add the event columns a table created by the other app's older schema lacks (-> 3)
+                if version < 3:
+                    for table, column, column_type in TRAFFIC_ADDED_COLUMNS:
+                        cursor.execute(f'PRAGMA table_info({table})')
+                        if column not in {row[1] for row in cursor.fetchall()}:
+                            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+                
+                if version < SCHEMA_VERSION:
+                    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                
+                # Rollups of epoch values read as Julian days have no date; rebuild them
+                cursor.execute('DELETE FROM daily_stats WHERE date IS NULL')
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            
+            # Time-range indexes; ip_address is included so local-IP filtering stays index-only
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_pv_ts_ip ON page_views(timestamp, ip_address)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ac_ts_ip ON api_calls(timestamp, ip_address)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_v_first_ip ON visitors(first_visit, ip_address)')
+            
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            
             logger.info("Traffic analytics database initialized")
             
         except Exception as e:
             logger.error(f"Error initializing traffic database: {e}")
     
-    def track_visitor(self, request):
+    def _enqueue(self, kind, row):
+        """Queue a tracking event for the background writer"""
+        try:
+            self._write_q.put_nowait((kind, row))
+        except queue.Full:
+            logger.warning(f"Traffic write queue full, dropping {kind} event")
+    
+    def flush(self):
+        """Block until every queued tracking event has been committed"""
+        self._write_q.join()
+    
+    def _writer_loop(self):
+        """Drain queued tracking events and commit them in batches"""
+        while True:
+            try:
+                batch = [self._write_q.get(timeout=MAINTENANCE_INTERVAL)]
+            except queue.Empty:
+                self._run_maintenance()
+                continue
+            
+            deadline = time.monotonic() + WRITE_BATCH_WAIT
+            while len(batch) < WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write_with_retry(lambda cursor: self._commit_batch(cursor, batch))
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} traffic events: {e}")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+            
+            self._run_maintenance()
+    
+    def _run_maintenance(self):
+        """Periodic housekeeping done on the writer thread"""
+        try:
+            if self._last_rollup is None or time.monotonic() - self._last_rollup >= ROLLUP_INTERVAL:
+                today = date.today()
+                self._write_with_retry(lambda cursor: self._rollup_daily_stats(cursor, today))
+                self._last_rollup = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error rolling up daily traffic stats: {e}")
+        
+        try:
+            if self._last_prune is None or time.monotonic() - self._last_prune >= RETENTION_INTERVAL:
+                self._write_with_retry(self._prune_old_events)
+                self._last_prune = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error pruning old traffic events: {e}")
+    
+    def _rollup_daily_stats(self, cursor, today):
+        """Aggregate every completed day since the last rollup into daily_stats"""
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Redo the newest stored day too, in case events for it landed after its rollup
+            cursor.execute("SELECT MAX(date) FROM daily_stats")
+            newest = cursor.fetchone()[0]
+            since = _local_midnight(date.fromisoformat(newest)) if newest else 0
+            cursor.execute(ROLLUP_DAILY_STATS_SQL, {'since': since, 'until': _local_midnight(today)})
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    
+    def _commit_batch(self, cursor, batch):
+        """Write one batch of tracking events in a single transaction"""
+        visitors = [row for kind, row in batch if kind == 'visitor']
+        page_views = [row for kind, row in batch if kind == 'page_view']
+        api_calls = [row for kind, row in batch if kind == 'api_call']
+        
+        # Keep a cyclic GC pass from stretching the time the database write lock is held
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Take the write lock up front rather than upgrading mid-transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                user_agents = {row[2] for row in visitors} | {row[4] for row in page_views} | {row[4] for row in api_calls}
+                referrers = {row[5] for row in page_views}
+                cursor.executemany(INTERN_USER_AGENT_SQL, ((ua,) for ua in user_agents if ua is not None))
+                cursor.executemany(INTERN_REFERRER_SQL, ((url,) for url in referrers if url is not None))
+                if visitors:
+                    cursor.executemany(UPSERT_VISITOR_SQL, visitors)
+                if page_views:
+                    cursor.executemany(INSERT_PAGE_VIEW_SQL, page_views)
+                if api_calls:
+                    cursor.executemany(INSERT_API_CALL_SQL, api_calls)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    
+    def _prune_old_events(self, cursor):
+        """Delete raw events past the retention window and release the freed pages"""
+        cutoff = int(time.time()) - RETENTION_DAYS * 86400
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute("DELETE FROM page_views WHERE timestamp < ?", (cutoff,))
+            page_views = cursor.rowcount
+            cursor.execute("DELETE FROM api_calls WHERE timestamp < ?", (cutoff,))
+            api_calls = cursor.rowcount
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        
+        # incremental_vacuum frees one page per step; executescript steps it to completion
+        cursor.executescript("PRAGMA incremental_vacuum;")
+        if page_views or api_calls:
+            logger.info(f"Pruned {page_views} page views and {api_calls} API calls older than {RETENTION_DAYS} days")
+    
+    def _should_write_visitor(self, session_id):
+        """Record a visit and report whether the session's row is due another upsert"""
+        now = time.monotonic()
+        with self._recent_lock:
+            last_seen = self._recent_visitors.get(session_id)
+            if last_seen is not None and now - last_seen < RECENT_VISITOR_WINDOW:
+                self._recent_visitors.move_to_end(session_id)
+                return False
+            
+            self._recent_visitors[session_id] = now
+            self._recent_visitors.move_to_end(session_id)
+            if len(self._recent_visitors) > RECENT_VISITOR_LIMIT:
+                self._recent_visitors.popitem(last=False)
+            return True
+    
+    def track_visitor(self, request, current_time=None):
         """Track a new visitor or update existing visitor"""
         try:
             session_id = request.cookies.get('session_id') or self.generate_session_id()
             ip_address = request.remote_addr
             user_agent = request.headers.get('User-Agent', 'Unknown')
-            current_time = datetime.now()
+            current_time = current_time or int(time.time())
             
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                # Check if visitor exists
-                cursor.execute('''
-                    SELECT id, visit_count, first_visit FROM visitors 
-                    WHERE session_id = ? OR ip_address = ?
-                ''', (session_id, ip_address))
-                
-                result = cursor.fetchone()
-                
-                if result:
-                    # Update existing visitor
-                    visitor_id, visit_count, first_visit = result
-                    cursor.execute('''
-                        UPDATE visitors 
-                        SET last_visit = ?, visit_count = visit_count + 1
-                        WHERE id = ?
-                    ''', (current_time, visitor_id))
-                else:
-                    # Create new visitor
-                    cursor.execute('''
-                        INSERT INTO visitors (session_id, ip_address, user_agent, first_visit, last_visit)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (session_id, ip_address, user_agent, current_time, current_time))
-                
-                conn.commit()
-                conn.close()
-                
+            if not self._should_write_visitor(session_id):
                 return session_id
+            
+            self._enqueue('visitor', (session_id, ip_address, user_agent, current_time, current_time))
+            return session_id
                 
         except Exception as e:
             logger.error(f"Error tracking visitor: {e}")
             return None
     
-    def track_page_view(self, request, response_time=0.0):
+    def track_page_view(self, request, current_time=None):
         """Track a page view"""
         try:
             session_id = request.cookies.get('session_id')
@@ -182,178 +591,128 @@ class TrafficAnalytics:
             
             ip_address = request.remote_addr
             user_agent = request.headers.get('User-Agent', 'Unknown')
-            referrer = request.headers.get('Referer', '')
-            current_time = datetime.now()
+            referrer = request.headers.get('Referer')
+            current_time = current_time or int(time.time())
             
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO page_views (session_id, page_url, timestamp, ip_address, user_agent, referrer, response_time)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (session_id, request.path, current_time, ip_address, user_agent, referrer, response_time))
-                
-                conn.commit()
-                conn.close()
+            self._enqueue('page_view', (session_id, request.path, current_time, ip_address, user_agent, referrer))
                 
         except Exception as e:
             logger.error(f"Error tracking page view: {e}")
     
-    def track_api_call(self, request, response_time=0.0, status_code=200):
+    def track_api_call(self, request, current_time=None):
         """Track an API call"""
         try:
+            session_id = request.cookies.get('session_id')
             ip_address = request.remote_addr
-            current_time = datetime.now()
+            user_agent = request.headers.get('User-Agent', 'Unknown')
+            current_time = current_time or int(time.time())
             
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO api_calls (endpoint, method, timestamp, ip_address, response_time, status_code)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (request.path, request.method, current_time, ip_address, response_time, status_code))
-                
-                conn.commit()
-                conn.close()
+            self._enqueue('api_call', (session_id, request.path, current_time, ip_address, user_agent))
                 
         except Exception as e:
             logger.error(f"Error tracking API call: {e}")
     
+    @ttl_cache(seconds=900, until_midnight=True)
     def get_traffic_stats(self, days=7):
         """Get comprehensive traffic statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            # Exclude localhost and local network IPs
-            excluded_ips = ['127.0.0.1', 'localhost', '::1', '192.168.1.88']
-            excluded_ips_placeholders = ','.join(['?' for _ in excluded_ips])
-            
-            # Total visitors (excluding local IPs)
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM visitors 
-                WHERE first_visit >= ? 
-                AND ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [start_date] + excluded_ips)
-            total_visitors = cursor.fetchone()[0]
-            
-            # Unique visitors today (excluding local IPs)
-            today = datetime.now().date()
-            cursor.execute(f'''
-                SELECT COUNT(DISTINCT pv.session_id) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE DATE(pv.timestamp) = ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [today] + excluded_ips)
-            unique_visitors_today = cursor.fetchone()[0]
-            
-            # Total page views today (excluding local IPs)
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE DATE(pv.timestamp) = ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [today] + excluded_ips)
-            page_views_today = cursor.fetchone()[0]
-            
-            # Total API calls today (excluding local IPs)
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM api_calls ac
-                JOIN visitors v ON ac.session_id = v.session_id
-                WHERE DATE(ac.timestamp) = ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [today] + excluded_ips)
-            api_calls_today = cursor.fetchone()[0]
-            
-            # Page views by day (last 7 days) - excluding local IPs
-            cursor.execute(f'''
-                SELECT DATE(pv.timestamp) as date, COUNT(*) as count
-                FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-                GROUP BY DATE(pv.timestamp)
-                ORDER BY date DESC
-            ''', [start_date] + excluded_ips)
-            daily_page_views = dict(cursor.fetchall())
-            
-            # API calls by day (last 7 days) - excluding local IPs
-            cursor.execute(f'''
-                SELECT DATE(ac.timestamp) as date, COUNT(*) as count
-                FROM api_calls ac
-                JOIN visitors v ON ac.session_id = v.session_id
-                WHERE ac.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-                GROUP BY DATE(ac.timestamp)
-                ORDER BY date DESC
-            ''', [start_date] + excluded_ips)
-            daily_api_calls = dict(cursor.fetchall())
-            
-            # Top pages (excluding local IPs)
-            cursor.execute(f'''
-                SELECT pv.page_url, COUNT(*) as count
-                FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-                GROUP BY pv.page_url
-                ORDER BY count DESC
-                LIMIT 10
-            ''', [start_date] + excluded_ips)
-            top_pages = cursor.fetchall()
-            
-            # Top API endpoints (excluding local IPs)
-            cursor.execute(f'''
-                SELECT ac.endpoint, COUNT(*) as count
-                FROM api_calls ac
-                JOIN visitors v ON ac.session_id = v.session_id
-                WHERE ac.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-                GROUP BY ac.endpoint
-                ORDER BY count DESC
-                LIMIT 10
-            ''', [start_date] + excluded_ips)
-            top_endpoints = cursor.fetchall()
-            
-            # Visitor locations (by IP) - excluding local IPs
-            cursor.execute(f'''
-                SELECT ip_address, COUNT(*) as count
-                FROM visitors 
-                WHERE first_visit >= ? 
-                AND ip_address NOT IN ({excluded_ips_placeholders})
-                GROUP BY ip_address
-                ORDER BY count DESC
-                LIMIT 10
-            ''', [start_date] + excluded_ips)
-            top_ips = cursor.fetchall()
-            
-            # Average session duration (excluding local IPs)
-            cursor.execute(f'''
-                SELECT AVG(visit_count) as avg_visits
-                FROM visitors 
-                WHERE first_visit >= ? 
-                AND ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [start_date] + excluded_ips)
-            avg_visits = cursor.fetchone()[0] or 0
-            
-            # Recent activity (last 24 hours) - excluding local IPs
-            yesterday = datetime.now() - timedelta(days=1)
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [yesterday] + excluded_ips)
-            recent_activity = cursor.fetchone()[0]
-            
-            conn.close()
-            
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                # Get date range as epoch seconds; every query below binds from this one mapping
+                now = int(time.time())
+                today = date.today()
+                start_date = now - days * 86400
+                today_start = _local_midnight(today)
+                yesterday = now - 86400
+                params = {
+                    'start_date': start_date,
+                    'today_start': today_start,
+                    'yesterday': yesterday,
+                    'window_start': min(start_date, today_start, yesterday),
+                    'start_day': date.fromtimestamp(start_date).isoformat(),
+                    'today': today.isoformat()
+                }
+                
+                # Scalar totals in a single round-trip (excluding local IPs)
+                cursor.execute('''
+                    WITH pv AS (
+                        SELECT session_id, timestamp FROM page_views
+                        WHERE timestamp >= :window_start
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                    ),
+                    ac AS (
+                        SELECT timestamp FROM api_calls
+                        WHERE timestamp >= :today_start
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                    ),
+                    v AS (
+                        SELECT visit_count FROM visitors
+                        WHERE first_visit >= :start_date
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM v),
+                        (SELECT COUNT(DISTINCT session_id) FROM pv WHERE timestamp >= :today_start),
+                        (SELECT COUNT(*) FROM pv WHERE timestamp >= :today_start),
+                        (SELECT COUNT(*) FROM ac),
+                        (SELECT AVG(visit_count) FROM v),
+                        (SELECT COUNT(*) FROM pv WHERE timestamp >= :yesterday)
+                ''', params)
+                (total_visitors, unique_visitors_today, page_views_today,
+                 api_calls_today, avg_visits, recent_activity) = cursor.fetchone()
+                avg_visits = avg_visits or 0
+                
+                # Page views and API calls by day (last 7 days): completed days come
+                # from the daily_stats rollup, today reuses the live totals above
+                cursor.execute('''
+                    SELECT date, total_page_views, total_api_calls
+                    FROM daily_stats
+                    WHERE date >= :start_day AND date < :today
+                    ORDER BY date DESC
+                ''', params)
+                rows = [(today.isoformat(), page_views_today, api_calls_today)]
+                daily_page_views = {}
+                daily_api_calls = {}
+                for day, page_views, api_calls in rows + cursor.fetchall():
+                    if page_views:
+                        daily_page_views[day] = page_views
+                    if api_calls:
+                        daily_api_calls[day] = api_calls
+                
+                # Top pages, API endpoints and visitor IPs (excluding local IPs) in one
+                # round-trip, each ranking tagged so the rows can be split back out
+                cursor.execute('''
+                    WITH pv AS (
+                        SELECT page_url AS name, COUNT(*) AS count FROM page_views
+                        WHERE timestamp >= :start_date
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                        GROUP BY page_url ORDER BY count DESC LIMIT 10
+                    ),
+                    ac AS (
+                        SELECT endpoint AS name, COUNT(*) AS count FROM api_calls
+                        WHERE timestamp >= :start_date
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                        GROUP BY endpoint ORDER BY count DESC LIMIT 10
+                    ),
+                    v AS (
+                        SELECT ip_address AS name, COUNT(*) AS count FROM visitors
+                        WHERE first_visit >= :start_date
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                        GROUP BY ip_address ORDER BY count DESC LIMIT 10
+                    )
+                    SELECT 'page', name, count FROM pv
+                    UNION ALL SELECT 'endpoint', name, count FROM ac
+                    UNION ALL SELECT 'ip', name, count FROM v
+                    ORDER BY 1, 3 DESC
+                ''', params)
+                top = {'page': [], 'endpoint': [], 'ip': []}
+                for kind, name, count in cursor.fetchall():
+                    top[kind].append((name, count))
+                top_pages = top['page']
+                top_endpoints = top['endpoint']
+                top_ips = top['ip']
+                
             return {
                 'total_visitors': total_visitors,
                 'unique_visitors_today': unique_visitors_today,
@@ -372,57 +731,36 @@ class TrafficAnalytics:
             logger.error(f"Error getting traffic stats: {e}")
             return {}
     
+    @ttl_cache(seconds=60)
     def get_real_time_stats(self):
         """Get real-time traffic statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Exclude localhost and local network IPs
-            excluded_ips = ['127.0.0.1', 'localhost', '::1', '192.168.1.88']
-            excluded_ips_placeholders = ','.join(['?' for _ in excluded_ips])
-            
-            # Active sessions (last 30 minutes) - excluding local IPs
-            active_threshold = datetime.now() - timedelta(minutes=30)
-            cursor.execute(f'''
-                SELECT COUNT(DISTINCT pv.session_id) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [active_threshold] + excluded_ips)
-            active_sessions = cursor.fetchone()[0]
-            
-            # Page views in last hour - excluding local IPs
-            hour_ago = datetime.now() - timedelta(hours=1)
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [hour_ago] + excluded_ips)
-            page_views_hour = cursor.fetchone()[0]
-            
-            # API calls in last hour - excluding local IPs
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM api_calls ac
-                JOIN visitors v ON ac.session_id = v.session_id
-                WHERE ac.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [hour_ago] + excluded_ips)
-            api_calls_hour = cursor.fetchone()[0]
-            
-            # Current online users (last 5 minutes) - excluding local IPs
-            online_threshold = datetime.now() - timedelta(minutes=5)
-            cursor.execute(f'''
-                SELECT COUNT(DISTINCT pv.session_id) FROM page_views pv
-                JOIN visitors v ON pv.session_id = v.session_id
-                WHERE pv.timestamp >= ? 
-                AND v.ip_address NOT IN ({excluded_ips_placeholders})
-            ''', [online_threshold] + excluded_ips)
-            online_users = cursor.fetchone()[0]
-            
-            conn.close()
-            
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                # Active sessions (last 30 minutes), page views and API calls in the
+                # last hour, and online users (last 5 minutes) - excluding local IPs
+                now = int(time.time())
+                cursor.execute('''
+                    WITH pv AS (
+                        SELECT session_id, timestamp FROM page_views
+                        WHERE timestamp >= :hour_ago
+                        AND ip_address NOT IN (SELECT ip FROM excluded_ips)
+                    )
+                    SELECT
+                        (SELECT COUNT(DISTINCT session_id) FROM pv WHERE timestamp >= :active_threshold),
+                        (SELECT COUNT(*) FROM pv),
+                        (SELECT COUNT(*) FROM api_calls
+                         WHERE timestamp >= :hour_ago
+                         AND ip_address NOT IN (SELECT ip FROM excluded_ips)),
+                        (SELECT COUNT(DISTINCT session_id) FROM pv WHERE timestamp >= :online_threshold)
+                ''', {
+                    'active_threshold': now - 30 * 60,
+                    'hour_ago': now - 60 * 60,
+                    'online_threshold': now - 5 * 60
+                })
+                active_sessions, page_views_hour, api_calls_hour, online_users = cursor.fetchone()
+                
             return {
                 'active_sessions': active_sessions,
                 'page_views_hour': page_views_hour,
@@ -444,14 +782,49 @@ class AdminMonitor:
         self.cache_file = CACHE_FILE
         self.scanner_pid_file = SCANNER_PID_FILE
         self.traffic_analytics = TrafficAnalytics()
+        self._status_cache = (0, None)
+        self._cache_status_cached = (None, 0)  # (cache file mtime, stock count)
         
+        # Prime the CPU counter, then keep a fresh snapshot off the request thread
+        psutil.cpu_percent(interval=None)
+        self._sample_system()
+        threading.Thread(target=self._system_sampler_loop, daemon=True).start()
+    
+    def _sample_system(self):
+        """Take a CPU/memory/disk snapshot without blocking"""
+        self._sys_snapshot = (
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory(),
+            psutil.disk_usage('/')
+        )
+        try:
+            self._listening_ports = {
+                c.laddr.port for c in psutil.net_connections(kind='inet')
+                if c.status == psutil.CONN_LISTEN
+            }
+        except (psutil.AccessDenied, OSError):
+            # Some platforms need elevated privileges; fall back to probing the port
+            self._listening_ports = None
+    
+    def _system_sampler_loop(self):
+        """Refresh the system snapshot every few seconds"""
+        while True:
+            time.sleep(SYSTEM_SAMPLE_INTERVAL)
+            try:
+                self._sample_system()
+            except Exception as e:
+                logger.error(f"Error sampling system stats: {e}")
+    
     def get_system_status(self):
         """Get overall system status"""
+        now = time.time()
+        cached_at, cached_status = self._status_cache
+        if cached_status is not None and now - cached_at < SYSTEM_STATUS_TTL:
+            return cached_status
+        
         try:
-            # CPU and Memory usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # CPU and Memory usage (sampled in the background)
+            cpu_percent, memory, disk = self._sys_snapshot
             
             # Process status
             main_app_running = self.is_port_in_use(MAIN_APP_PORT)
@@ -464,8 +837,8 @@ class AdminMonitor:
             traffic_stats = self.traffic_analytics.get_traffic_stats()
             real_time_stats = self.traffic_analytics.get_real_time_stats()
             
-            return {
-                'timestamp': datetime.now().isoformat(),
+            status = {
+                'timestamp': datetime.fromtimestamp(now).isoformat(),
                 'system': {
                     'cpu_percent': cpu_percent,
                     'memory_percent': memory.percent,
@@ -489,12 +862,16 @@ class AdminMonitor:
                 'real_time': real_time_stats,
                 'overall_status': 'healthy' if main_app_running and scanner_running else 'warning'
             }
+            self._status_cache = (now, status)
+            return status
         except Exception as e:
             logger.error(f"Error getting system status: {e}")
             return {'error': str(e)}
     
     def is_port_in_use(self, port):
         """Check if port is in use"""
+        if self._listening_ports is not None:
+            return port in self._listening_ports
         try:
             import socket
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -529,11 +906,13 @@ class AdminMonitor:
             age_seconds = time.time() - stat.st_mtime
             age_minutes = age_seconds / 60
             
-            # Read cache content
-            with open(self.cache_file, 'r') as f:
-                data = json.load(f)
-            
-            stock_count = len(data.get('stocks', {}))
+            # Only re-parse the cache when the file has changed since the last call
+            cached_mtime, stock_count = self._cache_status_cached
+            if stat.st_mtime != cached_mtime:
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                stock_count = len(data.get('stocks', {}))
+                self._cache_status_cached = (stat.st_mtime, stock_count)
             
             # Determine status
             if age_minutes < 5:
@@ -580,17 +959,33 @@ class AdminMonitor:
             logger.error(f"Error getting process info: {e}")
             return []
     
+    def _tail_lines(self, log_file, lines):
+        """Read the last N lines of a file without loading the whole file"""
+        with open(log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            chunks = []
+            newlines = 0
+            # Walk backwards until N+1 newlines are seen (or the start is reached)
+            while position > 0 and newlines <= lines:
+                step = min(LOG_TAIL_CHUNK, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b'\n')
+        
+        tail = b''.join(reversed(chunks)).decode('utf-8', errors='replace')
+        return tail.splitlines(keepends=True)[-lines:]
+    
     def get_log_entries(self, log_file='production.log', lines=50):
         """Get recent log entries"""
         try:
             if not os.path.exists(log_file):
                 return []
             
-            with open(log_file, 'r') as f:
-                lines_list = f.readlines()
-            
             # Get last N lines
-            recent_lines = lines_list[-lines:] if len(lines_list) > lines else lines_list
+            recent_lines = self._tail_lines(log_file, lines) if lines > 0 else []
             
             # Parse log entries
             log_entries = []
@@ -648,6 +1043,7 @@ class AdminMonitor:
     def clear_cache(self):
         """Clear the cache file"""
         try:
+            _stats_cache.clear()
             if os.path.exists(self.cache_file):
                 os.remove(self.cache_file)
                 return {'success': True, 'message': 'Cache cleared successfully'}
@@ -664,13 +1060,19 @@ monitor = AdminMonitor()
 @app.before_request
 def track_request():
     """Track all incoming requests"""
+    if (request.method == 'OPTIONS'
+            or request.path in UNTRACKED_PATHS
+            or request.path.startswith(app.static_url_path + '/')):
+        return
+    
+    now = int(time.time())
     if request.path.startswith('/admin'):
         # Track admin dashboard requests
-        monitor.traffic_analytics.track_visitor(request)
-        monitor.traffic_analytics.track_page_view(request)
+        monitor.traffic_analytics.track_visitor(request, current_time=now)
+        monitor.traffic_analytics.track_page_view(request, current_time=now)
     else:
         # Track API calls
-        monitor.traffic_analytics.track_api_call(request)
+        monitor.traffic_analytics.track_api_call(request, current_time=now)
 
 # Routes
 @app.route('/admin')
@@ -713,26 +1115,26 @@ def admin_logout():
 @login_required
 def api_status():
     """API endpoint for system status"""
-    return jsonify(monitor.get_system_status())
+    return ojsonify(monitor.get_system_status())
 
 @app.route('/admin/api/traffic')
 @login_required
 def api_traffic():
     """API endpoint for traffic statistics"""
     days = request.args.get('days', 7, type=int)
-    return jsonify(monitor.traffic_analytics.get_traffic_stats(days))
+    return ojsonify(monitor.traffic_analytics.get_traffic_stats(days))
 
 @app.route('/admin/api/traffic/realtime')
 @login_required
 def api_traffic_realtime():
     """API endpoint for real-time traffic statistics"""
-    return jsonify(monitor.traffic_analytics.get_real_time_stats())
+    return ojsonify(monitor.traffic_analytics.get_real_time_stats())
 
 @app.route('/admin/api/processes')
 @login_required
 def api_processes():
     """API endpoint for process information"""
-    return jsonify(monitor.get_process_info())
+    return ojsonify(monitor.get_process_info())
 
 @app.route('/admin/api/logs')
 @login_required
@@ -740,7 +1142,7 @@ def api_logs():
     """API endpoint for log entries"""
     lines = request.args.get('lines', 50, type=int)
     log_file = request.args.get('file', 'production.log')
-    return jsonify(monitor.get_log_entries(log_file, lines))
+    return ojsonify(monitor.get_log_entries(log_file, lines))
 
 @app.route('/admin/api/restart/<service>', methods=['POST'])
 @login_required
@@ -748,16 +1150,16 @@ def api_restart_service(service):
     """API endpoint to restart services"""
     if service in ['main_app', 'background_scanner']:
         result = monitor.restart_service(service)
-        return jsonify(result)
+        return ojsonify(result)
     else:
-        return jsonify({'success': False, 'error': 'Invalid service'})
+        return ojsonify({'success': False, 'error': 'Invalid service'})
 
 @app.route('/admin/api/clear-cache', methods=['POST'])
 @login_required
 def api_clear_cache():
     """API endpoint to clear cache"""
     result = monitor.clear_cache()
-    return jsonify(result)
+    return ojsonify(result)
 
 @app.route('/admin/health')
 def admin_health():
@@ -772,7 +1174,9 @@ if __name__ == '__main__':
     print("🔧 Starting Admin Dashboard...")
     print(f"🌐 Admin Dashboard: http://localhost:{ADMIN_PORT}/admin")
     print(f"📊 Traffic Dashboard: http://localhost:{ADMIN_PORT}/admin/traffic")
-    print(f"🔑 Default credentials: admin / admin123")
+    print("🔑 Default credentials: admin / admin123")
+    print("🚀 Production: gunicorn -c config/gunicorn_admin_config.py admin_dashboard:app")
     print("🛑 Press Ctrl+C to stop")
     
-    app.run(debug=True, host='0.0.0.0', port=ADMIN_PORT) 
\ No newline at end of file
+    # No debug reloader: it would run a second copy of the traffic writer and samplers
+    app.run(debug=False, threaded=True, host='0.0.0.0', port=ADMIN_PORT)
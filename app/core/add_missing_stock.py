@@ -1,61 +1,79 @@
 #!/usr/bin/env python3
 """
 Utility to manually add missing stocks to the cache
-Usage: python3 add_missing_stock.py SYMBOL
+Usage: python3 add_missing_stock.py SYMBOL [SYMBOL ...]
 """
 
 import sys
-import json
 import time
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from background_scanner import fetch_stock_data
+from utils import json_dumps, json_loads, atomic_write
 
-def add_stock_to_cache(symbol):
-    """Add a specific stock to the cache"""
-    print(f"Adding {symbol} to cache...")
+CACHE_FILE = 'stock_cache.json'
+
+def load_cache_file(path=CACHE_FILE):
+    """Parse the cache straight from a read-only mapping of the file"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return json_loads(view)
+
+def add_stocks_to_cache(symbols, max_workers=8):
+    """Fetch several stocks concurrently and add them to the cache in one write"""
+    print(f"Adding {', '.join(symbols)} to cache...")
     
-    # Fetch stock data
-    stock_data = fetch_stock_data(symbol)
+    # Fetch stock data (network-bound, so the fetches overlap)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = dict(zip(symbols, executor.map(fetch_stock_data, symbols)))
     
-    if not stock_data:
-        print(f"❌ Failed to fetch data for {symbol}")
-        return False
+    added = {symbol: stock_data for symbol, stock_data in fetched.items() if stock_data}
+    for symbol in symbols:
+        if symbol not in added:
+            print(f"❌ Failed to fetch data for {symbol}")
+    if not added:
+        return []
     
     # Load existing cache
     try:
-        with open('stock_cache.json', 'r') as f:
-            cache_data = json.load(f)
+        cache_data = load_cache_file()
     except FileNotFoundError:
         cache_data = {'stocks': {}, 'last_update': time.time()}
     
-    # Add stock to cache
-    cache_data['stocks'][symbol] = stock_data
+    # Add stocks to cache
+    cache_data['stocks'].update(added)
     cache_data['last_update'] = time.time()
     
-    # Save updated cache
-    with open('stock_cache.json', 'w') as f:
-        json.dump(cache_data, f, indent=2)
+    # Save updated cache (compact, and renamed into place so readers never see a partial file)
+    atomic_write(CACHE_FILE, json_dumps(cache_data))
     
-    print(f"✅ {symbol} added to cache!")
-    print(f"   Price: ${stock_data['price']}")
-    print(f"   Gap: {stock_data['gap_pct']}%")
-    print(f"   Volume: {stock_data['volume']}")
-    print(f"   Market Cap: {stock_data['market_cap_display']}")
+    for symbol, stock_data in added.items():
+        print(f"✅ {symbol} added to cache!")
+        print(f"   Price: ${stock_data['price']}")
+        print(f"   Gap: {stock_data['gap_pct']}%")
+        print(f"   Volume: {stock_data['volume']}")
+        print(f"   Market Cap: {stock_data['market_cap_display']}")
     
-    return True
+    return list(added)
+
+def add_stock_to_cache(symbol):
+    """Add a specific stock to the cache"""
+    return bool(add_stocks_to_cache([symbol]))
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 add_missing_stock.py SYMBOL")
+    if len(sys.argv) < 2:
+        print("Usage: python3 add_missing_stock.py SYMBOL [SYMBOL ...]")
         print("Example: python3 add_missing_stock.py IXHL")
         sys.exit(1)
     
-    symbol = sys.argv[1].upper()
-    success = add_stock_to_cache(symbol)
+    symbols = list(dict.fromkeys(arg.upper() for arg in sys.argv[1:]))
+    added = add_stocks_to_cache(symbols)
     
-    if success:
-        print(f"\n🎉 {symbol} is now available in the web interface!")
-    else:
-        print(f"\n❌ Failed to add {symbol}")
+    if added:
+        print(f"\n🎉 {', '.join(added)} now available in the web interface!")
+    failed = [symbol for symbol in symbols if symbol not in added]
+    if failed:
+        print(f"\n❌ Failed to add {', '.join(failed)}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -5,18 +5,23 @@ Finds the biggest gappers dynamically using yfinance screener
 Optimized for speed with minimal delays
 """
 
-import json
+import re
 import time
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
+from bisect import bisect_right
 import yfinance as yf
+import pandas as pd
 from dotenv import load_dotenv
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import signal
 from cache_manager import cache_manager
+from utils import atomic_write, json_dumps, json_loads
 import numpy as np
-import os
+import logging
 
 # Ensure cache directory exists with absolute paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -24,68 +29,65 @@ cache_dir = os.path.abspath(os.path.join(BASE_DIR, "data"))
 os.makedirs(cache_dir, exist_ok=True)
 print(f"📁 Scanner cache directory: {cache_dir}")
 
-# Try to import pytz, fallback to datetime if not available
-try:
-    import pytz
-    PYTZ_AVAILABLE = True
-except ImportError:
-    PYTZ_AVAILABLE = False
-    print("⚠️  pytz not available, using basic timezone handling")
-
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ULTRA-FAST Configuration - Instant data
 SCAN_INTERVAL = 60  # 1 minute for instant updates
 MAX_STOCKS = 15  # Focused on top movers
-RATE_LIMIT_DELAY = 0.1  # Ultra-fast requests
 PID_FILE = "background_scanner_fast.pid"
+MAX_FETCH_WORKERS = 16  # concurrent per-symbol metadata requests
+TICKER_MAX_AGE = 3600  # seconds a Ticker (and the fast_info it memoizes) is reused across scans
+
+# Sector/industry/float/EPS aren't in fast_info and only change on weekly-or-slower
+# timescales, so they come from .info at most once a week per symbol
+PROFILE_CACHE_FILE = os.path.join(cache_dir, "stock_profiles.json")
+PROFILE_MAX_AGE = 7 * 86400  # seconds
+PROFILE_FIELDS = ('sector', 'industry', 'floatShares', 'trailingEps')
+
+# Popular high-volume stocks and penny stocks that often gap, deduplicated in order
+# and cut to MAX_STOCKS once at import
+SYMBOLS = tuple(dict.fromkeys([
+    "TSLA", "NVDA", "AMD", "AAPL", "MSFT", "GOOGL", "META", "AMZN", "NFLX", "SPY",
+    "QQQ", "IWM", "TQQQ", "SQQQ", "UVXY", "VXX", "XLE", "XLF", "XLV", "XLK",
+    "HCTI", "SNDL", "HEXO", "ACB", "TLRY", "CGC", "CRON", "APHA", "OGI", "VFF",
+    "GNUS", "IDEX", "MARK", "SHIP", "TOPS", "ZOM", "CIDM", "CTRM", "NAKD", "SENS",
+]))[:MAX_STOCKS]
 
 # Global variables
 running = True
 last_scan_time = 0
+_profiles = None  # symbol -> profile fields plus 'fetched' epoch seconds, loaded on first use
+_profiles_dirty = False
+_profiles_lock = threading.Lock()
+_tickers = {}  # symbol -> (yf.Ticker, created epoch seconds)
+stop_event = threading.Event()  # set by signal_handler to end the wait between scans
 
-def json_serializer(obj):
-    """Custom JSON serializer for numpy types"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# Session boundaries in minutes after midnight ET: pre-market 4:00, regular 9:30-16:00,
+# after-hours until 20:00
+PRE_MARKET_OPEN = 4 * 60
+MARKET_OPEN = 9 * 60 + 30
+MARKET_CLOSE = 16 * 60
+AFTER_HOURS_CLOSE = 20 * 60
 
 def get_market_session_info():
     """Get current market session information with proper timezone handling"""
     try:
-        if PYTZ_AVAILABLE:
-            # US Eastern Time (where NYSE/NASDAQ operate)
-            et = pytz.timezone('US/Eastern')
-            now_et = datetime.now(et)
-        else:
-            # Fallback: assume we're in ET or use UTC offset
-            now_et = datetime.now()
-            et_offset = -5  # EST offset
-            now_et = now_et + timedelta(hours=et_offset)
-        
-        # Market hours (9:30 AM - 4:00 PM ET)
-        market_open = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-        market_close = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
-        
-        # Pre-market (4:00 AM - 9:30 AM ET)
-        pre_market_open = now_et.replace(hour=4, minute=0, second=0, microsecond=0)
-        
-        # After-hours (4:00 PM - 8:00 PM ET)
-        after_hours_close = now_et.replace(hour=20, minute=0, second=0, microsecond=0)
+        # US Eastern Time (where NYSE/NASDAQ operate)
+        now_et = pd.Timestamp.now(tz='US/Eastern')
+        minutes = now_et.hour * 60 + now_et.minute
+        is_trading_day = now_et.dayofweek < 5
         
         # Determine session
-        if now_et.weekday() >= 5:  # Weekend
+        if not is_trading_day:  # Weekend
             session = "CLOSED (Weekend)"
-        elif pre_market_open <= now_et < market_open:
+        elif PRE_MARKET_OPEN <= minutes < MARKET_OPEN:
             session = "PRE-MARKET"
-        elif market_open <= now_et < market_close:
+        elif MARKET_OPEN <= minutes < MARKET_CLOSE:
             session = "REGULAR"
-        elif market_close <= now_et < after_hours_close:
+        elif MARKET_CLOSE <= minutes < AFTER_HOURS_CLOSE:
             session = "AFTER-HOURS"
         else:
             session = "CLOSED"
@@ -93,9 +95,9 @@ def get_market_session_info():
         return {
             'current_time_et': now_et.strftime('%Y-%m-%d %H:%M:%S'),
             'session': session,
-            'market_open': market_open.strftime('%H:%M ET'),
-            'market_close': market_close.strftime('%H:%M ET'),
-            'is_trading_day': now_et.weekday() < 5
+            'market_open': '09:30 ET',
+            'market_close': '16:00 ET',
+            'is_trading_day': is_trading_day
         }
     except Exception as e:
         print(f"⚠️  Error getting market session info: {e}")
@@ -107,6 +109,10 @@ def get_market_session_info():
             'is_trading_day': True
         }
 
+# Display magnitudes, picked with bisect_right (a value equal to a threshold takes its suffix)
+_MAGNITUDE_SCALES = (1_000, 1_000_000, 1_000_000_000)
+_MAGNITUDE_SUFFIXES = ('K', 'M', 'B')
+
 def format_volume(volume):
     """Format volume numbers to human-readable format (K, M, B)"""
     try:
@@ -114,15 +120,10 @@ def format_volume(volume):
             return "0"
         
         volume = float(volume)
-        
-        if volume >= 1_000_000_000:
-            return f"{volume / 1_000_000_000:.1f}B"
-        elif volume >= 1_000_000:
-            return f"{volume / 1_000_000:.1f}M"
-        elif volume >= 1_000:
-            return f"{volume / 1_000:.1f}K"
-        else:
+        i = bisect_right(_MAGNITUDE_SCALES, volume)
+        if not i:
             return f"{int(volume)}"
+        return f"{volume / _MAGNITUDE_SCALES[i - 1]:.1f}{_MAGNITUDE_SUFFIXES[i - 1]}"
     except (ValueError, TypeError):
         return "—"
 
@@ -133,15 +134,10 @@ def format_market_cap(market_cap):
             return "—"
         
         market_cap = float(market_cap)
-        
-        if market_cap >= 1_000_000_000:
-            return f"${market_cap / 1_000_000_000:.1f}B"
-        elif market_cap >= 1_000_000:
-            return f"${market_cap / 1_000_000:.1f}M"
-        elif market_cap >= 1_000:
-            return f"${market_cap / 1_000:.1f}K"
-        else:
+        i = bisect_right(_MAGNITUDE_SCALES, market_cap)
+        if not i:
             return f"${int(market_cap)}"
+        return f"${market_cap / _MAGNITUDE_SCALES[i - 1]:.1f}{_MAGNITUDE_SUFFIXES[i - 1]}"
     except (ValueError, TypeError):
         return "—"
 
@@ -188,42 +184,11 @@ def signal_handler(signum, frame):
     global running
     print(f"\n🛑 Received signal {signum}, shutting down gracefully...")
     running = False
+    stop_event.set()  # wake the main loop out of its wait
 
 def get_biggest_gappers():
-    """Get biggest gappers using yfinance screener - FAST VERSION"""
-    try:
-        print("🔍 Fetching biggest gappers...")
-        
-        # Use yfinance screener for biggest gainers
-        screener = yf.Tickers("^GSPC ^DJI ^IXIC")  # Just get major indices for symbols
-        
-        # Get top gainers from various sources
-        symbols = []
-        
-        # Add some popular high-volume stocks that often gap
-        popular_gappers = [
-            "TSLA", "NVDA", "AMD", "AAPL", "MSFT", "GOOGL", "META", "AMZN", "NFLX", "SPY",
-            "QQQ", "IWM", "TQQQ", "SQQQ", "UVXY", "VXX", "XLE", "XLF", "XLV", "XLK"
-        ]
-        symbols.extend(popular_gappers)
-        
-        # Add some penny stocks that often gap
-        penny_stocks = [
-            "HCTI", "SNDL", "HEXO", "ACB", "TLRY", "CGC", "CRON", "APHA", "OGI", "VFF",
-            "GNUS", "IDEX", "MARK", "SHIP", "TOPS", "ZOM", "CIDM", "CTRM", "NAKD", "SENS"
-        ]
-        symbols.extend(penny_stocks)
-        
-        # Remove duplicates
-        unique_symbols = list(dict.fromkeys(symbols))
-        
-        print(f"📊 Found {len(unique_symbols)} symbols to scan")
-        return unique_symbols[:MAX_STOCKS]
-        
-    except Exception as e:
-        print(f"❌ Error getting gappers: {e}")
-        # Fallback to basic symbols
-        return ["TSLA", "NVDA", "AMD", "AAPL", "MSFT", "HCTI", "SNDL", "SPY", "QQQ"]
+    """Get biggest gappers - FAST VERSION (the module-level SYMBOLS watchlist)"""
+    return SYMBOLS
 
 def filter_valid_symbols(symbols):
     """Filter out invalid symbols"""
@@ -234,142 +199,258 @@ def filter_valid_symbols(symbols):
             valid_symbols.append(symbol.upper())
     return valid_symbols
 
+# Category keywords in priority order: the first category with a keyword in the sector
+# or industry wins, even when a later category's keyword also appears
+CATEGORY_KEYWORDS = (
+    ("Technology", ('technology', 'software', 'semiconductor', 'internet')),
+    ("Healthcare", ('healthcare', 'medical', 'biotechnology', 'pharmaceutical')),
+    ("Finance", ('financial', 'banking', 'insurance')),
+    ("Energy", ('energy', 'oil', 'gas', 'renewable')),
+    ("Consumer", ('consumer', 'retail', 'automotive')),
+    ("Industrial", ('industrial', 'manufacturing')),
+    ("Real Estate", ('real estate', 'reit')),
+    ("Materials", ('materials', 'mining', 'chemical')),
+    ("Utilities", ('utilities', 'electric', 'water')),
+    ("Communication", ('communication', 'telecom', 'media')),
+)
+_KEYWORD_RANK = {keyword: rank for rank, (_, keywords) in enumerate(CATEGORY_KEYWORDS) for keyword in keywords}
+# Zero-width lookahead so overlapping keywords ("technology" inside "biotechnology") all match
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in _KEYWORD_RANK) + '))')
+
+@lru_cache(maxsize=1024)
 def categorize_stock(sector, industry):
     """Categorize stock by sector and industry"""
     if not sector or not industry:
         return "Unknown"
     
-    sector = sector.lower()
-    industry = industry.lower()
+    matches = _KEYWORD_RE.findall(f"{sector}\n{industry}".lower())
+    if not matches:
+        return "Other"
+    return CATEGORY_KEYWORDS[min(map(_KEYWORD_RANK.__getitem__, matches))][0]
+
+def get_ticker(symbol):
+    """The symbol's yf.Ticker, reused across scans until TICKER_MAX_AGE so fast_info refreshes hourly"""
+    entry = _tickers.get(symbol)
+    now = time.time()
+    if entry is None or now - entry[1] >= TICKER_MAX_AGE:
+        entry = _tickers[symbol] = (yf.Ticker(symbol), now)
+    return entry[0]
+
+def load_profiles():
+    """Load the on-disk profile cache once per process"""
+    global _profiles
+    if _profiles is None:
+        try:
+            with open(PROFILE_CACHE_FILE, 'rb') as f:
+                _profiles = json_loads(f.read())
+        except (OSError, ValueError):
+            _profiles = {}
+    return _profiles
+
+def save_profiles():
+    """Persist the profile cache if any profile was refetched since the last save"""
+    global _profiles_dirty
+    with _profiles_lock:
+        if not _profiles_dirty:
+            return
+        data = json_dumps(_profiles)
+        _profiles_dirty = False
+    try:
+        atomic_write(PROFILE_CACHE_FILE, data)
+    except OSError as e:
+        print(f"⚠️  Could not save stock profiles: {e}")
+
+def get_profile(symbol, ticker):
+    """Slow-changing .info fields for a symbol, refetched when older than PROFILE_MAX_AGE"""
+    global _profiles_dirty
+    with _profiles_lock:
+        profile = load_profiles().get(symbol)
+    if profile and time.time() - profile.get('fetched', 0) < PROFILE_MAX_AGE:
+        return profile
     
-    # Technology
-    if any(tech in sector or tech in industry for tech in ['technology', 'software', 'semiconductor', 'internet']):
-        return "Technology"
+    info = ticker.info
+    profile = {field: info[field] for field in PROFILE_FIELDS if info.get(field) is not None}
+    profile['fetched'] = time.time()
+    with _profiles_lock:
+        _profiles[symbol] = profile
+        _profiles_dirty = True
+    return profile
+
+def fast_info_value(fast_info, name):
+    """A fast_info count (shares, volume) as an int, 0 when Yahoo has no value for it"""
+    try:
+        return int(getattr(fast_info, name) or 0)
+    except Exception:
+        return 0
+
+def stock_info(symbol, ticker, price):
+    """The .info-style fields build_stock_data reads, from fast_info plus the cached profile"""
+    price = float(price)
+    fast_info = ticker.fast_info
+    profile = get_profile(symbol, ticker)
+    shares = fast_info_value(fast_info, 'shares')
+    info = {
+        'averageVolume': fast_info_value(fast_info, 'three_month_average_volume'),
+        # fast_info's market_cap is shares * its own memoized last price; use the fresh one
+        'marketCap': int(shares * price),
+        'sharesOutstanding': shares,
+        'sector': profile.get('sector', ''),
+        'industry': profile.get('industry', ''),
+    }
+    if 'floatShares' in profile:
+        info['floatShares'] = profile['floatShares']
+    eps = profile.get('trailingEps') or 0
+    if eps > 0:  # Yahoo leaves trailingPE unset for negative earnings
+        info['trailingPE'] = price / eps
+    return info
+
+def build_stock_data(symbol, hist, info):
+    """Build a symbol's cache entry from its daily history and info dict"""
+    if len(hist) < 2:
+        return None
     
-    # Healthcare
-    if any(health in sector or health in industry for health in ['healthcare', 'medical', 'biotechnology', 'pharmaceutical']):
-        return "Healthcare"
+    # Plain Python numbers, so the cache holds no numpy scalars
+    current_price = float(hist['Close'].iloc[-1])
+    prev_close = float(hist['Close'].iloc[-2])
     
-    # Finance
-    if any(finance in sector or finance in industry for finance in ['financial', 'banking', 'insurance']):
-        return "Finance"
+    # Calculate gap percentage
+    if prev_close > 0:
+        gap_pct = ((current_price - prev_close) / prev_close) * 100
+    else:
+        gap_pct = 0
     
-    # Energy
-    if any(energy in sector or energy in industry for energy in ['energy', 'oil', 'gas', 'renewable']):
-        return "Energy"
+    # Get volume data
+    volume = int(hist['Volume'].iloc[-1]) if len(hist) > 0 else 0
+    avg_volume = info.get('averageVolume', 0)
     
-    # Consumer
-    if any(consumer in sector or consumer in industry for consumer in ['consumer', 'retail', 'automotive']):
-        return "Consumer"
+    # Calculate relative volume
+    rel_volume = (volume / avg_volume) if avg_volume > 0 else 0
     
-    # Industrial
-    if any(industrial in sector or industrial in industry for industrial in ['industrial', 'manufacturing']):
-        return "Industrial"
+    # The latest 1m close is the daily bar's close, so pre/post market change is the gap
+    return stock_entry(symbol, info, round(current_price, 2), round(prev_close, 2), round(gap_pct, 2),
+                       volume, round(rel_volume, 2), round(gap_pct, 2))
+
+def stock_entry(symbol, info, price, prev_close, gap_pct, volume, rel_volume, pre_market_change):
+    """Assemble a cache entry from the (already rounded) price math and the info fields"""
+    avg_volume = info.get('averageVolume', 0)
     
-    # Real Estate
-    if any(real_estate in sector or real_estate in industry for real_estate in ['real estate', 'reit']):
-        return "Real Estate"
+    # Get market cap
+    market_cap = info.get('marketCap', 0)
     
-    # Materials
-    if any(materials in sector or materials in industry for materials in ['materials', 'mining', 'chemical']):
-        return "Materials"
+    # Get float
+    shares_outstanding = info.get('sharesOutstanding', 0)
+    float_shares = info.get('floatShares', shares_outstanding)
     
-    # Utilities
-    if any(utilities in sector or utilities in industry for utilities in ['utilities', 'electric', 'water']):
-        return "Utilities"
+    # Get sector and industry
+    sector = info.get('sector', '')
+    industry = info.get('industry', '')
+    category = categorize_stock(sector, industry)
     
-    # Communication
-    if any(comm in sector or comm in industry for comm in ['communication', 'telecom', 'media']):
-        return "Communication"
+    # Get PE ratio
+    pe_ratio = info.get('trailingPE', 0)
     
-    return "Other"
+    # Create stock data object
+    return {
+        'symbol': symbol,
+        'price': price,
+        'prev_close': prev_close,
+        'gap_pct': gap_pct,
+        'volume': volume,
+        'avg_volume': avg_volume,
+        'rel_volume': rel_volume,
+        'market_cap': market_cap,
+        'market_cap_formatted': format_market_cap(market_cap),
+        'float': float_shares,
+        'float_formatted': format_volume(float_shares),
+        'sector': sector,
+        'industry': industry,
+        'category': category,
+        'pe_ratio': round(pe_ratio, 2) if pe_ratio else 0,
+        'volume_formatted': format_volume(volume),
+        'avg_volume_formatted': format_volume(avg_volume),
+        'pre_market_change': pre_market_change,
+        'last_updated': datetime.now().strftime('%H:%M:%S')
+    }
+
+def percent_change(new, base):
+    """Element-wise percent change of new over base, 0 where base isn't positive"""
+    return np.divide((new - base) * 100, base, out=np.zeros_like(base), where=base > 0)
 
 def fetch_stock_data(symbol, max_retries=1, base_delay=1.0):
     """Fetch stock data with minimal delays - FAST VERSION"""
     try:
-        # Create ticker object
-        ticker = yf.Ticker(symbol)
-        
-        # Get basic info
-        info = ticker.info
+        # Reuse the ticker object from earlier scans
+        ticker = get_ticker(symbol)
         
         # Get current price and previous close
         hist = ticker.history(period="2d")
         if len(hist) < 2:
             return None
         
-        current_price = hist['Close'].iloc[-1]
-        prev_close = hist['Close'].iloc[-2]
-        
-        # Calculate gap percentage
-        if prev_close > 0:
-            gap_pct = ((current_price - prev_close) / prev_close) * 100
-        else:
-            gap_pct = 0
-        
-        # Get volume data
-        volume = hist['Volume'].iloc[-1] if len(hist) > 0 else 0
-        avg_volume = info.get('averageVolume', 0)
-        
-        # Calculate relative volume
-        rel_volume = (volume / avg_volume) if avg_volume > 0 else 0
-        
-        # Get market cap
-        market_cap = info.get('marketCap', 0)
-        
-        # Get float
-        shares_outstanding = info.get('sharesOutstanding', 0)
-        float_shares = info.get('floatShares', shares_outstanding)
-        
-        # Get sector and industry
-        sector = info.get('sector', '')
-        industry = info.get('industry', '')
-        category = categorize_stock(sector, industry)
-        
-        # Get PE ratio
-        pe_ratio = info.get('trailingPE', 0)
-        
-        # Get pre/post market data if available
-        try:
-            # Try to get extended hours data
-            extended_hist = ticker.history(period="1d", interval="1m")
-            if len(extended_hist) > 0:
-                latest_price = extended_hist['Close'].iloc[-1]
-                pre_market_change = ((latest_price - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-            else:
-                pre_market_change = gap_pct
-        except:
-            pre_market_change = gap_pct
-        
-        # Create stock data object
-        stock_data = {
-            'symbol': symbol,
-            'price': round(current_price, 2),
-            'prev_close': round(prev_close, 2),
-            'gap_pct': round(gap_pct, 2),
-            'volume': volume,
-            'avg_volume': avg_volume,
-            'rel_volume': round(rel_volume, 2),
-            'market_cap': market_cap,
-            'market_cap_formatted': format_market_cap(market_cap),
-            'float': float_shares,
-            'float_formatted': format_volume(float_shares),
-            'sector': sector,
-            'industry': industry,
-            'category': category,
-            'pe_ratio': round(pe_ratio, 2) if pe_ratio else 0,
-            'volume_formatted': format_volume(volume),
-            'avg_volume_formatted': format_volume(avg_volume),
-            'pre_market_change': round(pre_market_change, 2),
-            'last_updated': datetime.now().strftime('%H:%M:%S')
-        }
-        
-        return stock_data
+        info = stock_info(symbol, ticker, hist['Close'].iloc[-1])
+        save_profiles()
+        return build_stock_data(symbol, hist, info)
         
     except Exception as e:
         print(f"❌ Error fetching data for {symbol}: {e}")
         return None
 
+def split_download(data, symbols):
+    """Split a group_by="ticker" yf.download frame into {symbol: its OHLCV frame}"""
+    if data is None or data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {symbols[0]: data}  # a single symbol comes back without the ticker level
+    downloaded = set(data.columns.get_level_values(0))
+    return {symbol: data[symbol].dropna(how='all') for symbol in symbols if symbol in downloaded}
+
+def download_history(symbols, period, interval):
+    """Download every symbol's history in one batched yf.download call"""
+    data = yf.download(list(symbols), period=period, interval=interval, group_by="ticker",
+                       threads=True, progress=False)
+    return split_download(data, symbols)
+
+def fetch_stock_data_bulk(symbols):
+    """Fetch stock data for many symbols with batched history downloads; returns {symbol: data}"""
+    symbols = list(symbols)
+    daily = download_history(symbols, period="2d", interval="1d")
+    
+    priced = [symbol for symbol in symbols if symbol in daily and len(daily[symbol]) >= 2]
+    if not priced:
+        return {}
+    
+    # Last two daily closes and last volume of every symbol as columns
+    closes = np.array([daily[symbol]['Close'].to_numpy()[-2:] for symbol in priced], dtype=float)
+    prev_close, price = closes[:, 0], closes[:, 1]
+    volume = np.array([daily[symbol]['Volume'].to_numpy()[-1] for symbol in priced], dtype=float)
+    
+    # Per-symbol metadata lookups are network-bound and overlap in worker threads
+    tickers = {symbol: get_ticker(symbol) for symbol in priced}
+    infos = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(priced))) as executor:
+        futures = {executor.submit(stock_info, symbol, tickers[symbol], price[i]): symbol
+                   for i, symbol in enumerate(priced)}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                infos[symbol] = future.result()
+            except Exception as e:
+                logger.warning("❌ Error fetching data for %s: %s", symbol, e)
+    save_profiles()
+    
+    # Gap and relative volume for all symbols at once
+    avg_volume = np.array([infos.get(symbol, {}).get('averageVolume', 0) for symbol in priced], dtype=float)
+    gap_pct = percent_change(price, prev_close)
+    rel_volume = np.divide(volume, avg_volume, out=np.zeros_like(volume), where=avg_volume > 0)
+    
+    # The latest 1m close is the daily bar's close, so pre/post market change is the gap
+    gap_pct = np.round(gap_pct, 2).tolist()
+    columns = zip(priced, np.round(price, 2).tolist(), np.round(prev_close, 2).tolist(),
+                  gap_pct, np.nan_to_num(volume).astype(np.int64).tolist(),
+                  np.round(rel_volume, 2).tolist(), gap_pct)
+    return {symbol: stock_entry(symbol, infos[symbol], *values)
+            for symbol, *values in columns if symbol in infos}
+
 def scan_gaps():
     """Scan for gap opportunities with ultra-fast optimization"""
     global last_scan_time
@@ -383,46 +464,35 @@ def scan_gaps():
         print(f"📅 Market Session: {market_info['session']} | Time: {market_info['current_time_et']}")
         
         # Get biggest gappers
-        print("🔍 Fetching biggest gappers...")
         gapper_symbols = get_biggest_gappers()
         
         if not gapper_symbols:
             print("❌ No gapper symbols found")
             return
         
-        print(f"📊 Found {len(gapper_symbols)} symbols to scan")
-        
-        # Limit to MAX_STOCKS for speed
-        unique_symbols = list(set(gapper_symbols))[:MAX_STOCKS]
-        print(f"📊 Total unique symbols to scan: {len(unique_symbols)}")
-        
-        # Load existing cache for comparison
-        existing_cache = load_existing_cache()
-        existing_stocks = existing_cache.get('stocks', []) if existing_cache else []
-        existing_symbols = {stock['symbol'] for stock in existing_stocks}
+        # Already deduplicated and limited to MAX_STOCKS
+        unique_symbols = gapper_symbols
         
         # Track results
         successful_stocks = []
         failed_stocks = []
         
-        # Scan each symbol with minimal delays
-        for i, symbol in enumerate(unique_symbols, 1):
-            if i > 1 and i % 5 == 0: # Only delay every 5th request
-                time.sleep(RATE_LIMIT_DELAY)
-                
-            print(f"📊 Scanning {symbol} ({i}/{len(unique_symbols)})...")
-            
-            try:
-                stock_data = fetch_stock_data(symbol)
-                if stock_data:
-                    successful_stocks.append(stock_data)
-                    print(f"✅ {symbol}: ${stock_data['price']:.2f} ({stock_data['gap_pct']:.2f}% gap)")
-                else:
-                    failed_stocks.append(symbol)
-                    print(f"❌ {symbol}: Failed to fetch data")
-            except Exception as e:
+        # Fetch every symbol with batched requests
+        logger.debug("Scanning %d symbols in one batch", len(unique_symbols))
+        try:
+            fetched = fetch_stock_data_bulk(unique_symbols)
+        except Exception as e:
+            print(f"❌ Batch fetch failed: {e}")
+            fetched = {}
+        
+        for symbol in unique_symbols:
+            stock_data = fetched.get(symbol)
+            if stock_data:
+                successful_stocks.append(stock_data)
+                logger.debug("%s: $%.2f (%.2f%% gap)", symbol, stock_data['price'], stock_data['gap_pct'])
+            else:
                 failed_stocks.append(symbol)
-                print(f"❌ {symbol}: Error - {e}")
+                logger.debug("%s: failed to fetch data", symbol)
         
         # Create cache data with proper JSON serialization
         cache_data = {
@@ -440,14 +510,11 @@ def scan_gaps():
             'last_update_str': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
-        # Use custom JSON serializer to handle numpy types
+        # The entries hold plain Python numbers, so the data is handed over as-is
         try:
-            # Serialize with custom serializer to handle numpy types
-            cache_data_clean = json.loads(json.dumps(cache_data, default=json_serializer))
-            
-            # Save using cache manager
-            if cache_manager.save_cache(cache_data_clean):
-                print(f"✅ Saved {len(successful_stocks)} stocks to cache")
+            # Written by the cache manager's writer thread, off the scan path
+            if cache_manager.save_cache_async(cache_data):
+                print(f"✅ Queued {len(successful_stocks)} stocks for the cache")
             else:
                 print("❌ Failed to save cache")
                 
@@ -457,31 +524,40 @@ def scan_gaps():
         # Update last scan time
         last_scan_time = time.time()
         
-        print(f"✅ FAST Scan Complete!")
-        print(f"📊 Success: {len(successful_stocks)}")
-        print(f"❌ Failed: {len(failed_stocks)}")
-        print(f"⏱️  Duration: {time.time() - start_time:.1f}s")
-        print(f"📊 Market Session: {market_info['session']}")
+        # One summary line per scan; the failed symbols are listed once here
+        logger.info("✅ FAST Scan Complete! Success: %d | Failed: %d%s | Duration: %.1fs | Session: %s",
+                    len(successful_stocks), len(failed_stocks),
+                    f" ({', '.join(failed_stocks)})" if failed_stocks else '',
+                    time.time() - start_time, market_info['session'])
         
     except Exception as e:
         print(f"❌ Critical error in scan_gaps: {e}")
         import traceback
         traceback.print_exc()
 
+def cache_epoch(last_update):
+    """A cache's last_update (epoch seconds or the ISO string scan_gaps writes) as epoch seconds"""
+    if isinstance(last_update, str):
+        try:
+            return datetime.fromisoformat(last_update).timestamp()
+        except ValueError:
+            return 0
+    return last_update or 0
+
 def load_existing_cache():
     """Load existing cache if available"""
     try:
-        cache_data = cache_manager.load_cache()
-        if cache_data and cache_data.get('stocks'):
-            last_update = cache_data.get('last_update', 0)
-            age_minutes = (time.time() - last_update) / 60
+        # The staleness check only needs the metadata record, not the parsed stocks
+        meta = cache_manager.load_cache_meta()
+        if meta and meta.get('stocks_count'):
+            age_minutes = (time.time() - cache_epoch(meta.get('last_update'))) / 60
             
-            print(f"📁 Found existing cache from {cache_data.get('last_update_str', 'unknown')} ({age_minutes:.1f} minutes ago)")
+            print(f"📁 Found existing cache from {meta.get('last_update_str', 'unknown')} ({age_minutes:.1f} minutes ago)")
             
             # If cache is fresh (less than 2 minutes old), preserve it
             if age_minutes < 2:
                 print(f"✅ Cache is fresh ({age_minutes:.1f} minutes old) - preserving existing data")
-                return cache_data
+                return cache_manager.load_cache_shared()
             else:
                 print(f"🔄 Cache is stale ({age_minutes:.1f} minutes old) - will refresh")
                 return None
@@ -494,6 +570,10 @@ def main():
     """Main background gap scanner loop - FAST VERSION"""
     global running, last_scan_time
     
+    # Per-symbol scan lines are DEBUG; set LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='%(message)s',
+                        stream=sys.stdout)
+    
     print("🚀 Starting FAST Background Gap Scanner")
     print(f"🎯 Finding biggest gappers dynamically")
     print(f"📊 Max stocks: {MAX_STOCKS}")
@@ -517,7 +597,7 @@ def main():
     # Load existing cache
     existing_cache = load_existing_cache()
     if existing_cache:
-        last_scan_time = existing_cache.get('last_update', 0)
+        last_scan_time = cache_epoch(existing_cache.get('last_update'))
         print(f"✅ Using existing cache data - next scan in {SCAN_INTERVAL/60:.1f} minutes")
     else:
         print(f"🔄 No fresh cache found - will start initial scan immediately")
@@ -528,25 +608,28 @@ def main():
     while running:
         try:
             current_time = time.time()
-            time_since_last = current_time - last_scan_time
+            remaining = SCAN_INTERVAL - (current_time - last_scan_time)
             
-            if time_since_last >= SCAN_INTERVAL:
-                print(f"\n🔍 Starting FAST scan cycle...")
-                scan_gaps()
-                last_scan_time = current_time  # Update scan time after successful scan
-            else:
-                remaining = SCAN_INTERVAL - time_since_last
-                print(f"⏳ Next FAST gap scan in {remaining:.0f} seconds...", end='\r')
+            if remaining > 0:
+                # Sleep until the next scan is due; a shutdown signal ends the wait early
+                print(f"⏳ Next FAST gap scan in {remaining:.0f} seconds...")
+                if stop_event.wait(timeout=remaining):
+                    break
+                continue
             
-            time.sleep(1)  # Check every 1 second for more responsive timing
+            print(f"\n🔍 Starting FAST scan cycle...")
+            scan_gaps()
+            last_scan_time = current_time  # Update scan time after successful scan
             
         except KeyboardInterrupt:
             break
         except Exception as e:
             print(f"\n❌ Unexpected error in main loop: {e}")
             print(f"🔄 Retrying in 5 seconds...")
-            time.sleep(5)  # Wait before retrying
+            if stop_event.wait(timeout=5):  # Wait before retrying
+                break
     
+    cache_manager.flush()  # finish the last scan's cache write before exiting
     print("\n✅ FAST Gap scanner stopped gracefully")
     remove_pid_file()
 
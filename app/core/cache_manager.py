@@ -4,15 +4,19 @@ Simple Cache Manager for Poppalyze
 Handles loading and saving of stock cache data
 """
 
-import json
 import os
 import time
+import queue
 import logging
+import threading
 from config import Config
-from utils import safe_json_dump, safe_json_load, validate_cache_data, ensure_directory
+from utils import safe_json_load, validate_cache_data, ensure_directory, json_dumps, json_loads, atomic_write
 
 logger = logging.getLogger(__name__)
 
+# Cache header fields copied into the metadata file written next to the cache
+CACHE_META_FIELDS = ('last_update', 'last_update_str', 'successful_count', 'total_count')
+
 class CacheManager:
     def __init__(self, cache_file=None):
         if cache_file is None:
@@ -22,6 +26,12 @@ class CacheManager:
             print(f"📁 Cache file path: {self.cache_file}")
         else:
             self.cache_file = os.path.abspath(cache_file) if not os.path.isabs(cache_file) else cache_file
+        self.meta_file = os.path.splitext(self.cache_file)[0] + '_meta.json'
+        self._shared = None  # ((mtime_ns, size), parsed cache) for load_cache_shared
+        self._meta = None  # ((mtime_ns, size), metadata) for load_cache_meta
+        self._write_queue = queue.Queue(maxsize=1)  # latest snapshot waiting for the writer thread
+        self._writer = None
+        self._writer_lock = threading.Lock()
     
     def save_cache_with_path(self, stock_data, cache_path=None):
         """Save cache data to specific path with success message"""
@@ -32,8 +42,8 @@ class CacheManager:
             # Ensure directory exists
             os.makedirs(os.path.dirname(cache_path), exist_ok=True)
             
-            with open(cache_path, "w") as f:
-                json.dump(stock_data, f, indent=2)
+            with open(cache_path, "wb") as f:
+                f.write(json_dumps(stock_data))
             print(f"✅ Saved {len(stock_data.get('stocks', {}))} stocks to cache at {cache_path}")
             return True
         except Exception as e:
@@ -43,8 +53,8 @@ class CacheManager:
     def save_to_cache(self, data):
         """Save data to cache with directory creation"""
         os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-        with open(self.cache_file, "w") as f:
-            json.dump(data, f)
+        with open(self.cache_file, "wb") as f:
+            f.write(json_dumps(data))
         print(f"✅ Cache saved to {self.cache_file}")
     
     def load_cache(self):
@@ -61,6 +71,65 @@ class CacheManager:
             logger.error(f"❌ Error loading cache: {e}")
         return None
     
+    def load_cache_shared(self):
+        """Load cache data, reusing the last parse while the file is unchanged (read-only)"""
+        try:
+            stat = os.stat(self.cache_file)
+        except OSError:
+            return None
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        shared = self._shared
+        if shared is None or shared[0] != key:
+            shared = (key, self.load_cache())
+            self._shared = shared
+        return shared[1]
+    
+    def build_cache_meta(self, cache_data, key):
+        """The metadata record of cache_data, tagged with the cache file's (mtime_ns, size)"""
+        meta = {field: cache_data[field] for field in CACHE_META_FIELDS if field in cache_data}
+        meta['stocks_count'] = len(cache_data.get('stocks') or ())
+        meta['cache_key'] = list(key)
+        return meta
+    
+    def save_cache_meta(self, cache_data):
+        """Write the metadata file for the cache just saved; returns the record"""
+        stat = os.stat(self.cache_file)
+        meta = self.build_cache_meta(cache_data, (stat.st_mtime_ns, stat.st_size))
+        try:
+            atomic_write(self.meta_file, json_dumps(meta))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write cache metadata: {e}")
+        return meta
+    
+    def load_cache_meta(self):
+        """Load the cache's counts and timestamps without parsing the stocks (None if no valid cache)
+        
+        The metadata file is trusted only while it matches the cache file's (mtime_ns, size);
+        caches written by other tools fall back to one full load, which refreshes it.
+        """
+        try:
+            stat = os.stat(self.cache_file)
+        except OSError:
+            return None
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        meta = self._meta
+        if meta is not None and meta[0] == key:
+            return meta[1]
+        
+        try:
+            with open(self.meta_file, 'rb') as f:
+                record = json_loads(f.read())
+        except (OSError, ValueError):
+            record = None
+        if not isinstance(record, dict) or record.get('cache_key') != list(key):
+            cache_data = self.load_cache_shared()
+            record = self.save_cache_meta(cache_data) if cache_data else None
+        
+        self._meta = (key, record)
+        return record
+    
     def save_cache(self, cache_data):
         """Save cache data to file with confirmation"""
         try:
@@ -72,52 +141,57 @@ class CacheManager:
                 logger.error("❌ Invalid cache data structure")
                 return False
             
-            # Save using safe utility function
-            if safe_json_dump(cache_data, self.cache_file, indent=2):
-                # Verify the write was successful
-                if self.verify_cache_write(cache_data):
-                    logger.info(f"✅ Cache saved successfully to {self.cache_file}")
-                    print(f"✅ Cache saved successfully to {self.cache_file}")
-                    return True
-                else:
-                    logger.error("❌ Cache write verification failed")
-                    return False
-            else:
-                logger.error("❌ Failed to save cache data")
-                return False
+            self._write_cache(cache_data)
+            logger.info(f"✅ Cache saved successfully to {self.cache_file}")
+            print(f"✅ Cache saved successfully to {self.cache_file}")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Error saving cache: {e}")
             print(f"❌ Error saving cache: {e}")
             return False
     
-    def verify_cache_write(self, expected_data):
-        """Verify that cache was written correctly"""
-        try:
-            if not os.path.exists(self.cache_file):
-                return False
-                
-            with open(self.cache_file, 'r') as f:
-                written_data = json.load(f)
-            
-            # Check if we have the expected structure
-            if not isinstance(written_data, dict):
-                return False
-                
-            if 'stocks' not in written_data:
-                return False
-                
-            # Check if we have actual stock data
-            stocks = written_data.get('stocks', {})
-            if not stocks or len(stocks) == 0:
-                return False
-                
-            print(f"✅ Cache verification: {len(stocks)} stocks written")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Cache verification failed: {e}")
+    def _write_cache(self, cache_data):
+        """Write the cache atomically (temp file, fsync, rename) plus its metadata file"""
+        # Readers see either the old or the new complete file, so no read-back is needed
+        atomic_write(self.cache_file, json_dumps(cache_data), fsync=True)
+        self.save_cache_meta(cache_data)
+    
+    def save_cache_async(self, cache_data):
+        """Hand cache data to the background writer; a snapshot still waiting is replaced"""
+        if not validate_cache_data(cache_data):
+            logger.error("❌ Invalid cache data structure")
             return False
+        
+        with self._writer_lock:
+            if self._writer is None:
+                ensure_directory(os.path.dirname(self.cache_file))
+                self._writer = threading.Thread(target=self._write_loop, name='cache-writer', daemon=True)
+                self._writer.start()
+            try:
+                self._write_queue.get_nowait()  # superseded before it was written
+                self._write_queue.task_done()
+            except queue.Empty:
+                pass
+            self._write_queue.put_nowait(cache_data)
+        return True
+    
+    def _write_loop(self):
+        """Writer thread: persist each queued snapshot off the caller's thread"""
+        while True:
+            cache_data = self._write_queue.get()
+            try:
+                self._write_cache(cache_data)
+                logger.info(f"✅ Cache saved successfully to {self.cache_file}")
+            except Exception as e:
+                logger.error(f"❌ Error saving cache: {e}")
+                print(f"❌ Error saving cache: {e}")
+            finally:
+                self._write_queue.task_done()
+    
+    def flush(self):
+        """Block until every snapshot handed to save_cache_async is on disk"""
+        self._write_queue.join()
     
     def clear_cache(self):
         """Clear the cache file"""
@@ -135,7 +209,7 @@ class CacheManager:
     
     def get_cache_status(self):
         """Get cache status information"""
-        cache_data = self.load_cache()
+        cache_data = self.load_cache_shared()
         
         if not cache_data or not cache_data.get('stocks'):
             return {
@@ -4,50 +4,111 @@ Cleanup script to stop all background scanner processes and remove PID files
 """
 
 import os
-import subprocess
 import signal
 import time
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# PID files written by background_scanner.py and background_scanner_fast.py
+PID_FILES = ("background_scanner.pid", "background_scanner_fast.pid")
+# Scanner scripts, matched against the end of a command line argument
+SCANNER_SCRIPTS = ("background_scanner.py", "background_scanner_fast.py")
+STOP_TIMEOUT = 2  # seconds to wait for a scanner to exit after SIGTERM
+
+def read_pid(pid_file):
+    """PID recorded in a scanner PID file, or None if missing or unreadable"""
+    try:
+        with open(pid_file) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def process_cmdline(pid):
+    """A process's command line arguments, empty if it is gone or unreadable"""
+    try:
+        if PSUTIL_AVAILABLE:
+            return psutil.Process(pid).cmdline()
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().decode(errors="replace").split("\0")
+    except Exception:
+        return []
+
+def is_scanner(pid):
+    """Whether pid is a background scanner (and not this script), so a reused PID is left alone"""
+    return pid != os.getpid() and any(arg.endswith(SCANNER_SCRIPTS) for arg in process_cmdline(pid))
+
+def find_scanner_pids():
+    """PIDs of running scanner processes, including ones without a PID file"""
+    if PSUTIL_AVAILABLE:
+        pids = psutil.pids()
+    else:
+        try:
+            pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return []
+    return [pid for pid in pids if is_scanner(pid)]
+
+def stop_process(pid):
+    """SIGTERM a process and wait for it to exit; returns False if it is still running"""
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return True  # already gone
+    except PermissionError:
+        return False
+
+    deadline = time.monotonic() + STOP_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        try:
+            os.kill(pid, 0)  # Signal 0 just checks if process exists
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+    return False
+
 def cleanup_all_scanners():
     """Clean up all background scanner processes and PID files"""
     print("🧹 Cleaning up all background scanner processes...")
-    
-    # Kill all background scanner processes
-    try:
-        result = subprocess.run(['pkill', '-f', 'background_scanner.py'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ Killed background scanner processes")
+
+    # Scanners named by a PID file, if that PID is still a scanner, plus any without one
+    pids = set(find_scanner_pids())
+    for pid_file in PID_FILES:
+        pid = read_pid(pid_file)
+        if pid is None:
+            print(f"ℹ️  No PID file found: {pid_file}")
+        elif is_scanner(pid):
+            pids.add(pid)
         else:
-            print("ℹ️  No background scanner processes found")
-    except Exception as e:
-        print(f"⚠️  Error killing processes: {e}")
-    
-    # Remove PID file
-    pid_file = "background_scanner.pid"
-    if os.path.exists(pid_file):
+            print(f"ℹ️  Stale PID file: {pid_file} (process {pid} is not a scanner)")
+
+    if not pids:
+        print("ℹ️  No background scanner processes found")
+
+    for pid in sorted(pids):
+        try:
+            if stop_process(pid):
+                print(f"✅ Stopped background scanner process {pid}")
+            else:
+                print(f"⚠️  Process {pid} is still running")
+                print("   You may need to force kill it manually")
+        except Exception as e:
+            print(f"⚠️  Error stopping process {pid}: {e}")
+
+    # Remove PID files
+    for pid_file in PID_FILES:
         try:
             os.remove(pid_file)
             print(f"✅ Removed PID file: {pid_file}")
+        except FileNotFoundError:
+            pass  # missing, or the scanner removed it on shutdown
         except Exception as e:
             print(f"⚠️  Error removing PID file: {e}")
-    else:
-        print(f"ℹ️  No PID file found: {pid_file}")
-    
-    # Wait a moment for processes to fully terminate
-    time.sleep(2)
-    
-    # Check if any processes are still running
-    try:
-        result = subprocess.run(['pgrep', '-f', 'background_scanner.py'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            print("⚠️  Some processes may still be running")
-            print("   You may need to force kill them manually")
-        else:
-            print("✅ All background scanner processes stopped")
-    except Exception as e:
-        print(f"⚠️  Error checking remaining processes: {e}")
 
 if __name__ == "__main__":
-    cleanup_all_scanners() 
\ No newline at end of file
+    cleanup_all_scanners()
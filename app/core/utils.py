@@ -1,9 +1,17 @@
 import json
 import logging
+import os
+import threading
 import numpy as np
 from functools import wraps
 import time
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 def json_serializer(obj):
@@ -18,11 +26,48 @@ def json_serializer(obj):
         return obj.isoformat()
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
-def safe_json_dump(data, file_path, **kwargs):
+def json_dumps(data, indent=None):
+    """Encode data as JSON bytes, with orjson when available (it only indents by 2)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=json_serializer, option=option)
+    return json.dumps(data, default=json_serializer, indent=indent).encode()
+
+def json_loads(raw):
+    """Decode JSON bytes, str or a memoryview (e.g. over an mmap), with orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by the stdlib encoder; json accepts it
+    return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+def atomic_write(file_path, data, fsync=False):
+    """Write bytes to file_path via a temp file and rename, so readers never see a partial file"""
+    # Unique per process and thread: the scanner, add_missing_stock.py and the web
+    # workers all write these files, and a shared temp path lets one clobber another
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def safe_json_dump(data, file_path, indent=None):
     """Safely dump data to JSON file with error handling"""
     try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, default=json_serializer, **kwargs)
+        with open(file_path, 'wb') as f:
+            f.write(json_dumps(data, indent=indent))
         return True
     except Exception as e:
         logger.error(f"Error saving JSON to {file_path}: {e}")
@@ -31,8 +76,8 @@ def safe_json_dump(data, file_path, **kwargs):
 def safe_json_load(file_path):
     """Safely load data from JSON file with error handling"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return json_loads(f.read())
     except Exception as e:
         logger.error(f"Error loading JSON from {file_path}: {e}")
         return None
@@ -60,7 +105,6 @@ def retry_operation(func, max_retries=3, delay=1, *args, **kwargs):
 
 def ensure_directory(path):
     """Ensure directory exists, create if it doesn't"""
-    import os
     os.makedirs(path, exist_ok=True)
     return path
 
@@ -1,5 +1,9 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
+from werkzeug.http import dump_cookie
+from werkzeug.datastructures import ImmutableMultiDict
 import json
+import logging
+import re
 import time
 import os
 import subprocess
@@ -8,14 +12,45 @@ import signal
 import sys
 import sqlite3
 import uuid
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+import queue
+import atexit
+import math
+import heapq
+from bisect import bisect_right
+import numpy as np
+from datetime import datetime
+from functools import wraps, lru_cache, partial
+from operator import itemgetter
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from collections import defaultdict, Counter, OrderedDict
 from dotenv import load_dotenv
 from cache_manager import cache_manager
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+analytics_logger = logging.getLogger('analytics')
+
 app = Flask(__name__)
 
 # Configuration
@@ -23,7 +58,114 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CACHE_FILE = os.path.join(BASE_DIR, "data", "stock_cache.json")
 background_scanner_process = None
 SCANNER_PID_FILE = "background_scanner_fast.pid"
+SCANNER_SCRIPT = "background_scanner_fast.py"
+SCANNER_STOP_TIMEOUT = 5  # seconds to wait after SIGTERM before SIGKILL
 TRAFFIC_DB = "traffic_analytics.db"
+TRAFFIC_ROLLUP_DB = "traffic_rollups.db"  # attached as "rollups"; read by the dashboard
+
+# Applied to every traffic analytics connection (journal_mode=WAL also persists in the file)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA rollups.journal_mode=WAL",
+    "PRAGMA rollups.synchronous=NORMAL",
+)
+
+# Tracking events are queued by request threads and committed in batches by _Flusher
+TRAFFIC_QUEUE_SIZE = 10000
+FLUSH_BATCH_SIZE = 500
+FLUSH_MAX_WAIT = 0.2  # seconds to keep collecting events before committing
+
+# Client-side analytics events are queued by request threads and appended by _AnalyticsLogWriter
+ANALYTICS_LOG = "analytics.log"
+ANALYTICS_LOG_MAX_BYTES = 50 * 1024 * 1024  # rotated to analytics.log.1 past this size
+ANALYTICS_QUEUE_SIZE = 10000
+
+# Tracking statements, kept as constants so each connection's statement cache reuses them
+_SQL_UPSERT_VISITOR = '''
+    INSERT INTO visitors (session_id, ip_address, ua_id, first_visit, last_visit, visit_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        visit_count = visit_count + excluded.visit_count,
+        last_visit = excluded.last_visit
+'''
+_SQL_INSERT_PV = '''
+    INSERT INTO page_views (session_id, page_url, timestamp, ip_address, ua_id, referrer_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_API = '''
+    INSERT INTO api_calls (session_id, endpoint, timestamp, ip_address, ua_id)
+    VALUES (?, ?, ?, ?, ?)
+'''
+_SQL_UPSERT_PV_DAILY = '''
+    INSERT INTO rollups.page_views_daily (day, page_url, ip_address, count)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(day, page_url, ip_address) DO UPDATE SET count = count + excluded.count
+'''
+_SQL_UPSERT_API_DAILY = '''
+    INSERT INTO rollups.api_calls_daily (day, endpoint, count)
+    VALUES (?, ?, ?)
+    ON CONFLICT(day, endpoint) DO UPDATE SET count = count + excluded.count
+'''
+SQLITE_CACHED_STATEMENTS = 256
+INTERN_CACHE_SIZE = 10000  # user agent / referrer ids remembered by the flusher
+SCHEMA_VERSION = 3  # PRAGMA user_version once the migrations in init_database have run
+# (table, column, type) written by both this app and admin_dashboard.py (which shares
+# TRAFFIC_DB) but missing from tables an older version of either created
+TRAFFIC_ADDED_COLUMNS = (
+    ('visitors', 'ua_id', 'INTEGER'),
+    ('page_views', 'ua_id', 'INTEGER'),
+    ('page_views', 'referrer_id', 'INTEGER'),
+    ('api_calls', 'session_id', 'TEXT'),
+    ('api_calls', 'ua_id', 'INTEGER'),
+)
+ANALYSIS_LIMIT = 1000  # rows sampled per index by the startup ANALYZE
+VISITOR_TOUCH_INTERVAL = 30  # seconds before a session's visitor row is upserted again
+RECENT_VISITOR_LIMIT = 4096  # sessions remembered for VISITOR_TOUCH_INTERVAL
+DAILY_PAGE_VIEWS_BATCH = 256  # rollup rows fetched per step while streaming /api/traffic
+TRAFFIC_MAX_DAYS = 365  # widest /api/traffic?days= window
+
+# Requests that never reach the traffic tables
+_SKIP_RE = re.compile(r'/(?:(?:static|admin|assets)/|(?:favicon\.ico|robots\.txt|healthz|ping)$)')
+BOT_USER_AGENT_RE = re.compile(r'bot|spider|crawler|curl|wget', re.IGNORECASE)
+SESSION_COOKIE_RE = re.compile(r'(?:^|;)\s*session_id="?([^";]*)')
+SESSION_COOKIE_MAX_AGE = 86400  # 24 hours
+
+# Memoized stats and status: (function name, *args) -> (value, expires_at) (LRU).
+# Arguments can come from request parameters, so the entries are bounded.
+STATS_CACHE_SIZE = 64
+_stats_cache = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+def ttl_cache(seconds):
+    """Reuse a function's (or TrafficAnalytics stats method's) result for a number of seconds"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__,) + args + tuple(sorted(kwargs.items()))
+            now = time.time()
+            with _stats_cache_lock:
+                cached = _stats_cache.get(key)
+                if cached and cached[1] > now:
+                    _stats_cache.move_to_end(key)
+                    return cached[0]
+            
+            value = func(*args, **kwargs)
+            if value:  # errors come back as {} and are retried next call
+                with _stats_cache_lock:
+                    # Drop expired entries, then the least recently used past the limit
+                    for stale in [k for k, (_, expires_at) in _stats_cache.items() if expires_at <= now]:
+                        del _stats_cache[stale]
+                    _stats_cache[key] = (value, now + seconds)
+                    _stats_cache.move_to_end(key)
+                    if len(_stats_cache) > STATS_CACHE_SIZE:
+                        _stats_cache.popitem(last=False)
+            return value
+        return wrapper
+    return decorator
 
 def load_cached_stocks():
     """Load cached stocks from file with retry logic"""
@@ -109,26 +251,147 @@ except Exception as e:
 # TRAFFIC ANALYTICS
 # =====================================================
 
+class _Flusher(threading.Thread):
+    """Background thread that commits queued tracking events in batches"""
+    
+    def __init__(self, analytics):
+        super().__init__(name='traffic-flusher', daemon=True)
+        self.analytics = analytics
+        self.queue = queue.Queue(maxsize=TRAFFIC_QUEUE_SIZE)
+        self._stopped = threading.Event()
+    
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                batch = [self.queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+            
+            deadline = time.monotonic() + FLUSH_MAX_WAIT
+            while len(batch) < FLUSH_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.analytics.write_batch(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    def flush(self):
+        """Block until every queued event has been committed"""
+        self.queue.join()
+    
+    def drain_and_stop(self):
+        """Commit whatever is still queued, then stop the thread"""
+        if self.is_alive():
+            self.flush()
+        self._stopped.set()
+
+def _encode_log_entry(entry):
+    """One analytics event as a JSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry) + '\n').encode()
+
+class _AnalyticsLogWriter(threading.Thread):
+    """Background thread that appends queued analytics events to ANALYTICS_LOG"""
+    
+    def __init__(self, path=ANALYTICS_LOG):
+        super().__init__(name='analytics-log-writer', daemon=True)
+        self.path = path
+        self.queue = queue.Queue(maxsize=ANALYTICS_QUEUE_SIZE)
+    
+    def put(self, entry):
+        """Queue an event; dropped when the writer has fallen this far behind"""
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            pass
+    
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < FLUSH_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._rotate()
+                with open(self.path, 'ab') as f:
+                    f.write(b''.join(_encode_log_entry(entry) for entry in batch))
+            except Exception as e:
+                print(f"⚠️  Error writing analytics log: {e}")
+    
+    def _rotate(self):
+        """Move a full log aside to <path>.1 (replacing the previous one)"""
+        try:
+            if os.path.getsize(self.path) > ANALYTICS_LOG_MAX_BYTES:
+                os.replace(self.path, self.path + '.1')
+        except FileNotFoundError:
+            pass
+
 class TrafficAnalytics:
-    def __init__(self, db_path=TRAFFIC_DB):
+    def __init__(self, db_path=TRAFFIC_DB, rollup_path=TRAFFIC_ROLLUP_DB):
         self.db_path = db_path
+        self.rollup_path = rollup_path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()  # one writer at a time; WAL readers stay lock-free
+        self._ua_ids = {}  # committed lookup ids, only touched by the flusher
+        self._last_seen = OrderedDict()  # session_id -> time of its last visitor upsert (LRU)
+        self._last_seen_lock = threading.Lock()
+        self._referrer_ids = {}
         self.init_database()
+        
+        self.flusher = _Flusher(self)
+        self.flusher.start()
+        atexit.register(self.flusher.drain_and_stop)
+    
+    def _connect(self):
+        """Open a connection to the traffic database with WAL and the tuning PRAGMAs applied"""
+        # Autocommit mode; writes manage their own BEGIN IMMEDIATE ... COMMIT
+        conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=SQLITE_CACHED_STATEMENTS)
+        # Rollups live in their own file so raw event writes don't share its WAL
+        conn.execute('ATTACH DATABASE ? AS rollups', (self.rollup_path,))
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _conn(self):
+        """Return this thread's long-lived traffic database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
     
     def init_database(self):
         """Initialize the traffic analytics database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # Several workers can start at once: take the write lock up front so the
+                # schema and rollup backfill run exactly once (the with-block commits or
+                # rolls back this transaction)
+                cursor.execute('BEGIN IMMEDIATE')
+                
                 # Create visitors table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS visitors (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         session_id TEXT UNIQUE,
                         ip_address TEXT,
-                        user_agent TEXT,
-                        first_visit TIMESTAMP,
-                        last_visit TIMESTAMP,
+                        ua_id INTEGER,
+                        first_visit INTEGER,
+                        last_visit INTEGER,
                         visit_count INTEGER DEFAULT 1
                     )
                 ''')
@@ -139,10 +402,10 @@ class TrafficAnalytics:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         session_id TEXT,
                         page_url TEXT,
-                        timestamp TIMESTAMP,
+                        timestamp INTEGER,
                         ip_address TEXT,
-                        user_agent TEXT,
-                        referrer TEXT
+                        ua_id INTEGER,
+                        referrer_id INTEGER
                     )
                 ''')
                 
@@ -152,214 +415,372 @@ class TrafficAnalytics:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         session_id TEXT,
                         endpoint TEXT,
-                        timestamp TIMESTAMP,
+                        timestamp INTEGER,
                         ip_address TEXT,
-                        user_agent TEXT
+                        ua_id INTEGER
                     )
                 ''')
                 
-                conn.commit()
-        except Exception as e:
-            print(f"⚠️  Error initializing traffic database: {e}")
-    
-    def track_visitor(self, session_id, ip_address, user_agent):
-        """Track a visitor session"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                now = datetime.now()
+                # User agent and referrer strings repeat across a session; events store ids
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS user_agents (
+                        id INTEGER PRIMARY KEY,
+                        ua TEXT UNIQUE
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS referrers (
+                        id INTEGER PRIMARY KEY,
+                        url TEXT UNIQUE
+                    )
+                ''')
+                
+                # Timestamps are unix epoch seconds; convert rows written as local-time
+                # datetime strings by older versions (user_version 0 -> 1)
+                cursor.execute('PRAGMA user_version')
+                version = cursor.fetchone()[0]
+                if version < 1:
+                    for table, columns in (('visitors', ('first_visit', 'last_visit')),
+                                           ('page_views', ('timestamp',)),
+                                           ('api_calls', ('timestamp',))):
+                        for column in columns:
+                            cursor.execute(f'''
+                                UPDATE {table}
+                                SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                                WHERE typeof({column}) = 'text'
+                            ''')
+                
+                # Move inline user agent / referrer strings into the lookup tables (-> 2)
+                if version < 2:
+                    for table, text_column, id_column, lookup, lookup_column in (
+                        ('visitors', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                        ('page_views', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                        ('page_views', 'referrer', 'referrer_id', 'referrers', 'url'),
+                        ('api_calls', 'user_agent', 'ua_id', 'user_agents', 'ua'),
+                    ):
+                        cursor.execute(f'PRAGMA table_info({table})')
+                        columns = {row[1] for row in cursor.fetchall()}
+                        if text_column not in columns:
+                            continue
+                        if id_column not in columns:
+                            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {id_column} INTEGER')
+                        cursor.execute(f'''
+                            INSERT OR IGNORE INTO {lookup} ({lookup_column})
+                            SELECT DISTINCT {text_column} FROM {table} WHERE {text_column} IS NOT NULL
+                        ''')
+                        cursor.execute(f'''
+                            UPDATE {table}
+                            SET {id_column} = (SELECT id FROM {lookup} WHERE {lookup_column} = {text_column}),
+                                {text_column} = NULL
+                            WHERE {text_column} IS NOT NULL
+                        ''')
+                
+                # Add the event columns a table created by the admin dashboard's older schema lacks (-> 3)
+                if version < 3:
+                    for table, column, column_type in TRAFFIC_ADDED_COLUMNS:
+                        cursor.execute(f'PRAGMA table_info({table})')
+                        if column not in {row[1] for row in cursor.fetchall()}:
+                            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
                 
-                # Check if session exists
-                cursor.execute('SELECT visit_count, last_visit FROM visitors WHERE session_id = ?', (session_id,))
-                result = cursor.fetchone()
+                if version < SCHEMA_VERSION:
+                    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
                 
-                if result:
-                    # Update existing session
-                    visit_count = result[0] + 1
+                # Stats queries filter on a timestamp range, then count or group by a
+                # second column; leading with timestamp keeps them to range scans
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pv_ts_sid ON page_views(timestamp, session_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pv_ts_url ON page_views(timestamp, page_url)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pv_ts_ip ON page_views(timestamp, ip_address)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_ts_ep ON api_calls(timestamp, endpoint)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_visitors_last ON visitors(last_visit)')
+                
+                # Daily rollups kept current by the flusher, so the dashboard reads
+                # a few rows per day instead of re-aggregating every raw event.
+                # Older databases kept them in the events file; those copies are
+                # dropped and the attached rollups are rebuilt from raw events below.
+                cursor.execute('DROP TABLE IF EXISTS main.page_views_daily')
+                cursor.execute('DROP TABLE IF EXISTS main.api_calls_daily')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS rollups.page_views_daily (
+                        day TEXT,
+                        page_url TEXT,
+                        ip_address TEXT,
+                        count INTEGER DEFAULT 0,
+                        PRIMARY KEY (day, page_url, ip_address)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS rollups.api_calls_daily (
+                        day TEXT,
+                        endpoint TEXT,
+                        count INTEGER DEFAULT 0,
+                        PRIMARY KEY (day, endpoint)
+                    )
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS rollups.idx_pvd_day_cnt ON page_views_daily(day, count DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS rollups.idx_apid_day_cnt ON api_calls_daily(day, count DESC)')
+                
+                # Backfill the rollups from raw events recorded before they existed
+                cursor.execute('SELECT EXISTS (SELECT 1 FROM rollups.page_views_daily)')
+                if not cursor.fetchone()[0]:
                     cursor.execute('''
-                        UPDATE visitors 
-                        SET visit_count = ?, last_visit = ? 
-                        WHERE session_id = ?
-                    ''', (visit_count, now, session_id))
-                else:
-                    # Create new session
+                        INSERT INTO rollups.page_views_daily (day, page_url, ip_address, count)
+                        SELECT DATE(timestamp, 'unixepoch', 'localtime'), page_url, ip_address, COUNT(*)
+                        FROM page_views GROUP BY 1, 2, 3
+                    ''')
+                cursor.execute('SELECT EXISTS (SELECT 1 FROM rollups.api_calls_daily)')
+                if not cursor.fetchone()[0]:
                     cursor.execute('''
-                        INSERT INTO visitors (session_id, ip_address, user_agent, first_visit, last_visit)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (session_id, ip_address, user_agent, now, now))
+                        INSERT INTO rollups.api_calls_daily (day, endpoint, count)
+                        SELECT DATE(timestamp, 'unixepoch', 'localtime'), endpoint, COUNT(*)
+                        FROM api_calls GROUP BY 1, 2
+                    ''')
                 
                 conn.commit()
+                
+                # Refresh planner statistics (sampled) so the top-N queries pick the rollup indexes
+                conn.executescript(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}; ANALYZE;")
         except Exception as e:
-            print(f"⚠️  Error tracking visitor: {e}")
+            print(f"⚠️  Error initializing traffic database: {e}")
     
-    def track_page_view(self, session_id, page_url, ip_address, user_agent, referrer=None):
-        """Track a page view"""
+    def record_request(self, session_id, path, ip_address, user_agent, referrer=None, is_api=False):
+        """Queue a visitor hit plus its page view or API call for the background flusher"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                now = datetime.now()
-                
-                cursor.execute('''
-                    INSERT INTO page_views (session_id, page_url, timestamp, ip_address, user_agent, referrer)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (session_id, page_url, now, ip_address, user_agent, referrer))
-                
-                conn.commit()
+            kind = 'api_call' if is_api else 'page_view'
+            now = time.time()
+            
+            # Only upsert the visitor row if this session hasn't been seen recently
+            with self._last_seen_lock:
+                last_seen = self._last_seen.get(session_id, 0)
+                touch_visitor = now - last_seen >= VISITOR_TOUCH_INTERVAL
+                if touch_visitor:
+                    self._last_seen[session_id] = now
+                self._last_seen.move_to_end(session_id)
+                if len(self._last_seen) > RECENT_VISITOR_LIMIT:
+                    self._last_seen.popitem(last=False)
+            
+            self.flusher.queue.put_nowait((kind, (session_id, path, int(now), ip_address, user_agent, referrer, touch_visitor)))
+        except queue.Full:
+            print("⚠️  Traffic queue full, dropping tracking event")
         except Exception as e:
-            print(f"⚠️  Error tracking page view: {e}")
+            print(f"⚠️  Error recording request: {e}")
     
-    def track_api_call(self, session_id, endpoint, ip_address, user_agent):
-        """Track an API call"""
+    def _intern(self, cursor, table, column, values, cache, new_ids):
+        """Map strings to their lookup-table ids, inserting the ones not stored yet"""
+        ids = {None: None}
+        for value in values:
+            if value is None:
+                continue
+            value_id = cache.get(value)
+            if value_id is None:
+                cursor.execute(f'INSERT OR IGNORE INTO {table} ({column}) VALUES (?)', (value,))
+                cursor.execute(f'SELECT id FROM {table} WHERE {column} = ?', (value,))
+                value_id = new_ids[value] = cursor.fetchone()[0]
+            ids[value] = value_id
+        return ids
+    
+    def write_batch(self, batch):
+        """Commit a batch of queued tracking events in one transaction"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                now = datetime.now()
+            # One upsert per session, counting every hit it made in this batch
+            visitors = {}
+            page_views = []
+            api_calls = []
+            page_view_counts = Counter()
+            api_call_counts = Counter()
+            day_of = {}  # epoch second -> local YYYY-MM-DD, since a batch spans few seconds
+            for kind, (session_id, path, now, ip_address, user_agent, referrer, touch_visitor) in batch:
+                if touch_visitor:
+                    if session_id in visitors:
+                        visitor = visitors[session_id]
+                        visitor[4] = now
+                        visitor[5] += 1
+                    else:
+                        visitors[session_id] = [session_id, ip_address, user_agent, now, now, 1]
                 
-                cursor.execute('''
-                    INSERT INTO api_calls (session_id, endpoint, timestamp, ip_address, user_agent)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (session_id, endpoint, now, ip_address, user_agent))
-                
-                conn.commit()
+                day = day_of.get(now)
+                if day is None:
+                    day = day_of[now] = time.strftime('%Y-%m-%d', time.localtime(now))
+                if kind == 'api_call':
+                    api_calls.append((session_id, path, now, ip_address, user_agent))
+                    api_call_counts[(day, path)] += 1
+                else:
+                    page_views.append((session_id, path, now, ip_address, user_agent, referrer))
+                    page_view_counts[(day, path, ip_address)] += 1
+            
+            cursor = self._conn().cursor()
+            with self._write_lock:
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    # Ids created in this transaction only become cacheable once it commits
+                    new_ua_ids = {}
+                    new_referrer_ids = {}
+                    ua_ids = self._intern(cursor, 'user_agents', 'ua',
+                                          {row[4] for row in page_views} | {row[4] for row in api_calls},
+                                          self._ua_ids, new_ua_ids)
+                    referrer_ids = self._intern(cursor, 'referrers', 'url', {row[5] for row in page_views},
+                                                self._referrer_ids, new_referrer_ids)
+                    
+                    # executemany takes any iterable, so rows stream in without extra lists
+                    cursor.executemany(_SQL_UPSERT_VISITOR, (
+                        (session_id, ip_address, ua_ids[user_agent], first_visit, last_visit, count)
+                        for session_id, ip_address, user_agent, first_visit, last_visit, count in visitors.values()))
+                    if page_views:
+                        cursor.executemany(_SQL_INSERT_PV, (
+                            (session_id, path, now, ip_address, ua_ids[user_agent], referrer_ids[referrer])
+                            for session_id, path, now, ip_address, user_agent, referrer in page_views))
+                        cursor.executemany(_SQL_UPSERT_PV_DAILY, (key + (count,) for key, count in page_view_counts.items()))
+                    if api_calls:
+                        cursor.executemany(_SQL_INSERT_API, (
+                            (session_id, path, now, ip_address, ua_ids[user_agent])
+                            for session_id, path, now, ip_address, user_agent in api_calls))
+                        cursor.executemany(_SQL_UPSERT_API_DAILY, (key + (count,) for key, count in api_call_counts.items()))
+                    
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+            
+            for cache, new_ids in ((self._ua_ids, new_ua_ids), (self._referrer_ids, new_referrer_ids)):
+                if len(cache) + len(new_ids) > INTERN_CACHE_SIZE:
+                    cache.clear()
+                cache.update(new_ids)
         except Exception as e:
-            print(f"⚠️  Error tracking API call: {e}")
+            print(f"⚠️  Error writing {len(batch)} tracking events: {e}")
     
-    def get_traffic_stats(self, days=1):
-        """Get traffic statistics for the specified number of days"""
+    def iter_daily_page_views(self, days=1):
+        """Yield (day, page views) for the chart, oldest day first, without materializing the range"""
+        cutoff_day = time.strftime('%Y-%m-%d', time.localtime(int(time.time()) - days * 86400))
+        cursor = self._conn().execute('''
+            SELECT day, SUM(count) 
+            FROM rollups.page_views_daily 
+            WHERE day >= ?
+            GROUP BY day
+            ORDER BY day
+        ''', (cutoff_day,))
+        while True:
+            rows = cursor.fetchmany(DAILY_PAGE_VIEWS_BATCH)
+            if not rows:
+                return
+            yield from rows
+    
+    @ttl_cache(seconds=30)
+    def get_traffic_summary(self, days=1):
+        """Get the traffic totals and top-N breakdowns (everything but the daily series)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cutoff_date = datetime.now() - timedelta(days=days)
-                
-                # Get page views today
-                cursor.execute('''
-                    SELECT COUNT(*) FROM page_views 
-                    WHERE timestamp >= ?
-                ''', (cutoff_date,))
-                page_views_today = cursor.fetchone()[0]
-                
-                # Get API calls today
-                cursor.execute('''
-                    SELECT COUNT(*) FROM api_calls 
-                    WHERE timestamp >= ?
-                ''', (cutoff_date,))
-                api_calls_today = cursor.fetchone()[0]
-                
-                # Get unique visitors today
-                cursor.execute('''
-                    SELECT COUNT(DISTINCT session_id) FROM page_views 
-                    WHERE timestamp >= ?
-                ''', (cutoff_date,))
-                unique_visitors_today = cursor.fetchone()[0]
-                
-                # Get average visits per visitor
-                cursor.execute('''
-                    SELECT AVG(visit_count) FROM visitors 
-                    WHERE last_visit >= ?
-                ''', (cutoff_date,))
-                avg_visits = cursor.fetchone()[0] or 0
-                
-                # Get daily page views for chart
-                cursor.execute('''
-                    SELECT DATE(timestamp), COUNT(*) 
-                    FROM page_views 
-                    WHERE timestamp >= ?
-                    GROUP BY DATE(timestamp)
-                    ORDER BY DATE(timestamp)
-                ''', (cutoff_date,))
-                daily_page_views = dict(cursor.fetchall())
-                
-                # Get top pages
-                cursor.execute('''
-                    SELECT page_url, COUNT(*) 
-                    FROM page_views 
-                    WHERE timestamp >= ?
-                    GROUP BY page_url 
-                    ORDER BY COUNT(*) DESC 
-                    LIMIT 10
-                ''', (cutoff_date,))
-                top_pages = cursor.fetchall()
-                
-                # Get top IPs
-                cursor.execute('''
-                    SELECT ip_address, COUNT(*) 
-                    FROM page_views 
-                    WHERE timestamp >= ?
-                    GROUP BY ip_address 
-                    ORDER BY COUNT(*) DESC 
-                    LIMIT 10
-                ''', (cutoff_date,))
-                top_ips = cursor.fetchall()
-                
-                # Get top API endpoints
-                cursor.execute('''
-                    SELECT endpoint, COUNT(*) 
-                    FROM api_calls 
-                    WHERE timestamp >= ?
-                    GROUP BY endpoint 
-                    ORDER BY COUNT(*) DESC 
-                    LIMIT 10
-                ''', (cutoff_date,))
-                top_endpoints = cursor.fetchall()
-                
-                return {
-                    'page_views_today': page_views_today,
-                    'api_calls_today': api_calls_today,
-                    'unique_visitors_today': unique_visitors_today,
-                    'avg_visits': round(avg_visits, 1),
-                    'daily_page_views': daily_page_views,
-                    'top_pages': top_pages,
-                    'top_ips': top_ips,
-                    'top_endpoints': top_endpoints
-                }
+            conn = self._conn()
+            cursor = conn.cursor()
+            cutoff_date = int(time.time()) - days * 86400
+            
+            # Get page views today
+            cursor.execute('''
+                SELECT COUNT(*) FROM page_views 
+                WHERE timestamp >= ?
+            ''', (cutoff_date,))
+            page_views_today = cursor.fetchone()[0]
+            
+            # Get API calls today
+            cursor.execute('''
+                SELECT COUNT(*) FROM api_calls 
+                WHERE timestamp >= ?
+            ''', (cutoff_date,))
+            api_calls_today = cursor.fetchone()[0]
+            
+            # Get unique visitors today
+            cursor.execute('''
+                SELECT COUNT(DISTINCT session_id) FROM page_views 
+                WHERE timestamp >= ?
+            ''', (cutoff_date,))
+            unique_visitors_today = cursor.fetchone()[0]
+            
+            # Get average visits per visitor
+            cursor.execute('''
+                SELECT AVG(visit_count) FROM visitors 
+                WHERE last_visit >= ?
+            ''', (cutoff_date,))
+            avg_visits = cursor.fetchone()[0] or 0
+            
+            # Daily and top-N breakdowns come from the rollups, whole days from the cutoff's day on
+            cutoff_day = time.strftime('%Y-%m-%d', time.localtime(cutoff_date))
+            
+            # Get top pages
+            cursor.execute('''
+                SELECT page_url, SUM(count) 
+                FROM rollups.page_views_daily 
+                WHERE day >= ?
+                GROUP BY page_url 
+                ORDER BY 2 DESC 
+                LIMIT 10
+            ''', (cutoff_day,))
+            top_pages = cursor.fetchall()
+            
+            # Get top IPs
+            cursor.execute('''
+                SELECT ip_address, SUM(count) 
+                FROM rollups.page_views_daily 
+                WHERE day >= ?
+                GROUP BY ip_address 
+                ORDER BY 2 DESC 
+                LIMIT 10
+            ''', (cutoff_day,))
+            top_ips = cursor.fetchall()
+            
+            # Get top API endpoints
+            cursor.execute('''
+                SELECT endpoint, SUM(count) 
+                FROM rollups.api_calls_daily 
+                WHERE day >= ?
+                GROUP BY endpoint 
+                ORDER BY 2 DESC 
+                LIMIT 10
+            ''', (cutoff_day,))
+            top_endpoints = cursor.fetchall()
+            
+            return {
+                'page_views_today': page_views_today,
+                'api_calls_today': api_calls_today,
+                'unique_visitors_today': unique_visitors_today,
+                'avg_visits': round(avg_visits, 1),
+                'top_pages': top_pages,
+                'top_ips': top_ips,
+                'top_endpoints': top_endpoints
+            }
         except Exception as e:
             print(f"⚠️  Error getting traffic stats: {e}")
             return {}
     
+    @ttl_cache(seconds=5)
     def get_real_time_stats(self):
         """Get real-time traffic statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                now = datetime.now()
-                
-                # Online users (last 5 minutes)
-                online_cutoff = now - timedelta(minutes=5)
-                cursor.execute('''
-                    SELECT COUNT(DISTINCT session_id) FROM page_views 
-                    WHERE timestamp >= ?
-                ''', (online_cutoff,))
-                online_users = cursor.fetchone()[0]
-                
-                # Active sessions (last 30 minutes)
-                active_cutoff = now - timedelta(minutes=30)
-                cursor.execute('''
-                    SELECT COUNT(DISTINCT session_id) FROM page_views 
-                    WHERE timestamp >= ?
-                ''', (active_cutoff,))
-                active_sessions = cursor.fetchone()[0]
-                
-                # Page views in last hour
-                hour_cutoff = now - timedelta(hours=1)
-                cursor.execute('''
-                    SELECT COUNT(*) FROM page_views 
-                    WHERE timestamp >= ?
-                ''', (hour_cutoff,))
-                page_views_hour = cursor.fetchone()[0]
-                
-                # API calls in last hour
-                cursor.execute('''
-                    SELECT COUNT(*) FROM api_calls 
-                    WHERE timestamp >= ?
-                ''', (hour_cutoff,))
-                api_calls_hour = cursor.fetchone()[0]
-                
-                return {
-                    'online_users': online_users,
-                    'active_sessions': active_sessions,
-                    'page_views_hour': page_views_hour,
-                    'api_calls_hour': api_calls_hour
-                }
+            conn = self._conn()
+            cursor = conn.cursor()
+            now = int(time.time())
+            hour_cutoff = now - 3600
+            
+            # Online users (last 5 minutes), active sessions (last 30 minutes) and page
+            # views in the last hour from one scan of the last hour's page views, plus
+            # the hour's API calls, in a single round-trip
+            cursor.execute('''
+                SELECT
+                    COUNT(DISTINCT CASE WHEN timestamp >= :online THEN session_id END),
+                    COUNT(DISTINCT CASE WHEN timestamp >= :active THEN session_id END),
+                    COUNT(*),
+                    (SELECT COUNT(*) FROM api_calls WHERE timestamp >= :hour)
+                FROM page_views
+                WHERE timestamp >= :hour
+            ''', {
+                'online': now - 5 * 60,
+                'active': now - 30 * 60,
+                'hour': hour_cutoff
+            })
+            online_users, active_sessions, page_views_hour, api_calls_hour = cursor.fetchone()
+            
+            return {
+                'online_users': online_users,
+                'active_sessions': active_sessions,
+                'page_views_hour': page_views_hour,
+                'api_calls_hour': api_calls_hour
+            }
         except Exception as e:
             print(f"⚠️  Error getting real-time stats: {e}")
             return {}
@@ -371,52 +792,79 @@ class TrafficAnalytics:
 # Initialize traffic analytics
 traffic_analytics = TrafficAnalytics()
 
+analytics_log = _AnalyticsLogWriter()
+analytics_log.start()
+
 # =====================================================
 # REQUEST TRACKING MIDDLEWARE
 # =====================================================
 
-@app.before_request
-def track_request():
-    """Track all incoming requests for analytics"""
-    try:
-        # Skip tracking for static files and admin dashboard
-        if request.path.startswith('/static/') or request.path.startswith('/admin/'):
-            return
+class AnalyticsMiddleware:
+    """WSGI middleware that queues each tracked request and sets the session cookie"""
+    
+    def __init__(self, wsgi_app, analytics):
+        self.wsgi_app = wsgi_app
+        self.analytics = analytics
+    
+    def __call__(self, environ, start_response):
+        session_id = None
+        try:
+            session_id = self.track(environ)
+        except Exception as e:
+            print(f"⚠️  Error tracking request: {e}")
         
-        # Get or create session ID
-        session_id = request.cookies.get('session_id')
-        if not session_id:
-            session_id = traffic_analytics.generate_session_id()
+        if session_id is None:
+            return self.wsgi_app(environ, start_response)
         
-        # Get request details
-        ip_address = request.remote_addr
-        user_agent = request.headers.get('User-Agent', '')
-        referrer = request.headers.get('Referer')
+        # First visit: hand the new session ID back with the response
+        cookie = dump_cookie('session_id', session_id, max_age=SESSION_COOKIE_MAX_AGE)
         
-        # Track visitor
-        traffic_analytics.track_visitor(session_id, ip_address, user_agent)
+        def start_response_with_cookie(status, headers, exc_info=None):
+            headers.append(('Set-Cookie', cookie))
+            return start_response(status, headers, exc_info)
         
-        # Track page view or API call
-        if request.path.startswith('/api/'):
-            traffic_analytics.track_api_call(session_id, request.path, ip_address, user_agent)
-        else:
-            traffic_analytics.track_page_view(session_id, request.path, ip_address, user_agent, referrer)
+        return self.wsgi_app(environ, start_response_with_cookie)
+    
+    def track(self, environ):
+        """Record the request; returns a newly issued session ID, if any"""
+        # Skip tracking for static files, admin dashboard, probes and bots
+        path = environ.get('PATH_INFO') or '/'
+        if _SKIP_RE.match(path):
+            return None
+        user_agent = environ.get('HTTP_USER_AGENT', '')
+        if BOT_USER_AGENT_RE.search(user_agent):
+            return None
         
-        # Store session ID in request context for later use
-        request.session_id = session_id
-            
-    except Exception as e:
-        print(f"⚠️  Error tracking request: {e}")
+        # Get or create session ID
+        match = SESSION_COOKIE_RE.search(environ.get('HTTP_COOKIE', ''))
+        session_id = match.group(1) if match else None
+        new_session_id = None
+        if not session_id:
+            session_id = new_session_id = self.analytics.generate_session_id()
+        
+        # Track visitor plus the page view or API call in one queued write
+        self.analytics.record_request(session_id, path, environ.get('REMOTE_ADDR'), user_agent,
+                                      environ.get('HTTP_REFERER'), is_api=path.startswith('/api/'))
+        return new_session_id
 
-@app.after_request
-def add_session_cookie(response):
-    """Add session cookie after response is generated"""
-    try:
-        if hasattr(request, 'session_id') and not request.cookies.get('session_id'):
-            response.set_cookie('session_id', request.session_id, max_age=86400)  # 24 hours
-    except Exception as e:
-        print(f"⚠️  Error adding session cookie: {e}")
-    return response
+class HealthShortcut:
+    """WSGI middleware answering GET /health from prebuilt bytes, ahead of Flask's dispatch"""
+    
+    def __init__(self, wsgi_app, health_body):
+        self.wsgi_app = wsgi_app
+        self.health_body = health_body
+    
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') != '/health' or environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+            return self.wsgi_app(environ, start_response)
+        try:
+            body = self.health_body()
+        except Exception:
+            return self.wsgi_app(environ, start_response)  # let the view report it
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+        return [body] if environ['REQUEST_METHOD'] == 'GET' else []
+
+app.wsgi_app = AnalyticsMiddleware(app.wsgi_app, traffic_analytics)
 
 # =====================================================
 # BACKGROUND SCANNER MANAGEMENT
@@ -443,25 +891,110 @@ def is_scanner_running():
             return False
     return False
 
+@ttl_cache(seconds=0.5)
+def scanner_snapshot():
+    """Scanner status payload, shared by status polls within half a second"""
+    # Check both managed process and PID file
+    managed_running = bool(background_scanner_process) and background_scanner_process.poll() is None
+    pid_file_running = is_scanner_running()
+    return {
+        'running': managed_running or pid_file_running,
+        'managed_process': managed_running,
+        'pid_file_detected': pid_file_running,
+        'pid': background_scanner_process.pid if managed_running else None
+    }
+
+def terminate_pid(pid, timeout=SCANNER_STOP_TIMEOUT):
+    """Send SIGTERM to a process and wait for it to exit, escalating to SIGKILL"""
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        return False  # already gone
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.waitpid(pid, os.WNOHANG)  # reap it if it is our child
+        except ChildProcessError:
+            pass
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return True
+        time.sleep(0.1)
+    
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    return True
+
+def process_cmdline(pid):
+    """A process's command line arguments, empty if it is gone or unreadable"""
+    try:
+        if PSUTIL_AVAILABLE:
+            return psutil.Process(pid).cmdline()
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().decode(errors="replace").split("\0")
+    except Exception:
+        return []
+
+def is_scanner_pid(pid):
+    """Whether pid is a background scanner (and not this process), so a reused PID is left alone"""
+    return pid != os.getpid() and any(arg.endswith(SCANNER_SCRIPT) for arg in process_cmdline(pid))
+
+def find_scanner_pids():
+    """Find running background scanner processes (used when there is no usable PID file)"""
+    if not PSUTIL_AVAILABLE:
+        try:
+            return [pid for pid in map(int, filter(str.isdigit, os.listdir('/proc'))) if is_scanner_pid(pid)]
+        except OSError:
+            return []
+    
+    pids = []
+    for proc in psutil.process_iter(['pid', 'cmdline']):
+        cmdline = proc.info['cmdline'] or []
+        if proc.info['pid'] != os.getpid() and any(arg.endswith(SCANNER_SCRIPT) for arg in cmdline):
+            pids.append(proc.info['pid'])
+    return pids
+
+def kill_scanner_processes():
+    """Stop the scanner named in the PID file, or any scanner found running, and remove the PID file"""
+    pids = []
+    if os.path.exists(SCANNER_PID_FILE):
+        try:
+            with open(SCANNER_PID_FILE, 'r') as f:
+                pid = int(f.read().strip())
+            if is_scanner_pid(pid):
+                pids = [pid]
+        except (ValueError, IOError):
+            pass
+        os.remove(SCANNER_PID_FILE)
+        print("🧹 Removed stale PID file")
+    
+    # A missing or stale PID file (dead, reused or our own PID) is never signalled
+    if not pids:
+        pids = find_scanner_pids()
+    
+    return sum(1 for pid in pids if terminate_pid(pid))
+
 def cleanup_stale_scanners():
     """Kill any existing background scanner processes"""
     try:
-        # Kill any existing background scanner processes
-        result = subprocess.run(['pkill', '-f', 'background_scanner_fast.py'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
+        if kill_scanner_processes():
             print("🧹 Cleaned up existing background scanner processes")
-        
-        # Remove stale PID file if it exists
-        if os.path.exists(SCANNER_PID_FILE):
-            os.remove(SCANNER_PID_FILE)
-            print("🧹 Removed stale PID file")
-            
     except Exception as e:
         print(f"⚠️  Warning: Could not cleanup stale scanners: {e}")
 
+# Serializes launches from the startup warmup thread and first-request retries
+_scanner_start_lock = threading.Lock()
+
 def start_background_scanner():
     """Start the background scanner process with singleton protection"""
+    with _scanner_start_lock:
+        return _start_background_scanner()
+
+def _start_background_scanner():
     global background_scanner_process
     
     try:
@@ -481,7 +1014,7 @@ def start_background_scanner():
         
         # Start the FAST background scanner process
         background_scanner_process = subprocess.Popen(
-            [sys.executable, 'background_scanner_fast.py'],
+            [sys.executable, SCANNER_SCRIPT],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
@@ -520,23 +1053,17 @@ def stop_background_scanner():
             print("⚠️  Force killed background scanner")
         background_scanner_process = None
     
-    # Also kill any other background scanner processes
+    # Also stop any other background scanner process
     try:
-        result = subprocess.run(['pkill', '-f', 'background_scanner_fast.py'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
+        if kill_scanner_processes():
             print("🧹 Killed additional background scanner processes")
     except Exception as e:
         print(f"⚠️  Warning: Could not kill additional processes: {e}")
-    
-    # Clean up PID file
-    if os.path.exists(SCANNER_PID_FILE):
-        os.remove(SCANNER_PID_FILE)
-        print("🧹 Removed PID file")
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
     print("\n🛑 Shutting down...")
+    traffic_analytics.flusher.drain_and_stop()
     stop_background_scanner()
     sys.exit(0)
 
@@ -548,50 +1075,54 @@ signal.signal(signal.SIGTERM, signal_handler)
 # INPUT VALIDATION & ERROR HANDLING
 # =====================================================
 
-def validate_numeric_input(value, param_name, min_val=None, max_val=None, default=None):
-    """Validate and convert numeric input with proper error handling"""
-    if not value or value.strip() == '':
-        return default
-    
-    try:
-        numeric_value = float(value)
-        
-        if min_val is not None and numeric_value < min_val:
-            raise ValueError(f"{param_name} must be >= {min_val}")
-        
-        if max_val is not None and numeric_value > max_val:
-            raise ValueError(f"{param_name} must be <= {max_val}")
-            
-        return numeric_value
-        
-    except ValueError as e:
-        if "could not convert" in str(e):
-            raise ValueError(f"{param_name} must be a valid number")
-        raise e
+# (param, raw default, label, min, max, default) for every numeric screener filter
+FILTER_SCHEMA = (
+    ('min_price', '0.01', 'Min Price', 0.01, 10000, 0.01),
+    ('max_price', '1000', 'Max Price', 0.01, 100000, 1000),
+    ('min_gap_pct', '-100', 'Min Gap %', -1000, 1000, -100),
+    ('min_rel_vol', '0', 'Min Relative Volume', 0, 1000, 0),
+    ('max_float', '', 'Max Float', 0, 1e12, None),
+    ('min_market_cap', '', 'Min Market Cap', 0, 1e15, None),
+    ('max_market_cap', '', 'Max Market Cap', 0, 1e15, None),
+    ('min_pe_ratio', '', 'Min P/E Ratio', -1000, 1000, None),
+    ('max_pe_ratio', '', 'Max P/E Ratio', -1000, 1000, None),
+    ('min_premarket_volume', '', 'Min Premarket Volume', 0, 1e12, None),
+)
+
+# Legacy pre/post-market bounds: not validated, ignored when blank or not a number
+LEGACY_FILTER_PARAMS = (
+    'min_pre_market', 'max_pre_market', 'min_post_market', 'max_post_market',
+    'min_pre_market_change', 'max_pre_market_change', 'min_post_market_change', 'max_post_market_change',
+)
+
+VALID_SECTORS = frozenset(['All', 'Technology', 'Healthcare', 'Financial', 'Energy', 'Consumer', 'Industrial', 'Materials', 'Utilities', 'Real Estate', 'Communication'])
 
 def validate_filters(request_args):
     """Validate all filter parameters and return sanitized values"""
     try:
-        filters = {
-            'min_price': validate_numeric_input(request_args.get('min_price', '0.01'), 'Min Price', 0.01, 10000, 0.01),
-            'max_price': validate_numeric_input(request_args.get('max_price', '1000'), 'Max Price', 0.01, 100000, 1000),
-            'min_gap_pct': validate_numeric_input(request_args.get('min_gap_pct', '-100'), 'Min Gap %', -1000, 1000, -100),
-            'min_rel_vol': validate_numeric_input(request_args.get('min_rel_vol', '0'), 'Min Relative Volume', 0, 1000, 0),
-            'max_float': validate_numeric_input(request_args.get('max_float', ''), 'Max Float', 0, 1e12),
-            'min_market_cap': validate_numeric_input(request_args.get('min_market_cap', ''), 'Min Market Cap', 0, 1e15),
-            'max_market_cap': validate_numeric_input(request_args.get('max_market_cap', ''), 'Max Market Cap', 0, 1e15),
-            'min_pe_ratio': validate_numeric_input(request_args.get('min_pe_ratio', ''), 'Min P/E Ratio', -1000, 1000),
-            'max_pe_ratio': validate_numeric_input(request_args.get('max_pe_ratio', ''), 'Max P/E Ratio', -1000, 1000),
-            'min_premarket_volume': validate_numeric_input(request_args.get('min_premarket_volume', ''), 'Min Premarket Volume', 0, 1e12),
-        }
+        _float = float
+        get = request_args.get
+        filters = {}
+        for name, raw_default, label, min_val, max_val, default in FILTER_SCHEMA:
+            value = get(name, raw_default)
+            if not value or value.isspace():
+                filters[name] = default
+                continue
+            
+            try:
+                numeric_value = _float(value)
+            except ValueError:
+                raise ValueError(f"{label} must be a valid number")
+            
+            if numeric_value < min_val:
+                raise ValueError(f"{label} must be >= {min_val}")
+            if numeric_value > max_val:
+                raise ValueError(f"{label} must be <= {max_val}")
+            filters[name] = numeric_value
         
         # Validate sector filter
-        valid_sectors = ['All', 'Technology', 'Healthcare', 'Financial', 'Energy', 'Consumer', 'Industrial', 'Materials', 'Utilities', 'Real Estate', 'Communication']
-        sector = request_args.get('sector_filter', 'All')
-        if sector not in valid_sectors:
-            filters['sector_filter'] = 'All'
-        else:
-            filters['sector_filter'] = sector
+        sector = get('sector_filter', 'All')
+        filters['sector_filter'] = sector if sector in VALID_SECTORS else 'All'
             
         # Logical validation
         if filters['min_price'] > filters['max_price']:
@@ -605,27 +1136,82 @@ def validate_filters(request_args):
     except ValueError as e:
         return None, str(e)
 
+def parse_legacy_filters(request_args):
+    """Parse the legacy filter parameters once, as floats (None when unset or invalid)"""
+    get = request_args.get
+    return {name: get(name, type=float) for name in LEGACY_FILTER_PARAMS}
+
+def _orjson_default(obj):
+    """Encode the odd types orjson doesn't handle natively the way jsonify would"""
+    if isinstance(obj, tuple):
+        return list(obj)
+    return str(obj)
+
+def ojsonify(obj):
+    """jsonify replacement for the JSON routes, encoded with orjson when available"""
+    if not ORJSON_AVAILABLE:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, default=_orjson_default,
+                                 option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json')
+
+def json_bytes(obj):
+    """Encode obj as compact JSON bytes the way ojsonify would"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_orjson_default, separators=(',', ':')).encode()
+
+# Prebuilt JSON bodies of the monitoring endpoints, keyed by the state they reflect
+JSON_BODY_CACHE_SIZE = 16
+_json_body_cache = OrderedDict()
+_json_body_cache_lock = threading.Lock()
+
+def cached_json_response(key, build):
+    """Serve the JSON body built by build() for this state key, serializing once per key"""
+    return Response(cached_json_body(key, build), mimetype='application/json')
+
+def cached_json_body(key, build):
+    """The JSON bytes of build() for this state key, serialized on the first request only"""
+    with _json_body_cache_lock:
+        body = _json_body_cache.get(key)
+        if body is not None:
+            _json_body_cache.move_to_end(key)
+    if body is None:
+        body = json_bytes(build())
+        with _json_body_cache_lock:
+            _json_body_cache[key] = body
+            if len(_json_body_cache) > JSON_BODY_CACHE_SIZE:
+                _json_body_cache.popitem(last=False)
+    return body
+
+# Read-only template context shared by every error render of the screener page
+_EMPTY_CACHE_INFO = MappingProxyType({'successful_count': 0, 'total_count': 0, 'last_update': 'Never', 'is_fresh': False})
+_DEFAULT_FILTERS = MappingProxyType({
+    'min_price': 1.0, 'max_price': 100.0, 'min_gap_pct': 0.0, 'min_rel_vol': 0.0, 'max_float': '', 'sector_filter': 'All'
+})
+_VALIDATION_ERROR_FILTERS = MappingProxyType(dict(_DEFAULT_FILTERS, max_price=2000.0))  # room for higher-priced stocks
+_BAD_REQUEST_STATUS = MappingProxyType({'status': 'Error', 'message': 'Bad request', 'age_minutes': 0, 'is_fresh': False})
+_SERVER_ERROR_STATUS = MappingProxyType({'status': 'Error', 'message': 'Server error', 'age_minutes': 0, 'is_fresh': False})
+
+# The screener template call with every constant kwarg of an error render bound up front
+_render_empty_screener = partial(render_template, 'screener.html', stocks=(), cache_info=_EMPTY_CACHE_INFO)
+
+def render_screener_error(error, filters=_DEFAULT_FILTERS, cache_status=None):
+    """Render the screener page with no stocks and an error message"""
+    return _render_empty_screener(error=error,
+                                  market_info=get_default_market_info(),
+                                  cache_status=get_cache_status() if cache_status is None else cache_status,
+                                  filters=filters)
+
 @app.errorhandler(400)
 def bad_request(error):
     """Handle bad request errors"""
-    return render_template('screener.html',
-                          stocks=[], 
-                          error="Bad request: Invalid parameters provided",
-                          market_info=get_default_market_info(),
-                          cache_info={'successful_count': 0, 'total_count': 0, 'last_update': 'Never', 'is_fresh': False},
-                          cache_status={'status': 'Error', 'message': 'Bad request', 'age_minutes': 0, 'is_fresh': False},
-                          filters={'min_price': 1.0, 'max_price': 100.0, 'min_gap_pct': 0.0, 'min_rel_vol': 0.0, 'max_float': '', 'sector_filter': 'All'}), 400
+    return render_screener_error("Bad request: Invalid parameters provided", cache_status=_BAD_REQUEST_STATUS), 400
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle internal server errors"""
-    return render_template('screener.html',
-                          stocks=[], 
-                          error="Internal server error: Please try again later",
-                          market_info=get_default_market_info(),
-                          cache_info={'successful_count': 0, 'total_count': 0, 'last_update': 'Never', 'is_fresh': False},
-                          cache_status={'status': 'Error', 'message': 'Server error', 'age_minutes': 0, 'is_fresh': False},
-                          filters={'min_price': 1.0, 'max_price': 100.0, 'min_gap_pct': 0.0, 'min_rel_vol': 0.0, 'max_float': '', 'sector_filter': 'All'}), 500
+    return render_screener_error("Internal server error: Please try again later", cache_status=_SERVER_ERROR_STATUS), 500
 
 # =====================================================
 # UTILITY FUNCTIONS
@@ -638,6 +1224,13 @@ def safe_float(value, default):
     except (TypeError, ValueError):
         return default
 
+# Display magnitudes, picked with bisect_right (a value equal to a threshold takes its suffix)
+_VOLUME_SCALES = (1_000, 1_000_000, 1_000_000_000)
+_VOLUME_SUFFIXES = ('K', 'M', 'B')
+_TIME_AGO_SCALES = (60, 3600)
+_TIME_AGO_UNITS = ((1, 's'), (60, 'm'), (3600, 'h'))
+
+@lru_cache(maxsize=4096)
 def format_volume(volume):
     """Format volume numbers to human-readable format (K, M, B)"""
     try:
@@ -645,336 +1238,588 @@ def format_volume(volume):
             return "0"
         
         volume = float(volume)
-        
-        if volume >= 1_000_000_000:
-            return f"{volume / 1_000_000_000:.1f}B"
-        elif volume >= 1_000_000:
-            return f"{volume / 1_000_000:.1f}M"
-        elif volume >= 1_000:
-            return f"{volume / 1_000:.1f}K"
-        else:
+        i = bisect_right(_VOLUME_SCALES, volume)
+        if not i:
             return f"{int(volume)}"
+        return f"{volume / _VOLUME_SCALES[i - 1]:.1f}{_VOLUME_SUFFIXES[i - 1]}"
     except (ValueError, TypeError):
         return "—"
 
 def format_time_ago(seconds):
     """Format seconds into human-readable time ago string"""
-    if seconds < 60:
-        return f"{int(seconds)}s ago"
-    elif seconds < 3600:
-        minutes = int(seconds / 60)
-        return f"{minutes}m ago"
-    else:
-        hours = int(seconds / 3600)
-        return f"{hours}h ago"
+    divisor, unit = _TIME_AGO_UNITS[bisect_right(_TIME_AGO_SCALES, seconds)]
+    return f"{int(seconds) // divisor}{unit} ago"
+
+@lru_cache(maxsize=16)
+def _iso_timestamp(value):
+    """Epoch seconds of an ISO-8601 string; cached since a cache keeps its stamp for minutes"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+def cache_timestamp(last_update, now):
+    """The cache's last_update (epoch seconds or ISO string) as epoch seconds, `now` if unparseable"""
+    if isinstance(last_update, str):
+        try:
+            return _iso_timestamp(last_update)
+        except ValueError:
+            return now
+    return last_update
+
+_iso_now_stamp = (0, '')
+
+def iso_now():
+    """datetime.now().isoformat() truncated to the second, formatted once per second"""
+    global _iso_now_stamp
+    second = int(time.time())
+    stamp = _iso_now_stamp
+    if stamp[0] != second:
+        stamp = _iso_now_stamp = (second, datetime.fromtimestamp(second).isoformat())
+    return stamp[1]
+
+_DEFAULT_MARKET_INFO = MappingProxyType({
+    'session': 'UNKNOWN',
+    'current_time_et': 'Unknown',
+    'market_open': '9:30 ET',
+    'market_close': '16:00 ET',
+    'is_trading_day': True
+})
 
 def get_default_market_info():
-    """Get default market info when no cache is available"""
-    return {
-        'session': 'UNKNOWN',
-        'current_time_et': 'Unknown',
-        'market_open': '9:30 ET',
-        'market_close': '16:00 ET',
-        'is_trading_day': True
-    }
+    """Get default market info when no cache is available (shared, read-only)"""
+    return _DEFAULT_MARKET_INFO
 
 def get_unique_sectors(stocks_data):
-    """Get list of unique sectors from stocks data"""
-    sectors = set()
-    for stock_data in stocks_data.values():
+    """Get list of unique sectors from stocks data (or its StockColumns)"""
+    if isinstance(stocks_data, StockColumns):
+        return list(stocks_data.sectors)
+    return _sorted_sectors({stock_data.get('category', 'Other') for _, stock_data in iter_stock_items(stocks_data)})
+
+def _sorted_sectors(categories):
+    """Sorted sector names for the filter dropdown, without blank/placeholder categories"""
+    return sorted(category for category in categories if category and category != '—')
+
+def iter_stock_items(stocks_data):
+    """Yield (symbol, stock_data) pairs from either cache layout (dict or list)"""
+    if isinstance(stocks_data, dict):
+        return stocks_data.items()
+    return ((stock_data.get('symbol', ''), stock_data) for stock_data in stocks_data)
+
+# Cached fields with optional min/max filters, in StockColumns.bounded row order.
+# A 0 (unknown) value passes these filters.
+BOUNDED_FIELDS = (
+    'pre_market_price',
+    'post_market_price',
+    'market_cap',
+    'pe_ratio',
+    'pre_market_change_pct',
+    'post_market_change_pct',
+    'volume',
+    'float_shares_raw',
+)
+
+def _column(rows, field):
+    """Float array of one cached field: missing/None reads as 0, non-numeric as NaN"""
+    values = np.zeros(len(rows))
+    for i, stock_data in enumerate(rows):
+        value = stock_data.get(field)
+        if value is None:
+            continue
+        values[i] = value if isinstance(value, (int, float)) else np.nan
+    return values
+
+@dataclass(frozen=True, slots=True)
+class StockRow:
+    """One formatted screener table row; immutable so filter results can share it"""
+    symbol: str
+    price: float
+    price_display: str
+    pre_market_price: float
+    pre_market_price_display: str
+    post_market_price: float
+    post_market_price_display: str
+    pre_market_change_pct: float | None
+    post_market_change_pct: float | None
+    market_state: str
+    pct_change: float
+    pct_change_display: str
+    gap_pct: float
+    gap_pct_display: str
+    rel_vol: float
+    rel_vol_display: str
+    volume: str
+    float: str
+    market_cap: str
+    pe_ratio: str
+    category: str
+    gap_classification: str
+    
+    def get(self, field, default=None):
+        """dict-style access, for code that also handles raw cache entries"""
+        return getattr(self, field, default)
+
+def _display_row(symbol, stock_data):
+    """Screener table row for one cached stock, or None if it cannot be formatted"""
+    try:
+        current = stock_data.get('price', 0)
+        pre_market_price = stock_data.get('pre_market_price', 0)
+        post_market_price = stock_data.get('post_market_price', 0)
+        rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
+        gap_pct = stock_data.get('gap_pct', 0)
         category = stock_data.get('category', 'Other')
-        if category and category != '—':
-            sectors.add(category)
-    return sorted(list(sectors))
+        market_state = stock_data.get('market_state', 'UNKNOWN')
+        pre_market_change_pct = stock_data.get('pre_market_change_pct')
+        post_market_change_pct = stock_data.get('post_market_change_pct')
+        
+        # Format the data for display
+        return StockRow(
+            symbol=symbol,
+            price=float(current),
+            price_display=f"${current:.2f}",
+            pre_market_price=float(pre_market_price) if pre_market_price else 0,
+            pre_market_price_display=f"${pre_market_price:.2f}" if pre_market_price else '—',
+            post_market_price=float(post_market_price) if post_market_price else 0,
+            post_market_price_display=f"${post_market_price:.2f}" if post_market_price else '—',
+            pre_market_change_pct=float(pre_market_change_pct) if pre_market_change_pct else None,
+            post_market_change_pct=float(post_market_change_pct) if post_market_change_pct else None,
+            market_state=market_state,
+            pct_change=float(stock_data.get('pct_change', 0)),
+            pct_change_display=f"{float(stock_data.get('pct_change', 0)):.2f}%",
+            gap_pct=float(gap_pct),
+            gap_pct_display=f"{gap_pct:.2f}%",
+            rel_vol=float(rel_vol),
+            rel_vol_display=f"{rel_vol:.2f}x",
+            volume=format_volume(stock_data.get('volume', 0)),
+            float=stock_data.get('float', '—'),
+            market_cap=stock_data.get('market_cap_display', '—'),
+            pe_ratio=stock_data.get('pe_display', '—'),
+            category=category,
+            gap_classification=stock_data.get('gap_classification', '📊 REGULAR')
+        )
+        
+    except Exception as e:
+        logger.debug("Error processing %s: %s", symbol, e)
+        return None
+
+@dataclass(slots=True)
+class StockColumns:
+    """Column arrays over the cached stocks, one per filtered field"""
+    symbols: list
+    rows: list
+    price: np.ndarray
+    rel_vol: np.ndarray
+    gap_pct: np.ndarray
+    bounded: np.ndarray  # len(BOUNDED_FIELDS) x N
+    has_news: np.ndarray
+    category: np.ndarray  # int32 codes into categories
+    categories: dict  # category -> code
+    sectors: tuple  # sorted dropdown sectors, computed once per cache refresh
+    display: list  # preformatted StockRow per stock (None if unformattable)
+    rankings: dict = field(default_factory=dict)  # (rank function, limit) -> rows, see ranked()
+    
+    @classmethod
+    def from_stocks(cls, stocks_data):
+        """Build the columns from cache_data['stocks']"""
+        symbols, rows = [], []
+        for symbol, stock_data in iter_stock_items(stocks_data):
+            symbols.append(symbol)
+            rows.append(stock_data)
+        
+        # Dictionary-encode the category so sector matching is an integer compare
+        categories = {}
+        category = np.array([categories.setdefault(stock_data.get('category', 'Other'), len(categories))
+                             for stock_data in rows], dtype=np.int32)
+        
+        return cls(
+            symbols=symbols,
+            rows=rows,
+            price=_column(rows, 'price'),
+            rel_vol=_column(rows, 'relative_volume'),
+            gap_pct=_column(rows, 'gap_pct'),
+            bounded=np.array([_column(rows, field) for field in BOUNDED_FIELDS]).reshape(len(BOUNDED_FIELDS), len(rows)),
+            has_news=np.array([bool(stock_data.get('has_news', False)) for stock_data in rows], dtype=bool),
+            category=category,
+            categories=categories,
+            sectors=tuple(_sorted_sectors(categories)),
+            display=[_display_row(symbol, stock_data) for symbol, stock_data in zip(symbols, rows)]
+        )
+    
+    def ranked(self, rank, limit=5):
+        """rank(self, limit) over all stocks (e.g. get_quick_movers), computed once per cache refresh"""
+        key = (rank, limit)
+        rows = self.rankings.get(key)
+        if rows is None:
+            rows = self.rankings[key] = rank(self, limit)
+        return rows
+
+# (cache key, StockColumns) for the most recently loaded cache
+_stock_columns = (None, None)
+
+def get_stock_columns(cache_data):
+    """Columnar view of cache_data['stocks'], rebuilt only when the cache refreshes"""
+    global _stock_columns
+    stocks_data = cache_data['stocks']
+    last_update = cache_data.get('last_update')
+    if not last_update:
+        return StockColumns.from_stocks(stocks_data)
+    
+    key = (last_update, len(stocks_data))
+    cached_key, columns = _stock_columns
+    if cached_key != key:
+        columns = StockColumns.from_stocks(stocks_data)
+        _stock_columns = (key, columns)
+    return columns
+
+def _threshold(value, scale=1):
+    """Convert an optional filter value to float; NaN when unset or invalid"""
+    if not value:
+        return np.nan
+    try:
+        return float(value) * scale
+    except (TypeError, ValueError):
+        return np.nan
+
+# Active predicate names -> {predicate name: [rows rejected, rows evaluated]}
+_predicate_stats = defaultdict(dict)
+
+def _bound_predicate(column, low, high):
+    """Predicate keeping rows within [low, high] (NaN bounds unset); 0 (unknown) passes"""
+    def keep(idx):
+        values = column[idx]
+        inside = np.ones(len(idx), dtype=bool)
+        if not math.isnan(low):
+            inside &= values >= low
+        if not math.isnan(high):
+            inside &= values <= high
+        return inside | (values == 0)
+    return keep
+
+def _filter_mask(price, rel_vol, gap_pct, has_news, bounded, fields, lower, upper,
+                 min_price, max_price, min_rel_vol, min_gap_pct, require_news):
+    """Survival mask for the numeric filters (NaN thresholds are unset)"""
+    predicates = [('price', lambda idx: (price[idx] > 0) & (price[idx] >= min_price) & (price[idx] <= max_price))]
+    for j in fields:
+        predicates.append((BOUNDED_FIELDS[j], _bound_predicate(bounded[j], lower[j], upper[j])))
+    if not math.isnan(min_rel_vol):
+        predicates.append(('rel_vol', lambda idx: rel_vol[idx] >= min_rel_vol))
+    if not math.isnan(min_gap_pct):
+        predicates.append(('gap_pct', lambda idx: np.abs(gap_pct[idx]) >= min_gap_pct))
+    if require_news:
+        predicates.append(('has_news', lambda idx: has_news[idx]))
+    
+    # Run the historically most rejecting predicates first, each only on the
+    # rows that survived the ones before it
+    stats = _predicate_stats[tuple(name for name, _ in predicates)]
+    predicates.sort(key=lambda item: _rejection_rate(stats.get(item[0])), reverse=True)
+    
+    idx = np.arange(len(price))
+    for name, keep in predicates:
+        if not idx.size:
+            break
+        survivors = idx[keep(idx)]
+        counts = stats.setdefault(name, [0, 0])
+        counts[0] += idx.size - survivors.size
+        counts[1] += idx.size
+        idx = survivors
+    
+    mask = np.zeros(len(price), dtype=bool)
+    mask[idx] = True
+    return mask
+
+def _rejection_rate(counts):
+    """Share of evaluated rows a predicate rejected (0 before it has run)"""
+    return counts[0] / counts[1] if counts and counts[1] else 0.0
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True, parallel=True)
+    def _filter_kernel(price, rel_vol, gap_pct, has_news, bounded, fields, lower, upper,
+                       min_price, max_price, min_rel_vol, min_gap_pct, require_news):
+        """Compiled single-pass version of _filter_mask"""
+        n = price.shape[0]
+        mask = np.zeros(n, dtype=np.bool_)
+        for i in prange(n):
+            p = price[i]
+            if not (p > 0 and p >= min_price and p <= max_price):
+                continue
+            if not math.isnan(min_rel_vol) and not rel_vol[i] >= min_rel_vol:
+                continue
+            if not math.isnan(min_gap_pct) and not abs(gap_pct[i]) >= min_gap_pct:
+                continue
+            if require_news and not has_news[i]:
+                continue
+            keep = True
+            for k in range(fields.shape[0]):
+                j = fields[k]
+                value = bounded[j, i]
+                if value == 0:
+                    continue
+                if (not math.isnan(lower[j]) and not value >= lower[j]) or \
+                        (not math.isnan(upper[j]) and not value <= upper[j]):
+                    keep = False
+                    break
+            mask[i] = keep
+        return mask
+else:
+    _filter_kernel = _filter_mask
 
 def filter_cached_stocks(stocks_data, min_price=1, max_price=20, min_rel_vol=None, max_float=None, min_gap_pct=None, require_news=False, sector_filter=None, min_pre_market=None, max_pre_market=None, min_post_market=None, max_post_market=None, min_market_cap=None, max_market_cap=None, min_pe_ratio=None, max_pe_ratio=None, min_pre_market_change=None, max_pre_market_change=None, min_post_market_change=None, max_post_market_change=None, min_premarket_volume=None):
-    """Apply filters to cached stock data"""
+    """Apply filters to cached stock data (a StockColumns or the raw stocks)"""
+    cols = stocks_data if isinstance(stocks_data, StockColumns) else StockColumns.from_stocks(stocks_data)
+    
+    # Optional bounds in BOUNDED_FIELDS order - only applied if values are provided
+    lower = np.array([
+        _threshold(min_pre_market), _threshold(min_post_market), _threshold(min_market_cap),
+        _threshold(min_pe_ratio), _threshold(min_pre_market_change), _threshold(min_post_market_change),
+        _threshold(min_premarket_volume), np.nan
+    ])
+    upper = np.array([
+        _threshold(max_pre_market), _threshold(max_post_market), _threshold(max_market_cap),
+        _threshold(max_pe_ratio), _threshold(max_pre_market_change), _threshold(max_post_market_change),
+        np.nan, _threshold(max_float, 1000000)
+    ])
+    
+    # Only the bounded fields with a min or max set are visited per row
+    fields = np.flatnonzero(~(np.isnan(lower) & np.isnan(upper)))
+    
+    # Price range, relative volume, gap (FIXED: only when meaningful) and news
+    mask = _filter_kernel(
+        cols.price, cols.rel_vol, cols.gap_pct, cols.has_news, cols.bounded, fields, lower, upper,
+        float(min_price), float(max_price),
+        float(min_rel_vol) if min_rel_vol else np.nan,
+        float(min_gap_pct) if min_gap_pct is not None and min_gap_pct > 0 else np.nan,
+        bool(require_news)
+    )
+    
+    # Category filter - only compared for the rows still in play
+    if sector_filter and sector_filter != 'All':
+        idx = np.flatnonzero(mask)
+        mask[idx] = cols.category[idx] == cols.categories.get(sector_filter, -1)
+    
+    # Surviving rows in gap percentage order (descending, ties keep cache order);
+    # their display dicts were formatted once when the columns were built
+    idx = np.flatnonzero(mask)
+    idx = idx[np.argsort(-cols.gap_pct[idx], kind='stable')]
     results = []
+    for i in idx:
+        row = cols.display[i]
+        if row is not None:
+            results.append(row)
+    
+    return results
+
+def _top_k_indices(values, candidates, limit):
+    """The candidate indices with the `limit` largest values, largest first"""
+    if candidates.size > limit:
+        candidates = candidates[np.argpartition(-values[candidates], limit - 1)[:limit]]
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+@ttl_cache(seconds=1)
+def get_cache_status():
+    """Get information about cache freshness (shared by requests within a second)"""
+    return cache_manager.get_cache_status()
+
+def get_top_positive_gappers(stocks_data, limit=5):
+    """Get the top positive gappers for the highlight section"""
+    # Any layout (dict, list of filtered stocks, or only the top rows of the columns)
+    if isinstance(stocks_data, StockColumns):
+        cols = stocks_data
+        top = _top_k_indices(cols.gap_pct, np.flatnonzero(cols.gap_pct > 0), limit)
+        items = ((cols.symbols[i], cols.rows[i]) for i in top)
+    else:
+        items = iter_stock_items(stocks_data)
     
-    for symbol, stock_data in stocks_data.items():
+    positive_gappers = []
+    for symbol, stock_data in items:
         try:
-            current = stock_data.get('price', 0)
-            pre_market_price = stock_data.get('pre_market_price', 0)
-            post_market_price = stock_data.get('post_market_price', 0)
-            float_shares = stock_data.get('float_shares_raw', 0)
-            rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
             gap_pct = stock_data.get('gap_pct', 0)
-            has_news = stock_data.get('has_news', False)
-            category = stock_data.get('category', 'Other')
-            market_state = stock_data.get('market_state', 'UNKNOWN')
-            market_cap = stock_data.get('market_cap', 0)
-            pe_ratio = stock_data.get('pe_ratio')
-            pre_market_change_pct = stock_data.get('pre_market_change_pct')
-            post_market_change_pct = stock_data.get('post_market_change_pct')
-            volume = stock_data.get('volume', 0)
             
-            # Basic validation - stock must have a price
-            if not current or current <= 0:
-                continue
-                
-            # Price filters (current price)
-            if current < min_price or current > max_price:
-                continue
-                
-            # Pre-market price filters - only apply if values are provided
-            if min_pre_market and pre_market_price and pre_market_price < float(min_pre_market):
-                continue
-            if max_pre_market and pre_market_price and pre_market_price > float(max_pre_market):
-                continue
-                
-            # After-market price filters - only apply if values are provided
-            if min_post_market and post_market_price and post_market_price < float(min_post_market):
-                continue
-            if max_post_market and post_market_price and post_market_price > float(max_post_market):
+            # Only include positive gappers
+            if not gap_pct > 0:
                 continue
             
-            # Market cap filters - only apply if values are provided
-            if min_market_cap and market_cap and market_cap < float(min_market_cap):
-                continue
-            if max_market_cap and market_cap and market_cap > float(max_market_cap):
-                continue
-                
-            # PE ratio filters - only apply if values are provided
-            if min_pe_ratio and pe_ratio and pe_ratio < float(min_pe_ratio):
-                continue
-            if max_pe_ratio and pe_ratio and pe_ratio > float(max_pe_ratio):
-                continue
-                
-            # Pre-market change percentage filters
-            if min_pre_market_change and pre_market_change_pct and pre_market_change_pct < float(min_pre_market_change):
-                continue
-            if max_pre_market_change and pre_market_change_pct and pre_market_change_pct > float(max_pre_market_change):
-                continue
-                
-            # Post-market change percentage filters
-            if min_post_market_change and post_market_change_pct and post_market_change_pct < float(min_post_market_change):
-                continue
-            if max_post_market_change and post_market_change_pct and post_market_change_pct > float(max_post_market_change):
-                continue
-                
-            # Pre-market volume filter
-            if min_premarket_volume and volume and volume < float(min_premarket_volume):
-                continue
+            rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
+            positive_gappers.append({
+                'symbol': symbol,
+                'price': stock_data.get('price', 0),
+                'pct_change': stock_data.get('pct_change', 0),
+                'pct_change_display': f"{float(stock_data.get('pct_change', 0)):.2f}%",
+                'gap_pct': gap_pct,
+                'gap_pct_display': f"{float(gap_pct):.2f}%",
+                'rel_vol': rel_vol,
+                'rel_vol_display': f"{float(rel_vol):.1f}x",
+                'volume': format_volume(stock_data.get('volume', 0)),
+                'float': stock_data.get('float', '—'),
+                'market_cap': stock_data.get('market_cap_display', '—'),  # Use display version
+                'pe': stock_data.get('pe_display', '—'),  # Use display version
+                'has_news': stock_data.get('has_news', False),
+                'source': stock_data.get('source', 'cache'),
+                'timestamp': stock_data.get('timestamp', 0)
+            })
             
-            # Relative volume filter
-            if min_rel_vol and rel_vol < min_rel_vol:
-                continue
-                
-            # Float filter - only apply if value is provided
-            if max_float and float_shares and float_shares > (float(max_float) * 1000000):
-                continue
+        except Exception as e:
+            logger.debug("Error processing %s for top gappers: %s", symbol, e)
+            continue
+    
+    # Highest gap percentage first, limited without sorting the whole list
+    return heapq.nlargest(limit, positive_gappers, key=itemgetter('gap_pct'))
+
+def get_quick_movers(stocks_data, limit=5):
+    """Get the fastest moving stocks based on price velocity and volume"""
+    # Any layout (dict, list of filtered stocks, or only the top rows of the columns)
+    if isinstance(stocks_data, StockColumns):
+        cols = stocks_data
+        abs_gap = np.abs(cols.gap_pct)
+        scores = abs_gap * (1 + (cols.rel_vol - 1) * 0.5)
+        candidates = np.flatnonzero((abs_gap >= 0.5) & (cols.rel_vol >= 0.5) & (cols.price >= 1))
+        items = ((cols.symbols[i], cols.rows[i]) for i in _top_k_indices(scores, candidates, limit))
+    else:
+        items = iter_stock_items(stocks_data)
+    
+    quick_movers = []
+    for symbol, stock_data in items:
+        try:
+            gap_pct = abs(stock_data.get('gap_pct', 0))  # Use gap_pct instead of pct_change
+            rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
+            price = stock_data.get('price', 0)
             
-            # Gap percentage filter - FIXED: Only apply minimum when meaningful
-            if min_gap_pct is not None and min_gap_pct > 0 and abs(gap_pct) < min_gap_pct:
-                continue
-                
-            # News filter
-            if require_news and not has_news:
-                continue
-                
-            # Category filter
-            if sector_filter and sector_filter != 'All' and category != sector_filter:
+            # Only include stocks with significant movement and volume (lowered thresholds for real market data)
+            if not (gap_pct >= 0.5 and rel_vol >= 0.5 and price >= 1):
                 continue
             
-            # Format the data for display
-            results.append({
+            # Calculate "movement score" combining % change and relative volume
+            movement_score = gap_pct * (1 + (rel_vol - 1) * 0.5)
+            
+            quick_movers.append({
                 'symbol': symbol,
-                'price': float(current),
-                'price_display': f"${current:.2f}",
-                'pre_market_price': float(pre_market_price) if pre_market_price else 0,
-                'pre_market_price_display': f"${pre_market_price:.2f}" if pre_market_price else '—',
-                'post_market_price': float(post_market_price) if post_market_price else 0,
-                'post_market_price_display': f"${post_market_price:.2f}" if post_market_price else '—',
-                'pre_market_change_pct': float(pre_market_change_pct) if pre_market_change_pct else None,
-                'post_market_change_pct': float(post_market_change_pct) if post_market_change_pct else None,
-                'market_state': market_state,
-                'pct_change': float(stock_data.get('pct_change', 0)),
-                'pct_change_display': f"{float(stock_data.get('pct_change', 0)):.2f}%",
-                'gap_pct': float(gap_pct),
-                'gap_pct_display': f"{gap_pct:.2f}%",
-                'rel_vol': float(rel_vol),
-                'rel_vol_display': f"{rel_vol:.2f}x",
+                'price': price,
+                'pct_change': stock_data.get('gap_pct', 0),  # Use gap_pct as pct_change
+                'pct_change_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
+                'abs_pct_change': gap_pct,
+                'gap_pct': stock_data.get('gap_pct', 0),
+                'gap_pct_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
+                'rel_vol': rel_vol,
+                'rel_vol_display': f"{float(rel_vol):.1f}x",
                 'volume': format_volume(stock_data.get('volume', 0)),
-                'float': stock_data.get('float', '—'),
-                'market_cap': stock_data.get('market_cap_display', '—'),
-                'pe_ratio': stock_data.get('pe_display', '—'),
-                'category': category,
-                'gap_classification': stock_data.get('gap_classification', '📊 REGULAR')
+                'float': stock_data.get('float_shares', '—'),  # Use float_shares
+                'market_cap': stock_data.get('market_cap', '—'),  # Use market_cap
+                'pe': stock_data.get('pe_ratio', '—'),  # Use pe_ratio
+                'has_news': stock_data.get('has_news', False),
+                'source': stock_data.get('source', 'cache'),
+                'timestamp': stock_data.get('timestamp', 0),
+                'movement_score': movement_score
             })
             
         except Exception as e:
-            print(f"Error processing {symbol}: {e}")
+            logger.debug("Error processing %s for quick movers: %s", symbol, e)
             continue
-            
-    # Sort by gap percentage (descending)
-    results.sort(key=lambda x: x['gap_pct'], reverse=True)
-    return results
+    
+    # Highest movement score first, limited without sorting the whole list
+    return heapq.nlargest(limit, quick_movers, key=itemgetter('movement_score'))
 
-def get_cache_status():
-    """Get information about cache freshness"""
-    return cache_manager.get_cache_status()
+# (cache last_update, stock count, filters, independence flags) -> screener results (LRU)
+SCREENER_RESULTS_SIZE = 128
+_screener_results = OrderedDict()
+_screener_results_lock = threading.Lock()
 
-def get_top_positive_gappers(stocks_data, limit=5):
-    """Get the top positive gappers for the highlight section"""
-    positive_gappers = []
+def get_screener_results(cache_data, stock_columns, filters, quick_movers_independent, top_gappers_independent):
+    """(filtered stocks, quick movers, top gappers) for one filter set, memoized until the cache refreshes"""
+    last_update = cache_data.get('last_update')
+    key = (last_update, len(cache_data['stocks']), tuple(sorted(filters.items())),
+           quick_movers_independent, top_gappers_independent)
+    with _screener_results_lock:
+        results = _screener_results.get(key)
+        if results is not None:
+            _screener_results.move_to_end(key)
+            return results
     
-    # Handle both dictionary and list formats
-    if isinstance(stocks_data, list):
-        # List format (from filtered stocks)
-        for stock_data in stocks_data:
-            symbol = stock_data.get('symbol', '')
-            try:
-                gap_pct = stock_data.get('gap_pct', 0)
-                
-                # Only include positive gappers
-                if gap_pct > 0:
-                    rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
-                    positive_gappers.append({
-                        'symbol': symbol,
-                        'price': stock_data.get('price', 0),
-                        'pct_change': stock_data.get('pct_change', 0),
-                        'pct_change_display': f"{float(stock_data.get('pct_change', 0)):.2f}%",
-                        'gap_pct': gap_pct,
-                        'gap_pct_display': f"{float(gap_pct):.2f}%",
-                        'rel_vol': rel_vol,
-                        'rel_vol_display': f"{float(rel_vol):.1f}x",
-                        'volume': format_volume(stock_data.get('volume', 0)),
-                        'float': stock_data.get('float', '—'),
-                        'market_cap': stock_data.get('market_cap_display', '—'),  # Use display version
-                        'pe': stock_data.get('pe_display', '—'),  # Use display version
-                        'has_news': stock_data.get('has_news', False),
-                        'source': stock_data.get('source', 'cache'),
-                        'timestamp': stock_data.get('timestamp', 0)
-                    })
-                
-            except Exception as e:
-                print(f"⚠️  Error processing {symbol} for top gappers: {e}")
-                continue
+    # The filter is the only pass over the stocks per request: the filter-independent
+    # lists only depend on the cache, so they are ranked once per refresh
+    filtered_stocks = filter_cached_stocks(stock_columns, **filters)
+    if quick_movers_independent:
+        # Use all stocks from cache for Quick Movers (independent of filters)
+        quick_movers = stock_columns.ranked(get_quick_movers)
     else:
-        # Dictionary format (from original cache)
-        for symbol, stock_data in stocks_data.items():
-            try:
-                gap_pct = stock_data.get('gap_pct', 0)
-                
-                # Only include positive gappers
-                if gap_pct > 0:
-                    rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
-                    positive_gappers.append({
-                        'symbol': symbol,
-                        'price': stock_data.get('price', 0),
-                        'pct_change': stock_data.get('pct_change', 0),
-                        'pct_change_display': f"{float(stock_data.get('pct_change', 0)):.2f}%",
-                        'gap_pct': gap_pct,
-                        'gap_pct_display': f"{float(gap_pct):.2f}%",
-                        'rel_vol': rel_vol,
-                        'rel_vol_display': f"{float(rel_vol):.1f}x",
-                        'volume': format_volume(stock_data.get('volume', 0)),
-                        'float': stock_data.get('float', '—'),
-                        'market_cap': stock_data.get('market_cap_display', '—'),  # Use display version
-                        'pe': stock_data.get('pe_display', '—'),  # Use display version
-                        'has_news': stock_data.get('has_news', False),
-                        'source': stock_data.get('source', 'cache'),
-                        'timestamp': stock_data.get('timestamp', 0)
-                    })
-                
-            except Exception as e:
-                print(f"⚠️  Error processing {symbol} for top gappers: {e}")
-                continue
+        # Use filtered stocks for Quick Movers (respects current filters)
+        quick_movers = get_quick_movers(filtered_stocks) if filtered_stocks else []
+    if top_gappers_independent:
+        # Use all stocks from cache for Top Gappers (independent of filters)
+        top_positive_gappers = stock_columns.ranked(get_top_positive_gappers)
+    else:
+        # Use filtered stocks for Top Gappers (respects current filters)
+        top_positive_gappers = get_top_positive_gappers(filtered_stocks)
+    results = (filtered_stocks, quick_movers, top_positive_gappers)
     
-    # Sort by gap percentage (highest first) and limit results
-    return sorted(positive_gappers, key=lambda x: x['gap_pct'], reverse=True)[:limit]
+    # Without a last_update there is no way to tell when the cache changes
+    if last_update:
+        with _screener_results_lock:
+            _screener_results[key] = results
+            if len(_screener_results) > SCREENER_RESULTS_SIZE:
+                _screener_results.popitem(last=False)
+    return results
 
-def get_quick_movers(stocks_data, limit=5):
-    """Get the fastest moving stocks based on price velocity and volume"""
-    quick_movers = []
+def is_independent(param):
+    """Whether a *_independent query flag is on - True (independent) when not provided"""
+    return True if param is None else param.lower() == 'true'
+
+# Query strings whose results are prebuilt after each cache refresh, so they are hit
+# straight from the screener results cache
+SCREENER_PRESETS = (
+    ImmutableMultiDict(),  # the default page (query args, typed like request.args)
+)
+SCREENER_PREBUILD_INTERVAL = 5  # seconds between checks for a refreshed cache
+
+def prebuild_screener_results(cache_data):
+    """Compute the screener results for every SCREENER_PRESETS query"""
+    stock_columns = get_stock_columns(cache_data)
+    for preset in SCREENER_PRESETS:
+        validated_filters, validation_error = validate_filters(preset)
+        if validation_error:
+            logger.warning("Invalid screener preset %r: %s", preset, validation_error)
+            continue
+        get_screener_results(
+            cache_data,
+            stock_columns,
+            dict(validated_filters, **parse_legacy_filters(preset)),
+            is_independent(preset.get('quick_movers_independent')),
+            is_independent(preset.get('top_gappers_independent'))
+        )
+
+class _ScreenerPrebuilder(threading.Thread):
+    """Background thread that prebuilds the preset screener results when the cache refreshes"""
     
-    # Handle both dictionary and list formats
-    if isinstance(stocks_data, list):
-        # List format (from filtered stocks)
-        for stock_data in stocks_data:
-            symbol = stock_data.get('symbol', '')
-            try:
-                gap_pct = abs(stock_data.get('gap_pct', 0))  # Use gap_pct instead of pct_change
-                rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
-                price = stock_data.get('price', 0)
-                
-                # Only include stocks with significant movement and volume (lowered thresholds for real market data)
-                if gap_pct >= 0.5 and rel_vol >= 0.5 and price >= 1:
-                    # Calculate "movement score" combining % change and relative volume
-                    movement_score = gap_pct * (1 + (rel_vol - 1) * 0.5)
-                    
-                    quick_movers.append({
-                        'symbol': symbol,
-                        'price': price,
-                        'pct_change': stock_data.get('gap_pct', 0),  # Use gap_pct as pct_change
-                        'pct_change_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
-                        'abs_pct_change': gap_pct,
-                        'gap_pct': stock_data.get('gap_pct', 0),
-                        'gap_pct_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
-                        'rel_vol': rel_vol,
-                        'rel_vol_display': f"{float(rel_vol):.1f}x",
-                        'volume': format_volume(stock_data.get('volume', 0)),
-                        'float': stock_data.get('float_shares', '—'),  # Use float_shares
-                        'market_cap': stock_data.get('market_cap', '—'),  # Use market_cap
-                        'pe': stock_data.get('pe_ratio', '—'),  # Use pe_ratio
-                        'has_news': stock_data.get('has_news', False),
-                        'source': stock_data.get('source', 'cache'),
-                        'timestamp': stock_data.get('timestamp', 0),
-                        'movement_score': movement_score
-                    })
-                
-            except Exception as e:
-                print(f"⚠️  Error processing {symbol} for quick movers: {e}")
-                continue
-    else:
-        # Dictionary format (from original cache)
-        for symbol, stock_data in stocks_data.items():
+    def __init__(self):
+        super().__init__(name='screener-prebuilder', daemon=True)
+        self._stopped = threading.Event()
+    
+    def run(self):
+        built_for = None
+        while True:
             try:
-                gap_pct = abs(stock_data.get('gap_pct', 0))  # Use gap_pct instead of pct_change
-                rel_vol = stock_data.get('relative_volume', 0)  # Fixed: use relative_volume instead of rel_vol
-                price = stock_data.get('price', 0)
-                
-                # Only include stocks with significant movement and volume (lowered thresholds for real market data)
-                if gap_pct >= 0.5 and rel_vol >= 0.5 and price >= 1:
-                    # Calculate "movement score" combining % change and relative volume
-                    movement_score = gap_pct * (1 + (rel_vol - 1) * 0.5)
-                    
-                    quick_movers.append({
-                        'symbol': symbol,
-                        'price': price,
-                        'pct_change': stock_data.get('gap_pct', 0),  # Use gap_pct as pct_change
-                        'pct_change_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
-                        'abs_pct_change': gap_pct,
-                        'gap_pct': stock_data.get('gap_pct', 0),
-                        'gap_pct_display': f"{float(stock_data.get('gap_pct', 0)):.2f}%",
-                        'rel_vol': rel_vol,
-                        'rel_vol_display': f"{float(rel_vol):.1f}x",
-                        'volume': format_volume(stock_data.get('volume', 0)),
-                        'float': stock_data.get('float_shares', '—'),  # Use float_shares
-                        'market_cap': stock_data.get('market_cap', '—'),  # Use market_cap
-                        'pe': stock_data.get('pe_ratio', '—'),  # Use pe_ratio
-                        'has_news': stock_data.get('has_news', False),
-                        'source': stock_data.get('source', 'cache'),
-                        'timestamp': stock_data.get('timestamp', 0),
-                        'movement_score': movement_score
-                    })
-                
+                cache_data = cache_manager.load_cache_shared()
+                last_update = cache_data.get('last_update') if cache_data else None
+                if last_update and last_update != built_for and cache_data.get('stocks'):
+                    prebuild_screener_results(cache_data)
+                    built_for = last_update
             except Exception as e:
-                print(f"⚠️  Error processing {symbol} for quick movers: {e}")
-                continue
+                logger.warning("Error prebuilding screener results: %s", e)
+            
+            if self._stopped.wait(SCREENER_PREBUILD_INTERVAL):
+                break
     
-    # Sort by movement score (highest first) and limit results
-    return sorted(quick_movers, key=lambda x: x['movement_score'], reverse=True)[:limit]
+    def stop(self):
+        """Stop after the current check"""
+        self._stopped.set()
+
+screener_prebuilder = _ScreenerPrebuilder()
+screener_prebuilder.start()
 
 @app.route("/")
 def screener():
     """Main screener page with filters and timing info"""
     try:
         # Load cache instantly - no delays
-        cache_data = cache_manager.load_cache()
+        cache_data = cache_manager.load_cache_shared()
         
         if cache_data and 'stocks' in cache_data and cache_data['stocks']:
-            print(f"✅ Cache loaded instantly with {len(cache_data['stocks'])} stocks")
+            logger.debug("Cache loaded instantly with %d stocks", len(cache_data['stocks']))
         else:
             print("⚠️ No cache data available")
         
@@ -987,41 +1832,11 @@ def screener():
             # Return minimal data immediately instead of waiting
             print("⚡ Returning instant response with minimal data")
             
-            # Create default cache_info for error case
-            default_cache_info = {
-                'successful_count': 0,
-                'total_count': 0,
-                'last_update': 'Never',
-                'is_fresh': False
-            }
-            return render_template('screener.html', 
-                                   stocks=[], 
-                                   error="📊 No stock data available. Background scanner is starting... Please refresh in a few minutes.",
-                                   market_info=get_default_market_info(),
-                                   cache_info=default_cache_info,
-                                   cache_status=get_cache_status(),
-                                   filters={
-                                       'min_price': 1.0,
-                                       'max_price': 100.0,
-                                       'min_gap_pct': 0.0,
-                                       'min_rel_vol': 0.0,
-                                       'max_float': '',
-                                       'sector_filter': 'All'
-                                   })
+            return render_screener_error("📊 No stock data available. Background scanner is starting... Please refresh in a few minutes.")
 
         # Calculate data age and freshness
-        last_update = cache_data.get('last_update', 0)
-        
-        # Convert ISO string to timestamp if needed
-        if isinstance(last_update, str):
-            try:
-                from datetime import datetime
-                last_update_dt = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-                last_update = last_update_dt.timestamp()
-            except:
-                last_update = time.time()  # Fallback to current time
-        
-        data_age_minutes = (time.time() - last_update) / 60
+        now = time.time()
+        data_age_minutes = (now - cache_timestamp(cache_data.get('last_update', 0), now)) / 60
         market_session = cache_data.get('market_session', {})
         scan_summary = cache_data.get('scan_summary', {})
 
@@ -1031,25 +1846,7 @@ def screener():
             validated_filters, validation_error = validate_filters(request.args)
             
             if validation_error:
-                return render_template('screener.html',
-                                     stocks=[], 
-                                     error=f"Invalid filter parameters: {validation_error}",
-                                     market_info=get_default_market_info(),
-                                     cache_info={
-                                         'successful_count': 0,
-                                         'total_count': 0,
-                                         'last_update': 'Never',
-                                         'is_fresh': False
-                                     },
-                                     cache_status=get_cache_status(),
-                                     filters={
-                                         'min_price': 1.0,
-                                         'max_price': 2000.0,  # Increased from 100.0 to accommodate higher-priced stocks
-                                         'min_gap_pct': 0.0,
-                                         'min_rel_vol': 0.0,
-                                         'max_float': '',
-                                         'sector_filter': 'All'
-                                     })
+                return render_screener_error(f"Invalid filter parameters: {validation_error}", filters=_VALIDATION_ERROR_FILTERS)
             
             # Extract validated parameters
             min_price = validated_filters['min_price']
@@ -1065,101 +1862,35 @@ def screener():
             min_premarket_volume = validated_filters['min_premarket_volume']
             
             # Legacy parameters for backward compatibility
-            min_pre_market = request.args.get('min_pre_market', '')
-            max_pre_market = request.args.get('max_pre_market', '')
-            min_post_market = request.args.get('min_post_market', '')
-            max_post_market = request.args.get('max_post_market', '')
-            min_pre_market_change = request.args.get('min_pre_market_change', '')
-            max_pre_market_change = request.args.get('max_pre_market_change', '')
-            min_post_market_change = request.args.get('min_post_market_change', '')
-            max_post_market_change = request.args.get('max_post_market_change', '')
+            legacy_filters = parse_legacy_filters(request.args)
             
-            # Apply filters
-            filtered_stocks = filter_cached_stocks(
-                cache_data['stocks'], 
-                min_price=min_price,
-                max_price=max_price, 
-                min_gap_pct=min_gap_pct,
-                min_rel_vol=min_rel_vol,
-                max_float=max_float,
-                sector_filter=sector_filter,
-                min_pre_market=min_pre_market,
-                max_pre_market=max_pre_market,
-                min_post_market=min_post_market,
-                max_post_market=max_post_market,
-                min_market_cap=min_market_cap,
-                max_market_cap=max_market_cap,
-                min_pe_ratio=min_pe_ratio,
-                max_pe_ratio=max_pe_ratio,
-                min_pre_market_change=min_pre_market_change,
-                max_pre_market_change=max_pre_market_change,
-                min_post_market_change=min_post_market_change,
-                max_post_market_change=max_post_market_change,
-                min_premarket_volume=min_premarket_volume
-            )
+            # Filter, Quick Movers and Top Gappers - memoized per cache refresh and filter set
+            stock_columns = get_stock_columns(cache_data)
             
-            # Add data age to each stock for display
-            for stock in filtered_stocks:
-                if 'data_fetch_time' in stock:
-                    try:
-                        fetch_time = datetime.fromisoformat(stock['data_fetch_time'].replace('Z', '+00:00'))
-                        stock['data_age_seconds'] = int((datetime.now() - fetch_time.replace(tzinfo=None)).total_seconds())
-                        stock['data_age_display'] = format_time_ago(stock['data_age_seconds'])
-                    except:
-                        stock['data_age_seconds'] = int(data_age_minutes * 60)
-                        stock['data_age_display'] = f"{data_age_minutes:.1f}m ago"
-                else:
-                    stock['data_age_seconds'] = int(data_age_minutes * 60)
-                    stock['data_age_display'] = f"{data_age_minutes:.1f}m ago"
-            
-            # Sort by gap percentage (descending)
-            filtered_stocks.sort(key=lambda x: x.get('gap_pct', 0), reverse=True)
-            
-            # Check if Quick Movers should be independent of filters
+            # Check if Quick Movers / Top Gappers should be independent of filters
             quick_movers_param = request.args.get('quick_movers_independent')
-            # Default to True (independent) when parameter is None or not provided
-            quick_movers_independent = True if quick_movers_param is None else quick_movers_param.lower() == 'true'
-            
-            # Debug output
-            print(f"🔍 DEBUG: quick_movers_param = {quick_movers_param}")
-            print(f"🔍 DEBUG: quick_movers_independent = {quick_movers_independent}")
-            
-            # Get Quick Movers based on mode
-            if quick_movers_independent:
-                # Use all stocks from cache for Quick Movers (independent of filters)
-                quick_movers = get_quick_movers(cache_data['stocks'])
-                print(f"🔍 Quick Movers (Independent): {len(quick_movers)} found from all stocks")
-            else:
-                # Use filtered stocks for Quick Movers (respects current filters)
-                if filtered_stocks:
-                    quick_movers = get_quick_movers(filtered_stocks)
-                    print(f"🔍 Quick Movers (Filtered): {len(quick_movers)} found from {len(filtered_stocks)} filtered stocks")
-                else:
-                    quick_movers = []
-                    print(f"🔍 Quick Movers (Filtered): 0 found - no stocks meet filter criteria")
-            
-            # Check if Top Gappers should be independent of filters
             top_gappers_param = request.args.get('top_gappers_independent')
-            # Default to True (independent) when parameter is None or not provided
-            top_gappers_independent = True if top_gappers_param is None else top_gappers_param.lower() == 'true'
+            quick_movers_independent = is_independent(quick_movers_param)
+            top_gappers_independent = is_independent(top_gappers_param)
             
             # Debug output
-            print(f"🔍 DEBUG: top_gappers_param = {top_gappers_param}")
-            print(f"🔍 DEBUG: top_gappers_independent = {top_gappers_independent}")
+            logger.debug("quick_movers_param = %s, quick_movers_independent = %s", quick_movers_param, quick_movers_independent)
+            logger.debug("top_gappers_param = %s, top_gappers_independent = %s", top_gappers_param, top_gappers_independent)
             
-            # Get Top Positive Gappers based on mode
-            if top_gappers_independent:
-                # Use all stocks from cache for Top Gappers (independent of filters)
-                top_positive_gappers = get_top_positive_gappers(cache_data['stocks'])
-                print(f"🔍 Top Gappers (Independent): {len(top_positive_gappers)} found from all stocks")
-            else:
-                # Use filtered stocks for Top Gappers (respects current filters)
-                top_positive_gappers = get_top_positive_gappers(filtered_stocks)
-                print(f"🔍 Top Gappers (Filtered): {len(top_positive_gappers)} found from {len(filtered_stocks)} filtered stocks")
-            print(f"🔍 Top Positive Gappers: {len(top_positive_gappers)} found")
+            filtered_stocks, quick_movers, top_positive_gappers = get_screener_results(
+                cache_data,
+                stock_columns,
+                dict(validated_filters, **legacy_filters),
+                quick_movers_independent,
+                top_gappers_independent
+            )
+            
+            logger.debug("Quick Movers (%s): %d found", 'Independent' if quick_movers_independent else 'Filtered', len(quick_movers))
+            logger.debug("Top Gappers (%s): %d found from %d filtered stocks",
+                         'Independent' if top_gappers_independent else 'Filtered', len(top_positive_gappers), len(filtered_stocks))
             
             # Get unique sectors for filter dropdown
-            sectors = get_unique_sectors(cache_data['stocks'])
+            sectors = stock_columns.sectors
             
             # Format numbers for display
             total_stocks = len(cache_data['stocks'])
@@ -1220,110 +1951,26 @@ def screener():
                                      'min_premarket_volume': min_premarket_volume
                                  })
         except ValueError as e:
-            return render_template('screener.html',
-                                   stocks=[], 
-                                   error=f"Invalid input for filter: {e}. Please enter valid numbers.",
-                                   market_info=get_default_market_info(),
-                                   cache_info={
-                                       'successful_count': 0,
-                                       'total_count': 0,
-                                       'last_update': 'Never',
-                                       'is_fresh': False
-                                   },
-                                   cache_status=get_cache_status(),
-                                   filters={
-                                       'min_price': 1.0,
-                                       'max_price': 100.0,
-                                       'min_gap_pct': 0.0,
-                                       'min_rel_vol': 0.0,
-                                       'max_float': '',
-                                       'sector_filter': 'All'
-                                   })
+            return render_screener_error(f"Invalid input for filter: {e}. Please enter valid numbers.")
         except Exception as e:
-            return render_template('screener.html',
-                                   stocks=[], 
-                                   error=f"An unexpected error occurred: {e}",
-                                   market_info=get_default_market_info(),
-                                   cache_info={
-                                       'successful_count': 0,
-                                       'total_count': 0,
-                                       'last_update': 'Never',
-                                       'is_fresh': False
-                                   },
-                                   cache_status=get_cache_status(),
-                                   filters={
-                                       'min_price': 1.0,
-                                       'max_price': 100.0,
-                                       'min_gap_pct': 0.0,
-                                       'min_rel_vol': 0.0,
-                                       'max_float': '',
-                                       'sector_filter': 'All'
-                                   })
+            return render_screener_error(f"An unexpected error occurred: {e}")
     except Exception as e:
-        return render_template('screener.html',
-                               stocks=[], 
-                               error=f"An unexpected error occurred during cache loading: {e}",
-                               market_info=get_default_market_info(),
-                               cache_info={
-                                   'successful_count': 0,
-                                   'total_count': 0,
-                                   'last_update': 'Never',
-                                   'is_fresh': False
-                               },
-                               cache_status=get_cache_status(),
-                               filters={
-                                   'min_price': 1.0,
-                                   'max_price': 100.0,
-                                   'min_gap_pct': 0.0,
-                                   'min_rel_vol': 0.0,
-                                   'max_float': '',
-                                   'sector_filter': 'All'
-                               })
+        return render_screener_error(f"An unexpected error occurred during cache loading: {e}")
 
 @app.route("/api/cache_status")
 def api_cache_status():
     """Get cache status information"""
     try:
-        cache = cache_manager.load_cache()
-        if not cache:
-            return jsonify({
-                'status': 'empty',
-                'message': 'No cache data available',
-                'age_minutes': 0,
-                'is_fresh': False,
-                'last_update_str': 'Never',
-                'successful_count': 0,
-                'total_count': 0,
-                'last_update': 'Never',
-                'stocks_available': 0
-            })
-        
-        # Calculate age
-        last_update = cache.get('last_update', 0)
-        if isinstance(last_update, str):
-            try:
-                from datetime import datetime
-                last_update_dt = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-                last_update = last_update_dt.timestamp()
-            except Exception:
-                last_update = time.time()
-        
-        age_minutes = (time.time() - last_update) / 60
-        is_fresh = age_minutes < 5  # Consider fresh if less than 5 minutes old
-        
-        return jsonify({
-            'status': 'fresh' if is_fresh else 'stale',
-            'message': f"Cache is {'fresh' if is_fresh else 'stale'}",
-            'age_minutes': age_minutes,
-            'is_fresh': is_fresh,
-            'last_update_str': cache.get('last_update_str', 'Unknown'),
-            'successful_count': cache.get('successful_count', 0),
-            'total_count': cache.get('total_count', 0),
-            'last_update': cache.get('last_update_str', 'Never'),
-            'stocks_available': len(cache.get('stocks', {})) if cache.get('stocks') else 0
-        })
+        try:
+            stat = os.stat(cache_manager.cache_file)
+            file_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_key = None
+        # age_minutes moves with the clock, so bodies are reused within the second
+        now = int(time.time())
+        return cached_json_response(('cache_status', file_key, now), lambda: cache_status_payload(now))
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'status': 'error',
             'message': f'Error loading cache: {str(e)}',
             'age_minutes': 0,
@@ -1335,15 +1982,47 @@ def api_cache_status():
             'stocks_available': 0
         })
 
+def cache_status_payload(now):
+    """The /api/cache_status body for the current cache file as of now"""
+    cache = cache_manager.load_cache_meta()
+    if not cache:
+        return {
+            'status': 'empty',
+            'message': 'No cache data available',
+            'age_minutes': 0,
+            'is_fresh': False,
+            'last_update_str': 'Never',
+            'successful_count': 0,
+            'total_count': 0,
+            'last_update': 'Never',
+            'stocks_available': 0
+        }
+    
+    # Calculate age
+    age_minutes = (now - cache_timestamp(cache.get('last_update', 0), now)) / 60
+    is_fresh = age_minutes < 5  # Consider fresh if less than 5 minutes old
+    
+    return {
+        'status': 'fresh' if is_fresh else 'stale',
+        'message': f"Cache is {'fresh' if is_fresh else 'stale'}",
+        'age_minutes': age_minutes,
+        'is_fresh': is_fresh,
+        'last_update_str': cache.get('last_update_str', 'Unknown'),
+        'successful_count': cache.get('successful_count', 0),
+        'total_count': cache.get('total_count', 0),
+        'last_update': cache.get('last_update_str', 'Never'),
+        'stocks_available': cache['stocks_count']
+    }
+
 @app.route("/api/instant_data")
 def api_instant_data():
     """Ultra-fast API endpoint for instant data loading"""
     try:
         # Load cache instantly
-        cache_data = cache_manager.load_cache()
+        cache_data = cache_manager.load_cache_shared()
         
         if not cache_data or 'stocks' not in cache_data:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'message': 'No data available',
                 'stocks': [],
@@ -1354,12 +2033,13 @@ def api_instant_data():
         stocks = cache_data['stocks']
         
         # Get instant Quick Movers (top 5)
-        quick_movers = get_quick_movers(stocks, limit=5)
+        stock_columns = get_stock_columns(cache_data)
+        quick_movers = stock_columns.ranked(get_quick_movers, limit=5)
         
         # Get instant Top Gappers (top 5)
-        top_gappers = get_top_positive_gappers(stocks, limit=5)
+        top_gappers = stock_columns.ranked(get_top_positive_gappers, limit=5)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'stocks_count': len(stocks),
             'last_update': cache_data.get('last_update_str', 'Unknown'),
@@ -1368,7 +2048,7 @@ def api_instant_data():
         })
         
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         })
@@ -1377,20 +2057,20 @@ def api_instant_data():
 def api_cache_ready():
     """Check if cache is ready with data"""
     try:
-        cache_data = cache_manager.load_cache()
+        cache_data = cache_manager.load_cache_shared()
         if cache_data and 'stocks' in cache_data and cache_data['stocks']:
-            return jsonify({
+            return ojsonify({
                 'ready': True,
                 'stocks_count': len(cache_data['stocks']),
                 'last_update': cache_data.get('last_update_str', 'Unknown')
             })
         else:
-            return jsonify({
+            return ojsonify({
                 'ready': False,
                 'message': 'Cache not ready'
             })
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'ready': False,
             'error': str(e)
         })
@@ -1398,76 +2078,74 @@ def api_cache_ready():
 @app.route("/analytics-test")
 def analytics_test():
     """Test analytics functionality"""
-    return jsonify({'message': 'Analytics test endpoint'})
+    return ojsonify({'message': 'Analytics test endpoint'})
+
+def health_body():
+    """The /health JSON body, built once per wall-clock second"""
+    timestamp = iso_now()
+    return cached_json_body(('health', timestamp), lambda: {
+        'status': 'healthy',
+        'timestamp': timestamp,
+        'app': 'Poppalyze Stock Screener',
+        'version': '1.0.0'
+    })
 
 @app.route("/health")
 def health():
     """Health check endpoint for monitoring"""
     try:
         # Basic health check - just check if app is running
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'app': 'Poppalyze Stock Screener',
-            'version': '1.0.0'
-        })
+        return Response(health_body(), mimetype='application/json')
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'status': 'unhealthy',
             'error': str(e)
         }), 500
 
+# Orchestrator health probes skip routing, the view and request tracking
+app.wsgi_app = HealthShortcut(app.wsgi_app, health_body)
+
 @app.route("/api/scanner/start", methods=['POST'])
 def start_scanner():
     """Manually start the background scanner"""
     try:
         if start_background_scanner():
-            return jsonify({'status': 'success', 'message': 'Background scanner started'}), 200
+            return ojsonify({'status': 'success', 'message': 'Background scanner started'}), 200
         else:
-            return jsonify({'status': 'error', 'message': 'Failed to start background scanner'}), 500
+            return ojsonify({'status': 'error', 'message': 'Failed to start background scanner'}), 500
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return ojsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route("/api/scanner/stop", methods=['POST'])
 def stop_scanner():
     """Manually stop the background scanner"""
     try:
         stop_background_scanner()
-        return jsonify({'status': 'success', 'message': 'Background scanner stopped'}), 200
+        return ojsonify({'status': 'success', 'message': 'Background scanner stopped'}), 200
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        return ojsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route("/api/scanner/status")
 def scanner_status():
     """Get background scanner status"""
-    # Check both managed process and PID file
-    managed_running = (background_scanner_process and background_scanner_process.poll() is None)
-    pid_file_running = is_scanner_running()
-    
-    is_running = managed_running or pid_file_running
-    
-    return jsonify({
-        'running': is_running,
-        'managed_process': managed_running,
-        'pid_file_detected': pid_file_running,
-        'pid': background_scanner_process.pid if managed_running else None
-    })
+    snapshot = scanner_snapshot()
+    return cached_json_response(('scanner_status', *snapshot.values()), lambda: snapshot)
 
 @app.route("/api/event", methods=['POST'])
 def analytics_event():
     """Handle analytics events from client-side tracker"""
     try:
-        if not request.is_json:
-            return jsonify({'error': 'Content-Type must be application/json'}), 400
-        
-        data = request.get_json()
+        # None for a non-JSON Content-Type or an unparseable body
+        data = request.get_json(silent=True, cache=True)
+        if data is None:
+            return ojsonify({'error': 'Content-Type must be application/json or invalid JSON'}), 400
         
         # Validate required fields
-        if not data or 'event' not in data:
-            return jsonify({'error': 'Missing event type'}), 400
+        if not isinstance(data, dict) or 'event' not in data:
+            return ojsonify({'error': 'Missing event type'}), 400
         
         event_type = data.get('event')
-        timestamp = data.get('timestamp', datetime.now().isoformat())
+        timestamp = data['timestamp'] if 'timestamp' in data else iso_now()
         
         # Prepare log entry
         log_entry = {
@@ -1487,47 +2165,64 @@ def analytics_event():
                 'scroll_depth': data.get('scroll_depth', 0)
             })
         
-        # Log to console
+        # Serialized and appended to the analytics log off the request thread
+        analytics_log.put(log_entry)
+        
+        # Console echo, only formatted when the analytics logger is at INFO
         if event_type == 'pageview':
-            print(f"📊 ANALYTICS [PAGEVIEW] {log_entry['url']} | IP: {log_entry['ip']} | Referrer: {log_entry['referrer'] or 'Direct'}")
+            analytics_logger.info("PAGEVIEW %s | IP: %s | Referrer: %s",
+                                  log_entry['url'], log_entry['ip'], log_entry['referrer'] or 'Direct')
         elif event_type == 'engagement':
-            engagement_time = log_entry.get('engagement_time', 0)
-            scroll_depth = log_entry.get('scroll_depth', 0)
-            print(f"📊 ANALYTICS [ENGAGEMENT] {log_entry['url']} | Time: {engagement_time}s | Scroll: {scroll_depth}% | IP: {log_entry['ip']}")
+            analytics_logger.info("ENGAGEMENT %s | Time: %ss | Scroll: %s%% | IP: %s",
+                                  log_entry['url'], log_entry['engagement_time'], log_entry['scroll_depth'], log_entry['ip'])
         
-        # Optionally save to file (uncomment if you want persistent logs)
-        # try:
-        #     with open('analytics.log', 'a', encoding='utf-8') as f:
-        #         f.write(json.dumps(log_entry) + '\n')
-        # except Exception as e:
-        #     print(f"⚠️  Error writing analytics log: {e}")
-        
-        return jsonify({'status': 'ok'}), 200
+        return ojsonify({'status': 'ok'}), 200
         
     except Exception as e:
         print(f"⚠️  Error processing analytics event: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
+
+def stream_traffic_stats(summary, daily_rows, first_row):
+    """Emit the /api/traffic body with the daily series encoded one row at a time
+    
+    daily_rows has already produced first_row, so query errors surface before the response
+    starts; a failure later in the series is logged and the JSON object is still closed.
+    """
+    yield json_bytes(summary)[:-1] + b',"daily_page_views":{'
+    if first_row is not None:
+        yield json_bytes(first_row[0]) + b':' + json_bytes(first_row[1])
+        try:
+            for day, count in daily_rows:
+                yield b',' + json_bytes(day) + b':' + json_bytes(count)
+        except Exception as e:
+            print(f"⚠️  Error streaming daily page views: {e}")
+    yield b'}}'
 
 @app.route("/api/traffic")
 def api_traffic():
     """Get traffic analytics data"""
     try:
-        days = request.args.get('days', 1, type=int)
-        stats = traffic_analytics.get_traffic_stats(days)
-        return jsonify(stats)
+        days = min(max(request.args.get('days', 1, type=int), 1), TRAFFIC_MAX_DAYS)
+        summary = traffic_analytics.get_traffic_summary(days)
+        if not summary:
+            return ojsonify(summary)
+        # Run the daily query now, inside this try, rather than once the body is streaming
+        daily_rows = traffic_analytics.iter_daily_page_views(days)
+        first_row = next(daily_rows, None)
+        return Response(stream_traffic_stats(summary, daily_rows, first_row), mimetype='application/json')
     except Exception as e:
         print(f"⚠️  Error getting traffic stats: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 @app.route("/api/traffic/realtime")
 def api_traffic_realtime():
     """Get real-time traffic statistics"""
     try:
         stats = traffic_analytics.get_real_time_stats()
-        return jsonify(stats)
+        return ojsonify(stats)
     except Exception as e:
         print(f"⚠️  Error getting real-time stats: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return ojsonify({'error': 'Internal server error'}), 500
 
 def wait_for_cache(timeout=10):
     """Wait for cache file to be created by background scanner"""
@@ -1540,34 +2235,47 @@ def wait_for_cache(timeout=10):
     print("⚠️ Cache file still missing after wait.")
     return False
 
-if __name__ == '__main__':
-    print("🚀 Starting Poppalyze Stock Screener")
-    print(f"📁 Cache file: {CACHE_FILE}")
-    
-    # ALWAYS start the background scanner on initialization
-    print("🔄 Starting background scanner...")
-    scanner_started = start_background_scanner()
-    
-    if scanner_started:
+def warm_start_scanner():
+    """Start the background scanner and wait briefly for its first cache write"""
+    if start_background_scanner():
         print("✅ Background scanner is running")
-        # Wait for cache to be created
-        cache_ready = wait_for_cache(timeout=15)  # Wait up to 15 seconds
-        if cache_ready:
+        if wait_for_cache(timeout=15):  # Wait up to 15 seconds
             print("🎉 Cache ready - Poppalyze is fully operational!")
         else:
             print("⚠️ Cache not ready - app will start anyway and load data when available")
     else:
         print("⚠️  Background scanner failed to start - will retry on first request")
-    
-    print("🎉 Poppalyze is ready!")
-    print("📊 Background scanner will continuously update stock data")
+
+def prime_request_caches():
+    """Fill the cache status TTL entry and market defaults ahead of the first request"""
+    get_default_market_info()
+    get_cache_status()
+
+if __name__ == '__main__':
+    # Debug-level screener diagnostics are dropped (and never formatted) at INFO
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), stream=sys.stdout)
     
     # Get port from environment (Render sets PORT)
     port = int(os.environ.get('PORT', 5001))
     debug_mode = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
     
-    print(f"🚀 Starting Poppalyze on port {port}")
-    print(f"🌐 App will be available at: http://localhost:{port}")
-    print(f"🔧 Debug mode: {debug_mode}")
+    # One write for the whole banner, so warmup thread output can't interleave with it
+    sys.stdout.write(
+        "🚀 Starting Poppalyze Stock Screener\n"
+        f"📁 Cache file: {CACHE_FILE}\n"
+        "🔄 Starting background scanner...\n"
+        "🎉 Poppalyze is ready!\n"
+        "📊 Background scanner will continuously update stock data\n"
+        f"🚀 Starting Poppalyze on port {port}\n"
+        f"🌐 App will be available at: http://localhost:{port}\n"
+        f"🔧 Debug mode: {debug_mode}\n"
+    )
+    sys.stdout.flush()
+    
+    # ALWAYS start the background scanner on initialization, off the main thread
+    # so the server starts accepting connections while the scanner boots
+    threading.Thread(target=warm_start_scanner, name='scanner-warmup', daemon=True).start()
+    # Prime the TTL-cached status and market defaults before the first request
+    threading.Thread(target=prime_request_caches, name='cache-warmup', daemon=True).start()
     
-    app.run(debug=debug_mode, host='0.0.0.0', port=port, use_reloader=False) 
\ No newline at end of file
+    app.run(debug=debug_mode, host='0.0.0.0', port=port, use_reloader=False)
@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 from datetime import datetime
+from operator import attrgetter
 from flask import Flask, render_template, request, jsonify, redirect, url_for
 import yfinance as yf
 from dataclasses import dataclass
@@ -44,7 +45,7 @@ app = Flask(__name__)
 app.config.from_object(Config)
 
 # Stock data structure
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StockData:
     symbol: str
     name: str
@@ -543,7 +544,7 @@ def screener():
         filtered_stocks.append(stock)
     
     # Sort by gap percentage (descending)
-    filtered_stocks.sort(key=lambda x: x.change_pct, reverse=True)
+    filtered_stocks.sort(key=attrgetter('change_pct'), reverse=True)
     
     # Prepare last update display
     last_update_display = "Never"
@@ -14,6 +14,7 @@ import os
 import threading
 import logging
 from datetime import datetime
+from operator import itemgetter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -254,7 +255,7 @@ def get_positive_gappers(stocks_data, limit=5):
         return []
     
     positive = [s for s in stocks_data.values() if s['gap_pct'] > 0]
-    positive.sort(key=lambda x: x['gap_pct'], reverse=True)
+    positive.sort(key=itemgetter('gap_pct'), reverse=True)
     return positive[:limit]
 
 def get_quick_movers(stocks_data, limit=5):
@@ -263,7 +264,7 @@ def get_quick_movers(stocks_data, limit=5):
         return []
     
     stocks = list(stocks_data.values())
-    stocks.sort(key=lambda x: x['relative_volume'], reverse=True)
+    stocks.sort(key=itemgetter('relative_volume'), reverse=True)
     return stocks[:limit]
 
 @app.route("/")
@@ -21,6 +21,7 @@ from typing import Dict, List, Optional, Any, Callable, Protocol
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import lru_cache
+from operator import attrgetter
 from contextlib import contextmanager
 import yfinance as yf
 from flask import Flask, render_template, request, jsonify, Response
@@ -486,12 +487,12 @@ class StockSorter:
     @staticmethod
     def by_gap_pct(stocks: List[StockData], reverse: bool = True) -> List[StockData]:
         """Sort stocks by gap percentage"""
-        return sorted(stocks, key=lambda x: x.gap_pct, reverse=reverse)
+        return sorted(stocks, key=attrgetter('gap_pct'), reverse=reverse)
     
     @staticmethod
     def by_relative_volume(stocks: List[StockData], reverse: bool = True) -> List[StockData]:
         """Sort stocks by relative volume"""
-        return sorted(stocks, key=lambda x: x.relative_volume, reverse=reverse)
+        return sorted(stocks, key=attrgetter('relative_volume'), reverse=reverse)
 
 class CacheStatusCalculator:
     @staticmethod
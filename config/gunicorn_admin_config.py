@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Gunicorn Configuration for the Admin Dashboard
+==============================================
+gunicorn -c config/gunicorn_admin_config.py admin_dashboard:app
+"""
+
+# Network configuration
+bind = "0.0.0.0:5003"  # ADMIN_PORT in admin_dashboard.py
+backlog = 2048
+
+# One worker process: the traffic writer, database maintenance (prune, vacuum, rollup)
+# and system sampler run once per process, so a second worker would duplicate them and
+# compete for the SQLite write lock. Concurrency comes from threads sharing the reader pool.
+workers = 1
+worker_class = "gthread"
+threads = 16
+timeout = 30
+keepalive = 5
+graceful_timeout = 30
+
+# Each worker builds its own traffic writer thread, SQLite connections and system
+# sampler on import; preloading would fork those into the workers already dead
+preload_app = False
+
+# Logging
+accesslog = "admin_access.log"
+errorlog = "admin_error.log"
+loglevel = "info"
+
+# Process naming
+proc_name = "admin_dashboard"
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import json
+from operator import itemgetter
 
 # Load cache data
 with open('stock_cache.json', 'r') as f:
@@ -25,13 +26,13 @@ for symbol, stock in stocks.items():
 
 print(f"\n📈 POSITIVE GAPS ({len(positive_gaps)} stocks):")
 if positive_gaps:
-    for symbol, price, gap in sorted(positive_gaps, key=lambda x: x[2], reverse=True):
+    for symbol, price, gap in sorted(positive_gaps, key=itemgetter(2), reverse=True):
         print(f"  {symbol}: ${price:.2f} (+{gap:.2f}%)")
 else:
     print("  None found")
 
 print(f"\n📉 NEGATIVE GAPS ({len(negative_gaps)} stocks):")
-for symbol, price, gap in sorted(negative_gaps, key=lambda x: x[2]):
+for symbol, price, gap in sorted(negative_gaps, key=itemgetter(2)):
     print(f"  {symbol}: ${price:.2f} ({gap:.2f}%)")
 
 print(f"\n📊 SUMMARY:")
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Import the app modules from their files for the tests
+(app.py and admin_dashboard.py share their names with other modules in the tree)
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Where cache_manager and config.Config import from (ahead of the config package)
+IMPORT_DIRS = [os.path.join(ROOT_DIR, 'app', 'core'), os.path.join(ROOT_DIR, 'config')]
+
+def load_module(name, path, work_dir):
+    """Import ROOT_DIR/path as module name, creating its import-time databases in work_dir"""
+    sys.path[:0] = IMPORT_DIRS
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT_DIR, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # Numba's on-disk cache looks the module up by name
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
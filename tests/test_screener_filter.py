@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test that the column-mask screener filter keeps the same stocks as the
+per-stock dict filter it replaced (NumPy predicates and, if installed, Numba)
+"""
+
+import os
+import sys
+import tempfile
+
+# Keep compiled kernels for the test's module name out of app/web/__pycache__
+os.environ.setdefault('NUMBA_CACHE_DIR', tempfile.mkdtemp(prefix='numba_cache_'))
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from module_loader import load_module
+
+# Small fixed cache with missing (None) and unknown (0) values in the filtered fields
+STOCKS = {
+    'AAA': {'price': 5.0, 'relative_volume': 3.2, 'gap_pct': 12.5, 'has_news': True, 'category': 'Technology',
+            'pre_market_price': 5.4, 'post_market_price': 5.1, 'market_cap': 2.5e9, 'pe_ratio': 18.0,
+            'pre_market_change_pct': 1.5, 'post_market_change_pct': -0.5, 'volume': 4000000, 'float_shares_raw': 15e6},
+    'BBB': {'price': None, 'relative_volume': 5.0, 'gap_pct': 30.0, 'category': 'Technology'},
+    'CCC': {'price': 0, 'relative_volume': 2.0, 'gap_pct': 8.0, 'category': 'Biotech'},
+    'DDD': {'price': 12.0, 'relative_volume': 1.1, 'gap_pct': -6.0, 'has_news': False, 'category': 'Biotech',
+            'pre_market_price': 0, 'post_market_price': None, 'market_cap': 0, 'pe_ratio': None,
+            'pre_market_change_pct': None, 'post_market_change_pct': 2.5, 'volume': 0, 'float_shares_raw': None},
+    'EEE': {'price': 25.0, 'relative_volume': 4.0, 'gap_pct': 9.0, 'has_news': True, 'category': 'Energy',
+            'market_cap': 8e9, 'pe_ratio': 40.0, 'volume': 9000000, 'float_shares_raw': 300e6},
+    'FFF': {'price': 3.5, 'relative_volume': None, 'gap_pct': -8.0, 'has_news': True, 'category': 'Energy',
+            'pre_market_price': 3.2, 'market_cap': 4e8, 'pe_ratio': 0, 'pre_market_change_pct': -3.0,
+            'volume': 250000, 'float_shares_raw': 50e6},
+    'GGG': {'price': 8.0, 'relative_volume': 2.5, 'gap_pct': 3.0, 'category': 'Biotech',
+            'pre_market_price': 8.8, 'post_market_price': 7.9, 'market_cap': 1.2e9, 'pe_ratio': 25.0,
+            'pre_market_change_pct': 0.4, 'post_market_change_pct': 1.2, 'volume': 1500000, 'float_shares_raw': 8e6},
+    'HHH': {'price': 1.0, 'relative_volume': 0, 'gap_pct': 0, 'category': 'Other',
+            'market_cap': None, 'volume': None},
+    'III': {'price': 19.99, 'relative_volume': 1.9, 'gap_pct': 3.0, 'has_news': True,
+            'post_market_price': 20.5, 'pe_ratio': 9.5, 'post_market_change_pct': 0, 'volume': 2000000},
+}
+
+# filter_cached_stocks keyword arguments, including 0 (unset) and None bounds
+FILTER_CASES = [
+    {},
+    {'min_price': 0, 'max_price': 100},
+    {'min_rel_vol': 2},
+    {'min_rel_vol': 0, 'min_gap_pct': 0},
+    {'min_gap_pct': 5},
+    {'min_gap_pct': None},
+    {'require_news': True},
+    {'max_float': 20},
+    {'max_float': 0},
+    {'min_market_cap': 1e9, 'max_market_cap': None},
+    {'min_market_cap': 0, 'max_market_cap': 3e9},
+    {'min_pe_ratio': 10, 'max_pe_ratio': 30},
+    {'min_pre_market': 4, 'max_pre_market': 6},
+    {'min_post_market': 0, 'max_post_market': 0},
+    {'min_pre_market_change': -1, 'max_pre_market_change': 2},
+    {'min_post_market_change': 1, 'max_post_market_change': None},
+    {'min_premarket_volume': 1000000},
+    {'sector_filter': 'Biotech'},
+    {'sector_filter': 'All'},
+    {'sector_filter': 'Nonexistent'},
+    {'min_price': 2, 'max_price': 30, 'min_rel_vol': 1.5, 'min_gap_pct': 2, 'max_float': 60,
+     'min_market_cap': 1e8, 'max_pe_ratio': 30, 'sector_filter': 'Biotech'},
+]
+
+def baseline_filter(stocks_data, min_price=1, max_price=20, min_rel_vol=None, max_float=None, min_gap_pct=None, require_news=False, sector_filter=None, min_pre_market=None, max_pre_market=None, min_post_market=None, max_post_market=None, min_market_cap=None, max_market_cap=None, min_pe_ratio=None, max_pe_ratio=None, min_pre_market_change=None, max_pre_market_change=None, min_post_market_change=None, max_post_market_change=None, min_premarket_volume=None):
+    """Symbols kept by the original one-stock-at-a-time filter, in gap order"""
+    results = []
+    for symbol, stock_data in stocks_data.items():
+        try:
+            current = stock_data.get('price', 0)
+            pre_market_price = stock_data.get('pre_market_price', 0)
+            post_market_price = stock_data.get('post_market_price', 0)
+            float_shares = stock_data.get('float_shares_raw', 0)
+            rel_vol = stock_data.get('relative_volume', 0)
+            gap_pct = stock_data.get('gap_pct', 0)
+            market_cap = stock_data.get('market_cap', 0)
+            pe_ratio = stock_data.get('pe_ratio')
+            pre_market_change_pct = stock_data.get('pre_market_change_pct')
+            post_market_change_pct = stock_data.get('post_market_change_pct')
+            volume = stock_data.get('volume', 0)
+
+            if not current or current <= 0:
+                continue
+            if current < min_price or current > max_price:
+                continue
+            if min_pre_market and pre_market_price and pre_market_price < float(min_pre_market):
+                continue
+            if max_pre_market and pre_market_price and pre_market_price > float(max_pre_market):
+                continue
+            if min_post_market and post_market_price and post_market_price < float(min_post_market):
+                continue
+            if max_post_market and post_market_price and post_market_price > float(max_post_market):
+                continue
+            if min_market_cap and market_cap and market_cap < float(min_market_cap):
+                continue
+            if max_market_cap and market_cap and market_cap > float(max_market_cap):
+                continue
+            if min_pe_ratio and pe_ratio and pe_ratio < float(min_pe_ratio):
+                continue
+            if max_pe_ratio and pe_ratio and pe_ratio > float(max_pe_ratio):
+                continue
+            if min_pre_market_change and pre_market_change_pct and pre_market_change_pct < float(min_pre_market_change):
+                continue
+            if max_pre_market_change and pre_market_change_pct and pre_market_change_pct > float(max_pre_market_change):
+                continue
+            if min_post_market_change and post_market_change_pct and post_market_change_pct < float(min_post_market_change):
+                continue
+            if max_post_market_change and post_market_change_pct and post_market_change_pct > float(max_post_market_change):
+                continue
+            if min_premarket_volume and volume and volume < float(min_premarket_volume):
+                continue
+            if min_rel_vol and rel_vol < min_rel_vol:
+                continue
+            if max_float and float_shares and float_shares > (float(max_float) * 1000000):
+                continue
+            if min_gap_pct is not None and min_gap_pct > 0 and abs(gap_pct) < min_gap_pct:
+                continue
+            if require_news and not stock_data.get('has_news', False):
+                continue
+            if sector_filter and sector_filter != 'All' and stock_data.get('category', 'Other') != sector_filter:
+                continue
+
+            # The original formatted each kept row and skipped the ones that failed
+            float(current), float(rel_vol), float(gap_pct)
+            results.append((symbol, gap_pct))
+        except Exception:
+            continue  # e.g. a None relative volume
+
+    results.sort(key=lambda x: x[1], reverse=True)
+    return [symbol for symbol, _ in results]
+
+def check_filter(web_app, kernel, label):
+    """Run every filter case through filter_cached_stocks with the given mask function"""
+    cols = web_app.StockColumns.from_stocks(STOCKS)
+    original = web_app._filter_kernel
+    web_app._filter_kernel = kernel
+    try:
+        for filters in FILTER_CASES:
+            expected = baseline_filter(STOCKS, **filters)
+            # Twice, so _filter_mask also runs with its predicates reordered by the first pass
+            for _ in range(2):
+                got = [row.symbol for row in web_app.filter_cached_stocks(cols, **filters)]
+                assert got == expected, f"{label} {filters}: expected {expected}, got {got}"
+    finally:
+        web_app._filter_kernel = original
+    print(f"✅ {label} matches the baseline filter for {len(FILTER_CASES)} cases")
+
+def test_filter_mask_matches_baseline():
+    """The NumPy predicate mask keeps the same stocks as the per-dict filter"""
+    print("🧪 Testing NumPy filter mask...")
+    with tempfile.TemporaryDirectory() as tmp:
+        web_app = load_module('web_app', 'app/web/app.py', tmp)
+        check_filter(web_app, web_app._filter_mask, "_filter_mask")
+
+def test_filter_kernel_matches_baseline():
+    """The compiled kernel (when Numba is installed) keeps the same stocks as the per-dict filter"""
+    print("🧪 Testing Numba filter kernel...")
+    with tempfile.TemporaryDirectory() as tmp:
+        web_app = load_module('web_app', 'app/web/app.py', tmp)
+        if not web_app.NUMBA_AVAILABLE:
+            print("⚠️ Numba not installed, _filter_kernel is _filter_mask")
+            return
+        check_filter(web_app, web_app._filter_kernel, "_filter_kernel")
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting screener filter tests\n")
+
+    try:
+        test_filter_mask_matches_baseline()
+        test_filter_kernel_matches_baseline()
+
+        print("\n🎉 All screener filter tests passed!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
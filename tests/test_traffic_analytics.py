@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test that queued traffic events are committed and counted by the stats queries
+(app.py's TrafficAnalytics and the admin dashboard's, which share one database file)
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from module_loader import load_module
+
+def fake_request(ip_address, session_id, path):
+    """The parts of a Flask request the admin dashboard's tracking methods read"""
+    return SimpleNamespace(
+        cookies={'session_id': session_id},
+        remote_addr=ip_address,
+        headers={'User-Agent': 'traffic-test'},
+        path=path,
+        method='GET'
+    )
+
+def test_app_traffic_summary():
+    """Events recorded through app.py's queue show up in get_traffic_summary"""
+    print("🧪 Testing app.py traffic summary...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        web_app = load_module('web_app', 'app/web/app.py', tmp)
+        analytics = web_app.TrafficAnalytics(os.path.join(tmp, 'traffic.db'), os.path.join(tmp, 'rollups.db'))
+
+        for _ in range(3):
+            analytics.record_request('s1', '/', '203.0.113.5', 'traffic-test', referrer='https://example.com/')
+        analytics.record_request('s2', '/screener', '203.0.113.6', 'traffic-test')
+        analytics.record_request('s2', '/api/stocks', '203.0.113.6', 'traffic-test', is_api=True)
+
+        # Block until the flusher has committed everything queued above
+        analytics.flusher.flush()
+        web_app._stats_cache.clear()
+        summary = analytics.get_traffic_summary(days=1)
+        analytics.flusher.drain_and_stop()
+
+    assert summary['page_views_today'] == 4, f"Expected 4 page views, got {summary['page_views_today']}"
+    assert summary['api_calls_today'] == 1, f"Expected 1 API call, got {summary['api_calls_today']}"
+    assert summary['unique_visitors_today'] == 2, f"Expected 2 visitors, got {summary['unique_visitors_today']}"
+    assert dict(summary['top_pages']) == {'/': 3, '/screener': 1}, f"Unexpected top pages: {summary['top_pages']}"
+    assert dict(summary['top_ips']) == {'203.0.113.5': 3, '203.0.113.6': 1}, f"Unexpected top IPs: {summary['top_ips']}"
+    assert dict(summary['top_endpoints']) == {'/api/stocks': 1}, f"Unexpected top endpoints: {summary['top_endpoints']}"
+    print("✅ Queued events committed and counted")
+
+def test_admin_traffic_stats_excludes_local_ips():
+    """The admin dashboard commits every queued event but leaves EXCLUDED_IPS out of its stats"""
+    print("🧪 Testing admin dashboard traffic stats...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        admin = load_module('admin_dashboard', 'admin_dashboard.py', tmp)
+        admin.TRAFFIC_DB = os.path.join(tmp, 'traffic.db')
+        analytics = admin.TrafficAnalytics()
+
+        visits = [('203.0.113.5', 's1'), ('203.0.113.6', 's2')]
+        visits += [(ip, f'local{i}') for i, ip in enumerate(admin.EXCLUDED_IPS)]
+        for ip_address, session_id in visits:
+            page = fake_request(ip_address, session_id, '/')
+            analytics.track_visitor(page)
+            analytics.track_page_view(page)
+            analytics.track_api_call(fake_request(ip_address, session_id, '/api/stocks'))
+
+        analytics.flush()
+        with analytics._read() as conn:
+            stored = [conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                      for table in ('visitors', 'page_views', 'api_calls')]
+        admin._stats_cache.clear()
+        stats = analytics.get_traffic_stats(days=1)
+
+    assert stored == [len(visits)] * 3, f"Expected {len(visits)} rows per table, got {stored}"
+    print(f"✅ All {len(visits)} queued visits committed")
+
+    assert stats['total_visitors'] == 2, f"Expected 2 visitors, got {stats['total_visitors']}"
+    assert stats['unique_visitors_today'] == 2, f"Expected 2 unique visitors, got {stats['unique_visitors_today']}"
+    assert stats['page_views_today'] == 2, f"Expected 2 page views, got {stats['page_views_today']}"
+    assert stats['api_calls_today'] == 2, f"Expected 2 API calls, got {stats['api_calls_today']}"
+    assert dict(stats['top_pages']) == {'/': 2}, f"Unexpected top pages: {stats['top_pages']}"
+    assert dict(stats['top_endpoints']) == {'/api/stocks': 2}, f"Unexpected top endpoints: {stats['top_endpoints']}"
+    assert {ip for ip, _ in stats['top_ips']} == {'203.0.113.5', '203.0.113.6'}, f"Unexpected top IPs: {stats['top_ips']}"
+    print("✅ Excluded IPs left out of the stats")
+
+def test_admin_reads_app_database():
+    """The admin dashboard reads, prunes, rolls up and inserts into a database written by app.py"""
+    print("🧪 Testing app.py and the admin dashboard on one database file...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'traffic_analytics.db')
+        web_app = load_module('web_app', 'app/web/app.py', tmp)
+        web = web_app.TrafficAnalytics(db_path, os.path.join(tmp, 'traffic_rollups.db'))
+        for i in range(4):
+            web.record_request(f's{i}', '/', '8.8.8.8', 'traffic-test', referrer='https://example.com/')
+        for _ in range(3):
+            web.record_request('s0', '/api/stocks', '8.8.8.8', 'traffic-test', is_api=True)
+        web.flusher.flush()
+
+        # One page view two days back, for the daily rollup
+        two_days_ago = int(time.time()) - 2 * 86400
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO page_views (session_id, page_url, timestamp, ip_address) VALUES ('s9', '/', ?, '8.8.8.8')",
+                         (two_days_ago,))
+
+        admin = load_module('admin_dashboard', 'admin_dashboard.py', tmp)
+        admin.TRAFFIC_DB = db_path
+        analytics = admin.TrafficAnalytics()
+        admin._stats_cache.clear()
+        stats = analytics.get_traffic_stats(days=7)
+        realtime = analytics.get_real_time_stats()
+
+        # Retention and rollup run on the admin's writer; neither may touch recent rows
+        analytics._write_with_retry(analytics._prune_old_events)
+        analytics._write_with_retry(lambda cursor: analytics._rollup_daily_stats(cursor, admin.date.today()))
+
+        # Admin requests go into the same tables app.py reads
+        page = fake_request('203.0.113.7', 'admin-session', '/admin')
+        analytics.track_visitor(page)
+        analytics.track_page_view(page)
+        analytics.track_api_call(fake_request('203.0.113.7', 'admin-session', '/admin/api/traffic'))
+        analytics.flush()
+
+        with analytics._read() as conn:
+            page_views, api_calls = (conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                                     for table in ('page_views', 'api_calls'))
+            rollup = conn.execute('SELECT date, total_page_views FROM daily_stats').fetchall()
+        web_app._stats_cache.clear()
+        summary = web.get_traffic_summary(days=1)
+        web.flusher.drain_and_stop()
+
+    assert stats['page_views_today'] == 4, f"Expected 4 page views, got {stats['page_views_today']}"
+    assert stats['api_calls_today'] == 3, f"Expected 3 API calls, got {stats['api_calls_today']}"
+    assert stats['unique_visitors_today'] == 4, f"Expected 4 visitors, got {stats['unique_visitors_today']}"
+    assert realtime['page_views_hour'] == 4 and realtime['api_calls_hour'] == 3, f"Unexpected real-time stats: {realtime}"
+    print("✅ Admin counts app.py's events")
+
+    assert (page_views, api_calls) == (6, 4), f"Expected 6 page views and 4 API calls stored, got {page_views}, {api_calls}"
+    expected_day = time.strftime('%Y-%m-%d', time.localtime(two_days_ago))
+    assert rollup == [(expected_day, 1)], f"Expected [({expected_day!r}, 1)] rolled up, got {rollup}"
+    print("✅ Prune kept recent events and the rollup dated them correctly")
+
+    assert summary['page_views_today'] == 5, f"Expected 5 page views, got {summary['page_views_today']}"
+    assert summary['api_calls_today'] == 4, f"Expected 4 API calls, got {summary['api_calls_today']}"
+    print("✅ app.py counts the admin's events")
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting traffic analytics tests\n")
+
+    try:
+        test_app_traffic_summary()
+        test_admin_traffic_stats_excludes_local_ips()
+        test_admin_reads_app_database()
+
+        print("\n🎉 All traffic analytics tests passed!")
+        return True
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)